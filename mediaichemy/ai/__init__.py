@@ -1,6 +1,28 @@
-from mediaichemy.ai.llm.chat import ChatAI
-from mediaichemy.ai.llm.agent import AgentAI
-from mediaichemy.ai.visual.visual import VisualAI
-from mediaichemy.ai.visual.image import ImageAI
-from mediaichemy.ai.visual.video import VideoAI, ImageVideoAI
-from mediaichemy.ai.voice import VoiceAI
+import importlib
+
+# Backends (pydantic_ai, runware, piper/onnxruntime) are heavy to import, so each service
+# is only loaded when it is first used.
+_EXPORTS = {
+    "ChatAI": "mediaichemy.ai.llm.chat",
+    "AgentAI": "mediaichemy.ai.llm.agent",
+    "VisualAI": "mediaichemy.ai.visual.visual",
+    "ImageAI": "mediaichemy.ai.visual.image",
+    "VideoAI": "mediaichemy.ai.visual.video",
+    "ImageVideoAI": "mediaichemy.ai.visual.video",
+    "GenerationCache": "mediaichemy.ai.visual.generation_cache",
+    "VoiceAI": "mediaichemy.ai.voice",
+    "VoiceCache": "mediaichemy.ai.voice",
+    "TTSWorkerPool": "mediaichemy.ai.voice",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return __all__
@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
 import os
 
 
+@lru_cache(maxsize=None)
+def _load_dotenv() -> None:
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
 class AIService(ABC):
     @abstractmethod
     async def create(self, prompt: str, **kwargs):
@@ -9,6 +16,8 @@ class AIService(ABC):
 
     @staticmethod
     def require_env_var(env_key: str) -> str:
+        # Read .env on first use rather than at import time
+        _load_dotenv()
         value = os.getenv(env_key)
         if not value:
             raise ValueError(f"{env_key} environment variable must be set to use this service")
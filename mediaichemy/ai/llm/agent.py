@@ -1,18 +1,22 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from pydantic import BaseModel
-from pydantic_ai import Agent
 
 from mediaichemy.ai.llm.chat import ChatAI
 from mediaichemy.ai.llm.modelfallback import with_model_fallback
+from mediaichemy.concurrency import limit
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
 
 
 class AgentAI(ChatAI):
     def __init__(self,
                  output_type: BaseModel,
                  system_prompt: str,
-                 model: Optional[str] = None):
-        super().__init__(model=model)
+                 model: Optional[str] = None,
+                 hedge_after: Optional[float] = None):
+        super().__init__(model=model, hedge_after=hedge_after)
         self.output_type = output_type
         self.system_prompt = system_prompt
         self.agent = self.prepare_agent()
@@ -20,17 +24,14 @@ class AgentAI(ChatAI):
     def _get_model_list(self):
         return self.openrouter_models.get_cheapest_tool_models()
 
-    def prepare_agent(self) -> Agent:
-        agent = Agent(
-            model=self._get_openai_model(),
-            output_type=self.output_type,
-            system_prompt=self.system_prompt
-        )
-        return agent
+    def prepare_agent(self) -> 'Agent':
+        return self._get_pooled_agent(output_type=self.output_type,
+                                      system_prompt=self.system_prompt)
 
     def reconnect(self):
         self.agent = self.prepare_agent()
 
     @with_model_fallback
-    async def create(self, user_prompt: str) -> Agent:
-        return await self.agent.run(user_prompt=user_prompt)
+    async def create(self, user_prompt: str) -> 'Agent':
+        async with limit("llm"):
+            return await self.agent.run(user_prompt=user_prompt)
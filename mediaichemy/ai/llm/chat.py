@@ -1,20 +1,24 @@
-from typing import Optional
-
-from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIChatModel
-from pydantic_ai.providers.openrouter import OpenRouterProvider
+from typing import TYPE_CHECKING, Optional
 
 from mediaichemy.ai.ai import AIService
 from mediaichemy.ai.llm.openrouter_models import OpenrouterModels
+from mediaichemy.ai.llm.provider_pool import ProviderPool
 from mediaichemy.ai.llm.modelfallback import with_model_fallback
+from mediaichemy.concurrency import limit
 
-from dotenv import load_dotenv
-load_dotenv()
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
 
 
 class ChatAI(AIService):
     def __init__(self,
-                 model: Optional[str] = None):
+                 model: Optional[str] = None,
+                 hedge_after: Optional[float] = None):
+        """
+        hedge_after: optional latency budget in seconds. When set, a request that has not
+        answered within the budget is hedged with the next model in the fallback list.
+        """
+        self.hedge_after = hedge_after
         self.openrouter_api_key = self.require_env_var("OPENROUTER_API_KEY")
         self.openrouter_models = OpenrouterModels()
         self.model_list = self._get_model_list()
@@ -24,13 +28,16 @@ class ChatAI(AIService):
         return self.openrouter_models.get_cheapest_models()
 
     def _get_openai_model(self):
-        return OpenAIChatModel(
-            self.current_model,
-            provider=OpenRouterProvider(api_key=self.openrouter_api_key)
-        )
+        return ProviderPool.get_model(self.openrouter_api_key, self.current_model)
+
+    def _get_pooled_agent(self, **agent_kwargs) -> 'Agent':
+        from pydantic_ai import Agent
+        key = (self.openrouter_api_key, self.current_model, *agent_kwargs.values())
+        return ProviderPool.get_agent(key, lambda: Agent(model=self._get_openai_model(), **agent_kwargs))
 
     @with_model_fallback
     async def create(self, prompt) -> str:
-        agent = Agent(self._get_openai_model())
-        result = await agent.run(prompt)
+        agent = self._get_pooled_agent()
+        async with limit("llm"):
+            result = await agent.run(prompt)
         return result.output
@@ -1,11 +1,123 @@
 from functools import wraps
+from collections import deque
+from typing import Dict, Optional
 import asyncio
-from pydantic_ai.exceptions import ModelHTTPError
+import copy
+import math
+import threading
+import time
 import logging
 logger = logging.getLogger(__name__)
 
 
+class ModelHealth:
+    """Rolling latency/error statistics and circuit breaker for a single model."""
+    window = 50
+    failure_threshold = 3
+    cooldown = 120
+
+    def __init__(self):
+        self.latencies = deque(maxlen=self.window)
+        self.outcomes = deque(maxlen=self.window)
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+
+    def admit(self) -> bool:
+        """Reserve a request: always while the circuit is closed, only the one trial while half-open."""
+        if not self.available:
+            return False
+        if self.opened_at is not None:
+            self.trial_in_flight = True
+        return True
+
+    def end_trial(self) -> None:
+        """Release the trial of a request that ended without proving the model good or bad."""
+        self.trial_in_flight = False
+
+    def record_success(self, latency: float) -> None:
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_abandoned(self, elapsed: float) -> None:
+        """
+        Record a request cancelled after ``elapsed`` seconds because a hedge answered first.
+        Its real latency is at least ``elapsed``, so it counts towards the percentiles; being
+        slow is not an error, so the circuit breaker is left alone.
+        """
+        self.latencies.append(elapsed)
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.outcomes.append(False)
+        self.trial_in_flight = False
+        # A failed trial stays above the threshold, so the circuit opens again
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.percentile(0.5)
+
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(0.95)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    @property
+    def available(self) -> bool:
+        """False while the circuit is open. After the cooldown it is half-open until a trial is admitted."""
+        if self.opened_at is None:
+            return True
+        return time.monotonic() - self.opened_at >= self.cooldown and not self.trial_in_flight
+
+
+class ModelHealthBoard:
+    """Process-wide scoreboard of ModelHealth per model id."""
+    _models: Dict[str, ModelHealth] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, model: str) -> ModelHealth:
+        with cls._lock:
+            health = cls._models.get(model)
+            if health is None:
+                health = cls._models[model] = ModelHealth()
+            return health
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, dict]:
+        with cls._lock:
+            return {model: {"p50": health.p50,
+                            "p95": health.p95,
+                            "error_rate": health.error_rate,
+                            "available": health.available}
+                    for model, health in cls._models.items()}
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._models.clear()
+
+
 class ModelFallback:
+    min_samples_for_budget = 5
+
     @staticmethod
     def remove_duplicates(current_model, model_list):
         return [model for model in model_list if model != current_model]
@@ -13,41 +125,147 @@ class ModelFallback:
     @staticmethod
     def get_models_to_try(instance):
         remaining_models = ModelFallback.remove_duplicates(instance.current_model, instance.model_list)
-        return [instance.current_model] + remaining_models
+        models = [instance.current_model] + remaining_models
+        available = [model for model in models if ModelHealthBoard.get(model).available]
+        skipped = len(models) - len(available)
+        if skipped:
+            logger.debug(f"Skipping {skipped} model(s) with an open circuit breaker")
+        # If every model is known-bad, trying them is still better than failing outright
+        return available or models
+
+    @staticmethod
+    def _admit(model, forced: bool) -> bool:
+        """Whether ``model`` may take this request. ``forced`` when every model's circuit is open."""
+        return ModelHealthBoard.get(model).admit() or forced
 
     @staticmethod
     def should_retry(error):
+        from pydantic_ai.exceptions import ModelHTTPError
         if isinstance(error, ModelHTTPError):
             return getattr(error, "status_code", None) in [400, 404, 429, 502, 503]
-        return False
+        return isinstance(error, asyncio.TimeoutError)
+
+    @staticmethod
+    def latency_budget(instance, model) -> float:
+        """Seconds to wait for ``model`` before hedging: its observed p95, capped by instance.hedge_after."""
+        health = ModelHealthBoard.get(model)
+        if len(health.latencies) >= ModelFallback.min_samples_for_budget:
+            return min(instance.hedge_after, health.p95)
+        return instance.hedge_after
+
+    @staticmethod
+    async def _timed_call(func, instance, model, *args, **kwargs):
+        """Run func on ``instance`` with ``model`` selected, recording the outcome on the scoreboard."""
+        health = ModelHealthBoard.get(model)
+        start = time.monotonic()
+        try:
+            result = await func(instance, *args, **kwargs)
+        except Exception as error:
+            if ModelFallback.should_retry(error):
+                health.record_failure()
+            else:
+                health.end_trial()
+            raise
+        except BaseException:
+            health.end_trial()
+            raise
+        health.record_success(time.monotonic() - start)
+        return result
+
+    @staticmethod
+    def _clone_for_model(instance, model):
+        clone = copy.copy(instance)
+        clone.current_model = model
+        if hasattr(clone, 'reconnect') and callable(clone.reconnect):
+            clone.reconnect()
+        return clone
+
+    @staticmethod
+    async def _sequential(func, instance, models, forced, *args, **kwargs):
+        last_error = None
+        for model in models:
+            if not ModelFallback._admit(model, forced):
+                continue
+            original_model = instance.current_model
+            try:
+                instance.current_model = model
+                # Reconnect if the instance has a reconnect method
+                if hasattr(instance, 'reconnect') and callable(instance.reconnect):
+                    instance.reconnect()
+                return await ModelFallback._timed_call(func, instance, model, *args, **kwargs)
+            except Exception as error:
+                last_error = error
+                if ModelFallback.should_retry(error):
+                    logger.warning(f"Model {model} failed with error: {error}. Retrying...")
+                    await asyncio.sleep(1)
+                    continue
+                else:
+                    raise error
+            finally:
+                instance.current_model = original_model
+        raise last_error or Exception("All models failed")
+
+    @staticmethod
+    async def _hedged(func, instance, models, forced, *args, **kwargs):
+        """
+        Start with the first model and, whenever the newest request exceeds its latency budget
+        or any request fails, fire the next model too. The first successful result wins and the
+        rest are cancelled. Each request runs on a shallow copy of the instance bound to its model.
+        """
+        remaining = list(models)
+        pending: Dict[asyncio.Task, str] = {}
+        started: Dict[asyncio.Task, float] = {}
+        last_error = None
+
+        def launch_next() -> Optional[str]:
+            while remaining:
+                model = remaining.pop(0)
+                if not ModelFallback._admit(model, forced):
+                    continue
+                clone = ModelFallback._clone_for_model(instance, model)
+                task = asyncio.ensure_future(ModelFallback._timed_call(func, clone, model, *args, **kwargs))
+                pending[task] = model
+                started[task] = time.monotonic()
+                return model
+            return None
+
+        try:
+            newest = launch_next()
+            while pending:
+                timeout = ModelFallback.latency_budget(instance, newest) if remaining else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logger.debug(f"Model {newest} exceeded its latency budget, hedging with {remaining[0]}")
+                    newest = launch_next()
+                    continue
+                for task in done:
+                    model = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    if not ModelFallback.should_retry(error):
+                        raise error
+                    logger.warning(f"Model {model} failed with error: {error}. Retrying...")
+                    last_error = error
+                    if remaining:
+                        newest = launch_next() or newest
+        finally:
+            for task, model in pending.items():
+                task.cancel()
+                # Let the scoreboard learn that the losers were slow
+                ModelHealthBoard.get(model).record_abandoned(time.monotonic() - started[task])
+            await asyncio.gather(*pending, return_exceptions=True)
+        raise last_error or Exception("All models failed")
 
     @staticmethod
     def apply(func):
         @wraps(func)
         async def wrapper(self, *args, **kwargs):
             models = ModelFallback.get_models_to_try(self)
-            last_error = None
-
-            for model in models:
-                original_model = self.current_model
-                try:
-                    self.current_model = model
-                    # Reconnect if the instance has a reconnect method
-                    if hasattr(self, 'reconnect') and callable(self.reconnect):
-                        self.reconnect()
-                    result = await func(self, *args, **kwargs)
-                    return result
-                except Exception as error:
-                    last_error = error
-                    if ModelFallback.should_retry(error):
-                        logger.warning(f"Model {model} failed with error: {error}. Retrying...")
-                        await asyncio.sleep(1)
-                        continue
-                    else:
-                        raise error
-                finally:
-                    self.current_model = original_model
-            raise last_error or Exception("All models failed")
+            forced = not any(ModelHealthBoard.get(model).available for model in models)
+            if getattr(self, 'hedge_after', None):
+                return await ModelFallback._hedged(func, self, models, forced, *args, **kwargs)
+            return await ModelFallback._sequential(func, self, models, forced, *args, **kwargs)
         return wrapper
 
 
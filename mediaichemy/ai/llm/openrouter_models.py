@@ -1,6 +1,17 @@
 from pydantic.dataclasses import dataclass
-from typing import Optional, List, Any
-import requests
+from typing import Optional, List, Any, Dict, NamedTuple, Tuple
+from enum import IntFlag
+import json
+import math
+import os
+import re
+import threading
+import time
+
+from mediaichemy.file import utils
+
+import logging
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -53,16 +64,286 @@ class ModelsResponse:
     data: Optional[List[ModelInfo]] = None
 
 
+class Capability(IntFlag):
+    NONE = 0
+    TOOLS = 1
+    STRUCTURED_OUTPUTS = 2
+    RESPONSE_FORMAT = 4
+    TEXT_INPUT = 8
+    IMAGE_INPUT = 16
+    AUDIO_INPUT = 32
+    FILE_INPUT = 64
+    TEXT_OUTPUT = 128
+    IMAGE_OUTPUT = 256
+
+    @classmethod
+    def of(cls, model: ModelInfo) -> 'Capability':
+        capabilities = cls.NONE
+        parameters = model.supported_parameters or []
+        if "tools" in parameters:
+            capabilities |= cls.TOOLS
+        if "structured_outputs" in parameters:
+            capabilities |= cls.STRUCTURED_OUTPUTS
+        if "response_format" in parameters:
+            capabilities |= cls.RESPONSE_FORMAT
+        architecture = model.architecture or Architecture()
+        for modality in architecture.input_modalities or []:
+            capabilities |= cls.__members__.get(f"{modality.upper()}_INPUT", cls.NONE)
+        for modality in architecture.output_modalities or []:
+            capabilities |= cls.__members__.get(f"{modality.upper()}_OUTPUT", cls.NONE)
+        return capabilities
+
+
+def parse_price(price: Optional[str]) -> float:
+    """Parse an OpenRouter price string. Missing, invalid or variable (negative) prices sort last."""
+    try:
+        value = float(price)
+    except (TypeError, ValueError):
+        return math.inf
+    return value if value >= 0 else math.inf
+
+
+class IndexedModel(NamedTuple):
+    id: str
+    prompt_price: float
+    completion_price: float
+    context_length: int
+    capabilities: Capability
+
+
+class ModelIndex:
+    """
+    Immutable price-ordered view of a models catalogue.
+
+    Prices are parsed to floats once and models are sorted numerically by prompt then
+    completion price. Filtered views per capability mask are memoized, so cheapest-N
+    queries only walk the models they return (plus the ones skipped for context length).
+    """
+
+    def __init__(self, models: List[ModelInfo]):
+        entries = [self._index_model(m) for m in models if m.id]
+        entries.sort(key=lambda e: (e.prompt_price, e.completion_price, e.id))
+        self.entries: Tuple[IndexedModel, ...] = tuple(entries)
+        self._views: Dict[Capability, Tuple[IndexedModel, ...]] = {Capability.NONE: self.entries}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _index_model(model: ModelInfo) -> IndexedModel:
+        pricing = model.pricing or Pricing()
+        context_length = model.context_length
+        if context_length is None and model.top_provider:
+            context_length = model.top_provider.context_length
+        return IndexedModel(id=model.id,
+                            prompt_price=parse_price(pricing.prompt),
+                            completion_price=parse_price(pricing.completion),
+                            context_length=context_length or 0,
+                            capabilities=Capability.of(model))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def view(self, capabilities: Capability = Capability.NONE) -> Tuple[IndexedModel, ...]:
+        """All models having every requested capability, cheapest first."""
+        view = self._views.get(capabilities)
+        if view is None:
+            with self._lock:
+                view = tuple(e for e in self.entries if e.capabilities & capabilities == capabilities)
+                self._views[capabilities] = view
+        return view
+
+    def cheapest(self,
+                 n: Optional[int] = None,
+                 capabilities: Capability = Capability.NONE,
+                 min_context: int = 0) -> List[IndexedModel]:
+        selected = []
+        for entry in self.view(capabilities):
+            if n is not None and len(selected) >= n:
+                break
+            if entry.context_length >= min_context:
+                selected.append(entry)
+        return selected
+
+    def cheapest_ids(self,
+                     n: Optional[int] = None,
+                     capabilities: Capability = Capability.NONE,
+                     min_context: int = 0) -> List[str]:
+        return [e.id for e in self.cheapest(n=n, capabilities=capabilities, min_context=min_context)]
+
+
+class CatalogueCache:
+    """
+    Process-wide and on-disk TTL cache of the OpenRouter models catalogue.
+
+    Parsed catalogues are kept in memory per API URL, so every ChatAI/AgentAI in the
+    process shares them. The raw response is persisted next to its ETag/Last-Modified
+    headers; once the TTL expires the stale catalogue keeps being served while a background
+    thread revalidates it with a conditional request, so lookups from async code never wait
+    on the network. Only a cold start (nothing in memory or on disk) fetches in the caller.
+    If OpenRouter cannot be reached the snapshot stays stale and revalidation is retried
+    after ``retry_backoff`` seconds.
+    """
+    retry_backoff = 60
+    _memory: Dict[str, dict] = {}
+    _revalidations: Dict[str, threading.Thread] = {}
+    _lock = threading.Lock()
+
+    def __init__(self,
+                 api_url: str,
+                 ttl: float = 3600,
+                 timeout: float = 20,
+                 cache_path: Optional[str] = None):
+        self.api_url = api_url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.cache_path = cache_path or self._default_cache_path(api_url)
+
+    @staticmethod
+    def _default_cache_path(api_url: str) -> str:
+        name = re.sub(r'[^a-zA-Z0-9]+', '_', api_url).strip('_')
+        return os.path.join(utils.get_cache_dir("openrouter"), f"{name}.json")
+
+    def get(self) -> List[ModelInfo]:
+        return self.get_entry()["models"]
+
+    def get_index(self) -> ModelIndex:
+        return self.get_entry()["index"]
+
+    def get_entry(self) -> dict:
+        """Return the cached entry ({"models", "index", "version", ...}), revalidating it if expired."""
+        with self._lock:
+            entry = self._memory.get(self.api_url)
+            if entry is None:
+                snapshot = self._load_snapshot()
+                entry = self._refresh(None) if snapshot is None else self._reuse_or_parse(None, snapshot)
+                self._memory[self.api_url] = entry
+            if not (self._is_fresh(entry) or time.time() < entry.get("retry_at", 0)):
+                self._revalidate_in_background(entry)
+            return entry
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait for a background revalidation in progress, if any."""
+        thread = self._revalidations.get(self.api_url)
+        if thread is not None:
+            thread.join(timeout)
+
+    def _revalidate_in_background(self, entry: dict) -> None:
+        thread = self._revalidations.get(self.api_url)
+        if thread is not None and thread.is_alive():
+            return
+        thread = threading.Thread(target=self._revalidate, args=(entry,), daemon=True,
+                                  name="openrouter-catalogue-revalidation")
+        self._revalidations[self.api_url] = thread
+        thread.start()
+
+    def _revalidate(self, entry: dict) -> None:
+        import requests
+        try:
+            refreshed = self._refresh(entry)
+        except requests.RequestException as error:
+            # The snapshot vanished from disk and OpenRouter is unreachable; keep serving the entry
+            logger.warning(f"Could not refresh OpenRouter models ({error}). Using cached catalogue.")
+            refreshed = dict(entry, retry_at=time.time() + self.retry_backoff)
+        with self._lock:
+            self._memory[self.api_url] = refreshed
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._memory.pop(self.api_url, None)
+        if os.path.exists(self.cache_path):
+            os.remove(self.cache_path)
+
+    def _is_fresh(self, snapshot: dict) -> bool:
+        return time.time() - snapshot["fetched_at"] < self.ttl
+
+    def _refresh(self, entry: Optional[dict]) -> dict:
+        import requests
+        snapshot = self._load_snapshot()
+        if snapshot and self._is_fresh(snapshot):
+            return self._reuse_or_parse(entry, snapshot)
+
+        try:
+            snapshot = self._fetch(snapshot)
+        except requests.RequestException as error:
+            if not snapshot:
+                raise
+            logger.warning(f"Could not refresh OpenRouter models ({error}). Using cached catalogue.")
+            entry = self._reuse_or_parse(entry, snapshot)
+            # Avoid hammering the API on every lookup while offline, without marking the snapshot fresh
+            entry["retry_at"] = time.time() + self.retry_backoff
+            return entry
+
+        self._save_snapshot(snapshot)
+        return self._reuse_or_parse(entry, snapshot)
+
+    def _fetch(self, snapshot: Optional[dict]) -> dict:
+        headers = {}
+        if snapshot and snapshot.get("etag"):
+            headers["If-None-Match"] = snapshot["etag"]
+        if snapshot and snapshot.get("last_modified"):
+            headers["If-Modified-Since"] = snapshot["last_modified"]
+
+        import requests
+        response = requests.get(self.api_url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and snapshot:
+            logger.debug("OpenRouter models catalogue not modified")
+            snapshot["fetched_at"] = time.time()
+            return snapshot
+        response.raise_for_status()
+        logger.debug(f"Downloaded OpenRouter models catalogue from {self.api_url}")
+        return {
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "payload": response.json(),
+        }
+
+    @staticmethod
+    def _version(snapshot: dict) -> str:
+        return snapshot.get("etag") or snapshot.get("last_modified") or str(snapshot["fetched_at"])
+
+    def _reuse_or_parse(self, entry: Optional[dict], snapshot: dict) -> dict:
+        version = self._version(snapshot)
+        if entry and entry["version"] == version:
+            models, index = entry["models"], entry["index"]
+        else:
+            models = ModelsResponse(**snapshot["payload"]).data or []
+            index = ModelIndex(models)
+        return {"models": models, "index": index, "version": version, "fetched_at": snapshot["fetched_at"]}
+
+    def _load_snapshot(self) -> Optional[dict]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as error:
+            logger.warning(f"Ignoring unreadable OpenRouter models cache {self.cache_path}: {error}")
+            return None
+
+    def _save_snapshot(self, snapshot: dict) -> None:
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as error:
+            logger.warning(f"Could not write OpenRouter models cache {self.cache_path}: {error}")
+
+
 class OpenrouterModels:
     def __init__(self,
-                 api_url: str = "https://openrouter.ai/api/v1/models"):
+                 api_url: str = "https://openrouter.ai/api/v1/models",
+                 cache_ttl: float = 3600):
         self.api_url = api_url
+        self.cache = CatalogueCache(api_url, ttl=cache_ttl)
         self.models: List[ModelInfo] = self.get_models()
 
     def get_models(self):
-        response = requests.get(self.api_url)
-        response.raise_for_status()
-        return ModelsResponse(**response.json()).data
+        return self.cache.get()
+
+    @property
+    def index(self) -> ModelIndex:
+        return self.cache.get_index()
 
     @staticmethod
     def filter_tool_models(models: List[ModelInfo]) -> List[ModelInfo]:
@@ -70,17 +351,19 @@ class OpenrouterModels:
 
     @staticmethod
     def order_by_prompt_price(models: List[ModelInfo]) -> List[ModelInfo]:
-        return sorted(models, key=lambda m: m.pricing.prompt if m.pricing else float("inf"))
+        return sorted(models, key=lambda m: parse_price(m.pricing.prompt if m.pricing else None))
 
     @staticmethod
     def extract_ids(models: List[ModelInfo]) -> List[str]:
         return [m.id for m in models if m.id]
 
-    def get_cheapest_models(self) -> List[ModelInfo]:
-        self.models = self.order_by_prompt_price(self.models)
-        return self.extract_ids(self.models)
+    def get_cheapest_models(self,
+                            n: Optional[int] = None,
+                            capabilities: Capability = Capability.NONE,
+                            min_context: int = 0) -> List[str]:
+        return self.index.cheapest_ids(n=n, capabilities=capabilities, min_context=min_context)
 
-    def get_cheapest_tool_models(self) -> List[ModelInfo]:
-        tool_models = self.filter_tool_models(self.models)
-        tool_models = self.order_by_prompt_price(tool_models)
-        return self.extract_ids(tool_models)
+    def get_cheapest_tool_models(self,
+                                 n: Optional[int] = None,
+                                 min_context: int = 0) -> List[str]:
+        return self.get_cheapest_models(n=n, capabilities=Capability.TOOLS, min_context=min_context)
@@ -0,0 +1,99 @@
+import asyncio
+import importlib.util
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable
+
+import httpx
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+    from pydantic_ai.models.openai import OpenAIChatModel
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class _PoolScope:
+    def __init__(self):
+        self.http_clients: Dict[str, httpx.AsyncClient] = {}
+        self.models: Dict[Hashable, 'OpenAIChatModel'] = {}
+        self.agents: Dict[Hashable, 'Agent'] = {}
+
+
+class ProviderPool:
+    """
+    Shares OpenRouter HTTP clients, chat models and agents across ChatAI/AgentAI instances.
+
+    One keep-alive (HTTP/2 when ``h2`` is installed) client is kept per API key, and models
+    and agents are cached on top of it, so switching models during a fallback is a dict
+    lookup. Async clients cannot outlive their event loop, so everything is scoped to the
+    running loop; call ``aclose()`` before the loop ends to release its connections.
+    """
+    timeout = httpx.Timeout(timeout=600, connect=5)
+    limits = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=90)
+
+    _scopes: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _PoolScope]' = weakref.WeakKeyDictionary()
+    _default_scope = _PoolScope()
+    _lock = threading.Lock()
+
+    @classmethod
+    def _scope(cls) -> _PoolScope:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return cls._default_scope
+        with cls._lock:
+            scope = cls._scopes.get(loop)
+            if scope is None:
+                scope = cls._scopes[loop] = _PoolScope()
+            return scope
+
+    @staticmethod
+    def _http2_available() -> bool:
+        return importlib.util.find_spec("h2") is not None
+
+    @classmethod
+    def get_http_client(cls, api_key: str) -> httpx.AsyncClient:
+        scope = cls._scope()
+        client = scope.http_clients.get(api_key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(http2=cls._http2_available(),
+                                       timeout=cls.timeout,
+                                       limits=cls.limits)
+            scope.http_clients[api_key] = client
+            logger.debug("Created pooled OpenRouter HTTP client")
+        return client
+
+    @classmethod
+    def get_model(cls, api_key: str, model_name: str) -> 'OpenAIChatModel':
+        from pydantic_ai.models.openai import OpenAIChatModel
+        from pydantic_ai.providers.openrouter import OpenRouterProvider
+        scope = cls._scope()
+        key = (api_key, model_name)
+        model = scope.models.get(key)
+        if model is None:
+            provider = OpenRouterProvider(api_key=api_key,
+                                          http_client=cls.get_http_client(api_key))
+            model = scope.models[key] = OpenAIChatModel(model_name, provider=provider)
+        return model
+
+    @classmethod
+    def get_agent(cls, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the agent cached under ``key``, building it with ``factory`` on a miss."""
+        scope = cls._scope()
+        agent = scope.agents.get(key)
+        if agent is None:
+            agent = scope.agents[key] = factory()
+        return agent
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the HTTP clients of the running loop and forget its models and agents."""
+        loop = asyncio.get_running_loop()
+        with cls._lock:
+            scope = cls._scopes.pop(loop, None)
+        if scope is None:
+            return
+        for client in scope.http_clients.values():
+            await client.aclose()
@@ -0,0 +1,151 @@
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, NamedTuple, Optional
+
+from mediaichemy.file import utils
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class CachedAsset(NamedTuple):
+    path: str
+    cost: float
+
+
+class GenerationCache:
+    """
+    Content-addressed store of Runware results, so identical requests are only paid once.
+
+    Entries are keyed by a hash of the inference request (prompt, model, size, seed, frame
+    images, ...), minus per-request fields such as the task UUID. Each entry is the asset plus
+    a JSON sidecar with the cost originally paid. Assets are hard-linked into the job directory
+    (copied across filesystems), so a linked output must be replaced rather than written in
+    place, as the editors already do. Least recently used entries are evicted beyond ``max_bytes``.
+
+    Only requests with a fixed seed are cached: without one Runware picks a random seed, and
+    asking again is expected to give a new asset. Set ``enabled = False`` to never cache.
+    """
+    max_bytes = 4 * 1024 * 1024 * 1024
+    enabled = True
+    volatile_fields = ("taskUUID", "webhookURL", "uploadEndpoint")
+
+    _default: Optional['GenerationCache'] = None
+
+    def __init__(self, directory: str = None, max_bytes: int = None):
+        self.directory = directory or utils.get_cache_dir("generations")
+        utils.ensure_dir(self.directory)
+        self.max_bytes = max_bytes or self.max_bytes
+
+    @classmethod
+    def default(cls) -> 'GenerationCache':
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @classmethod
+    def key(cls, kind: str, inference: Any) -> str:
+        """Canonical hash of an inference request (a Runware request dataclass or a dict)."""
+        fields = dataclasses.asdict(inference) if dataclasses.is_dataclass(inference) else dict(inference)
+        fields = {name: value for name, value in fields.items()
+                  if value is not None and name not in cls.volatile_fields}
+        canonical = json.dumps({"kind": kind, "request": fields},
+                               sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def key_for(self, kind: str, inference: Any) -> Optional[str]:
+        """Cache key of a request, or None if it should not be cached."""
+        if not self.enabled or getattr(inference, "seed", None) is None:
+            return None
+        return self.key(kind, inference)
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _asset_path(self, key: str, ext: str) -> str:
+        return os.path.join(self.directory, f"{key}{ext}")
+
+    @staticmethod
+    def _temp_path(destination: str, suffix: str = ".partial") -> str:
+        """Unique temporary name next to ``destination``, so concurrent writers never share one."""
+        directory, name = os.path.split(destination)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=suffix, dir=directory or ".")
+        os.close(fd)
+        return tmp_path
+
+    @classmethod
+    def _link(cls, source: str, destination: str) -> None:
+        tmp_path = cls._temp_path(destination)
+        try:
+            os.remove(tmp_path)
+            try:
+                os.link(source, tmp_path)
+            except OSError:
+                # Different filesystem, or no hard link support
+                shutil.copy2(source, tmp_path)
+            os.replace(tmp_path, destination)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get(self, key: Optional[str], output_path: str) -> Optional[CachedAsset]:
+        """Materialize the cached asset at ``output_path``. Returns None on a miss."""
+        if not self.enabled or key is None:
+            return None
+        try:
+            with open(self._meta_path(key), encoding="utf-8") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        asset_path = self._asset_path(key, meta["ext"])
+        if not os.path.exists(asset_path):
+            return None
+        utils.ensure_dir(os.path.dirname(output_path) or ".")
+        self._link(asset_path, output_path)
+        os.utime(asset_path)
+        logger.info(f"Reused cached generation {key[:12]} (saved {meta['cost']})")
+        return CachedAsset(path=output_path, cost=meta["cost"])
+
+    def put(self, key: Optional[str], path: str, cost: float) -> None:
+        """Store the asset at ``path`` (generated at ``cost``) under ``key``."""
+        if not self.enabled or key is None:
+            return
+        ext = os.path.splitext(path)[1]
+        self._link(path, self._asset_path(key, ext))
+        meta_tmp = self._temp_path(self._meta_path(key))
+        with open(meta_tmp, "w", encoding="utf-8") as f:
+            json.dump({"ext": ext, "cost": cost, "created": time.time()}, f)
+        os.replace(meta_tmp, self._meta_path(key))
+        self._evict(keep=key)
+
+    def _evict(self, keep: str) -> None:
+        assets = []
+        for name in os.listdir(self.directory):
+            key, ext = os.path.splitext(name)
+            if name.startswith(".") or ext == ".json":
+                # Sidecars, and other writers' temporary files
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                assets.append((os.path.getmtime(path), os.path.getsize(path), key, path))
+            except FileNotFoundError:
+                continue
+        total = sum(size for _, size, _, _ in assets)
+        for _, size, key, path in sorted(assets):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            for stale_path in (path, self._meta_path(key)):
+                try:
+                    os.remove(stale_path)
+                except FileNotFoundError:
+                    # Evicted by another process meanwhile
+                    pass
+            total -= size
+            logger.debug(f"Evicted cached generation {key[:12]}")
@@ -1,12 +1,18 @@
-from runware import IImageInference
+from typing import TYPE_CHECKING
+
 from mediaichemy.file import ImageFile
 from mediaichemy.ai.visual.visual import VisualAI, filter_params_for
+from mediaichemy.concurrency import limit
+
+if TYPE_CHECKING:
+    from runware import IImageInference
 
 
 class ImageAI(VisualAI):
-    @filter_params_for(IImageInference.__init__)
-    async def _create_image_inference(self, prompt, **kwargs) -> IImageInference:
+    @filter_params_for("runware:IImageInference")
+    async def _create_image_inference(self, prompt, **kwargs) -> 'IImageInference':
         """Create IImageInference object with filtered parameters."""
+        from runware import IImageInference
         return IImageInference(
             positivePrompt=prompt,
             **kwargs
@@ -16,11 +22,17 @@ class ImageAI(VisualAI):
                      prompt,
                      output_path,
                      **kwargs) -> ImageFile:
-        client = await self._get_runware_client()
         kwargs = self._set_defaults(**kwargs)
         kwargs['model'] = kwargs.pop('image_model')
         inference_object = await self._create_image_inference(prompt, **kwargs)
-        images = await client.imageInference(requestImage=inference_object)
+        key = self.cache.key_for("image", inference_object)
+        cached = self.cache.get(key, output_path)
+        if cached:
+            return ImageFile(cached.path), 0
+        client = await self._get_runware_client()
+        async with limit("visual"):
+            images = await client.imageInference(requestImage=inference_object)
         iimage = images[0]
-        image = self.download(iimage.imageURL, output_path)
+        image = await self.download(iimage.imageURL, output_path)
+        self.cache.put(key, image, iimage.cost)
         return ImageFile(image), iimage.cost
@@ -0,0 +1,99 @@
+import asyncio
+import weakref
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    from runware import Runware
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class RunwarePool:
+    """
+    Small pool of authenticated Runware websocket sessions shared by all VisualAI instances.
+
+    The Runware SDK matches responses to requests by task UUID, so many concurrent
+    imageInference/videoInference calls can share one socket. The pool hands out its
+    connections round-robin, opening them lazily up to ``size``, and checks each one before
+    handing it out, reconnecting (or replacing) sessions that have dropped.
+    Pools are kept per event loop, since websockets cannot be shared between loops.
+    """
+    size = 2
+
+    _pools: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, RunwarePool]]' = \
+        weakref.WeakKeyDictionary()
+
+    def __init__(self, api_key: str, size: int = None):
+        self.api_key = api_key
+        self.size = size or self.size
+        self.clients: List['Runware'] = []
+        self._next = 0
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def for_api_key(cls, api_key: str) -> 'RunwarePool':
+        loop = asyncio.get_running_loop()
+        pools = cls._pools.setdefault(loop, {})
+        pool = pools.get(api_key)
+        if pool is None:
+            pool = pools[api_key] = cls(api_key)
+        return pool
+
+    async def acquire(self) -> 'Runware':
+        async with self._lock:
+            if len(self.clients) < self.size:
+                client = await self._connect()
+                self.clients.append(client)
+                return client
+            index = self._next % len(self.clients)
+            self._next += 1
+            client = self.clients[index]
+            if not self._is_healthy(client):
+                client = self.clients[index] = await self._reconnect(client)
+            return client
+
+    async def _connect(self) -> 'Runware':
+        from runware import Runware
+        client = Runware(api_key=self.api_key)
+        await client.connect()
+        logger.debug(f"Opened Runware session {len(self.clients) + 1}/{self.size}")
+        return client
+
+    @staticmethod
+    def _is_healthy(client: 'Runware') -> bool:
+        try:
+            return client.connected()
+        except Exception:
+            return False
+
+    async def _reconnect(self, client: 'Runware') -> 'Runware':
+        logger.info("Runware session dropped, reconnecting")
+        try:
+            await client.ensureConnection()
+            if self._is_healthy(client):
+                return client
+        except Exception as error:
+            logger.warning(f"Could not restore Runware session: {error}")
+        await self._disconnect(client)
+        return await self._connect()
+
+    @staticmethod
+    async def _disconnect(client: 'Runware') -> None:
+        try:
+            await client.disconnect()
+        except Exception as error:
+            logger.debug(f"Ignoring error while closing Runware session: {error}")
+
+    async def close(self) -> None:
+        async with self._lock:
+            clients, self.clients = self.clients, []
+        for client in clients:
+            await self._disconnect(client)
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """Close the pools of the running event loop."""
+        pools = cls._pools.pop(asyncio.get_running_loop(), {})
+        for pool in pools.values():
+            await pool.close()
@@ -1,15 +1,20 @@
 import asyncio
-from runware import IVideoInference
+from typing import TYPE_CHECKING
+
 from mediaichemy.file import VideoFile
 from mediaichemy.ai.visual.visual import VisualAI, filter_params_for
 from mediaichemy.ai.visual.image import ImageAI
+from mediaichemy.concurrency import limit
+
+if TYPE_CHECKING:
+    from runware import IVideoInference
 
 
 class VideoAI(VisualAI):
-    @filter_params_for(IVideoInference.__init__)
-    async def _create_video_inference(self, prompt, **kwargs) -> IVideoInference:
-        print(kwargs)
+    @filter_params_for("runware:IVideoInference")
+    async def _create_video_inference(self, prompt, **kwargs) -> 'IVideoInference':
         """Create IVideoInference object with filtered parameters."""
+        from runware import IVideoInference
         return IVideoInference(
             positivePrompt=prompt,
             **kwargs
@@ -19,18 +24,24 @@ class VideoAI(VisualAI):
                      prompt,
                      output_path,
                      **kwargs) -> VideoFile:
-        client = await self._get_runware_client()
         kwargs = self._set_defaults(**kwargs)
         kwargs['model'] = kwargs.pop('video_model')
         inference_object = await self._create_video_inference(prompt, **kwargs)
+        key = self.cache.key_for("video", inference_object)
+        cached = self.cache.get(key, output_path)
+        if cached:
+            return VideoFile(cached.path), 0
+        client = await self._get_runware_client()
         try:
             timeout = 600
-            videos = await asyncio.wait_for(
-                client.videoInference(requestVideo=inference_object),
-                timeout=timeout  # Timeout in seconds
-            )
+            async with limit("visual"):
+                videos = await asyncio.wait_for(
+                    client.videoInference(requestVideo=inference_object),
+                    timeout=timeout  # Timeout in seconds
+                )
             ivideo = videos[0]
-            video = self.download(ivideo.videoURL, output_path)
+            video = await self.download(ivideo.videoURL, output_path)
+            self.cache.put(key, video, ivideo.cost)
             return VideoFile(video), ivideo.cost
         except asyncio.TimeoutError:
             raise TimeoutError(f"Video generation timed out after {timeout} seconds")
@@ -1,32 +1,49 @@
-from runware import Runware
+import importlib
 import inspect
 from functools import wraps
 from abc import ABC, abstractmethod
-from mediaichemy.file import HTTPDownloader
+from typing import Optional
+from mediaichemy.file import AsyncHTTPDownloader
 from mediaichemy.ai.ai import AIService
-from dotenv import load_dotenv
-load_dotenv()
+from mediaichemy.ai.visual.runware_pool import RunwarePool
+from mediaichemy.ai.visual.generation_cache import GenerationCache
 
 
 def filter_params_for(target_func):
-    """Decorator that filters kwargs to only include parameters that target_func accepts."""
+    """
+    Decorator that filters kwargs to only include parameters that target_func accepts.
+    target_func may be given as a "module:attribute" string, resolved on first call so
+    the module is only imported when needed.
+    """
     def decorator(func):
+        signature = None
+
         @wraps(func)
         async def wrapper(self, *args, **kwargs):
-            sig = inspect.signature(target_func)
+            nonlocal signature
+            if signature is None:
+                signature = inspect.signature(_resolve(target_func))
 
             filtered_kwargs = {
                 k: v for k, v in kwargs.items()
-                if k in sig.parameters
+                if k in signature.parameters
             }
             return await func(self, *args, **filtered_kwargs)
         return wrapper
     return decorator
 
 
+def _resolve(target):
+    if isinstance(target, str):
+        module_name, attribute = target.split(":")
+        return getattr(importlib.import_module(module_name), attribute)
+    return target
+
+
 class VisualAI(AIService, ABC):
-    def __init__(self):
+    def __init__(self, cache: Optional[GenerationCache] = None):
         self.runware_api_key = self.require_env_var("RUNWARE_API_KEY")
+        self.cache = cache or GenerationCache.default()
 
     @abstractmethod
     async def create(self,
@@ -36,9 +53,7 @@ class VisualAI(AIService, ABC):
         pass
 
     async def _get_runware_client(self):
-        runware_client = Runware(api_key=self.runware_api_key)
-        await runware_client.connect()
-        return runware_client
+        return await RunwarePool.for_api_key(self.runware_api_key).acquire()
 
     def _set_defaults(self, **kwargs):
         kwargs.setdefault('includeCost', True)
@@ -46,5 +61,5 @@ class VisualAI(AIService, ABC):
         return kwargs
 
     @staticmethod
-    def download(url, output_path):
-        return HTTPDownloader().download(url, output_path)
+    async def download(url, output_path):
+        return await AsyncHTTPDownloader().download(url, output_path)
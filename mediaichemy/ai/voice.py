@@ -1,30 +1,293 @@
-from piper import PiperVoice, SynthesisConfig
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import os
+import threading
 import wave
-import subprocess
+import numpy as np
 from pathlib import Path
-from mediaichemy.file import AudioFile
+from mediaichemy.file import AudioFile, AudioBuffer
+from mediaichemy.text import split_at_sentence_ends, split_into_sentences
+from mediaichemy.concurrency import limit
 
+if TYPE_CHECKING:
+    from piper import PiperVoice
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class VoiceCache:
+    """
+    Process-wide LRU cache of loaded Piper voices, keyed by voice name.
+
+    Loading a voice builds an ONNX inference session, which is far more expensive than
+    synthesizing a sentence, so voices stay loaded between narrations. The cache is bounded
+    by the size of the model files (a good proxy for the session's memory) and evicts the
+    least recently used voices beyond ``max_bytes``.
+    """
+    voices_dir = Path("voices")
+    max_bytes = 512 * 1024 * 1024
+
+    _voices: 'OrderedDict[str, Tuple[PiperVoice, int]]' = OrderedDict()
+    _lock = threading.Lock()
+    _load_locks: Dict[str, threading.Lock] = {}
+    _download_lock = threading.Lock()
+
+    @classmethod
+    def voice_paths(cls, voice_name: str) -> Tuple[Path, Path]:
+        model_path = cls.voices_dir / f"{voice_name}.onnx"
+        return model_path, model_path.with_suffix(".onnx.json")
+
+    @classmethod
+    def ensure_voice_files(cls, voice_name: str) -> Path:
+        """Download the voice model and config unless both are already on disk."""
+        model_path, config_path = cls.voice_paths(voice_name)
+        if cls._has_files(model_path, config_path):
+            return model_path
+        with cls._download_lock:
+            if not cls._has_files(model_path, config_path):
+                cls.voices_dir.mkdir(parents=True, exist_ok=True)
+                logger.info(f"Downloading Piper voice {voice_name}")
+                from piper.download_voices import download_voice
+                download_voice(voice_name, cls.voices_dir)
+        return model_path
 
-class VoiceAI:
     @staticmethod
-    def _download_piper_voice(narration_voice_name: str) -> Path:
-        voices_dir = Path("voices")
-        voices_dir.mkdir(exist_ok=True)
-        subprocess.run(["python3", "-m",
-                        "piper.download_voices",
-                        narration_voice_name,
-                        "--download-dir", str(voices_dir)], check=True)
-        voice_path = voices_dir / f"{narration_voice_name}.onnx"
-        return voice_path
+    def _has_files(*paths: Path) -> bool:
+        return all(path.is_file() and path.stat().st_size > 0 for path in paths)
+
+    @classmethod
+    def _lookup(cls, voice_name: str) -> Optional['PiperVoice']:
+        with cls._lock:
+            cached = cls._voices.get(voice_name)
+            if cached:
+                cls._voices.move_to_end(voice_name)
+                return cached[0]
+            return None
+
+    @classmethod
+    def get(cls, voice_name: str) -> 'PiperVoice':
+        voice = cls._lookup(voice_name)
+        if voice:
+            return voice
+        with cls._lock:
+            load_lock = cls._load_locks.setdefault(voice_name, threading.Lock())
+        # Concurrent misses wait for the load in progress instead of building their own session
+        with load_lock:
+            voice = cls._lookup(voice_name)
+            if voice:
+                return voice
+            # onnxruntime is only loaded once a voice is actually needed
+            from piper import PiperVoice
+            model_path = cls.ensure_voice_files(voice_name)
+            voice = PiperVoice.load(model_path)
+            size = os.path.getsize(model_path)
+            logger.debug(f"Loaded Piper voice {voice_name} ({size} bytes)")
+
+            with cls._lock:
+                cls._voices[voice_name] = (voice, size)
+                cls._voices.move_to_end(voice_name)
+                cls._evict(keep=voice_name)
+        return voice
+
+    @classmethod
+    def _evict(cls, keep: str) -> None:
+        total = sum(size for _voice, size in cls._voices.values())
+        for name in list(cls._voices):
+            if total <= cls.max_bytes:
+                break
+            if name == keep:
+                continue
+            _voice, size = cls._voices.pop(name)
+            total -= size
+            logger.debug(f"Evicted Piper voice {name}")
+
+    @classmethod
+    def preload(cls, voice_names: Iterable[str]) -> None:
+        for voice_name in voice_names:
+            cls.get(voice_name)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._voices.clear()
+
+
+def _synthesize_to_wav(text: str, output_path: str, voice_name: str, speed: float) -> str:
+    """Synthesize ``text`` into a WAV file with a cached voice. Runs in threads and worker processes."""
+    from piper import SynthesisConfig
+    voice = VoiceCache.get(voice_name)
+    syn_config = SynthesisConfig(length_scale=speed)
+    with wave.open(output_path, "wb") as wav_file:
+        voice.synthesize_wav(text, wav_file, syn_config=syn_config)
+    return output_path
+
+
+def _synthesize_pcm(text: str, voice_name: str, speed: float) -> Tuple[bytes, int, int]:
+    """Synthesize ``text`` to raw 16-bit PCM. Returns (pcm, sample_rate, channels)."""
+    from piper import SynthesisConfig
+    voice = VoiceCache.get(voice_name)
+    chunks = list(voice.synthesize(text, syn_config=SynthesisConfig(length_scale=speed)))
+    if not chunks:
+        return b"", voice.config.sample_rate, 1
+    return (b"".join(chunk.audio_int16_bytes for chunk in chunks),
+            chunks[0].sample_rate,
+            chunks[0].sample_channels)
+
+
+@dataclass(frozen=True)
+class SpeechSegment:
+    """A synthesized sentence and where it sits in the narration, in seconds."""
+    text: str
+    start: float
+    end: float
+
+
+def _stitch(sentences: List[str],
+            results: List[Tuple[bytes, int, int]],
+            sentence_gap: float) -> Tuple[AudioBuffer, List[SpeechSegment]]:
+    """Join the PCM of each sentence in order, separated by silence, and return their timings."""
+    _pcm, sample_rate, channels = results[0]
+    gap = AudioBuffer.silence(sentence_gap, sample_rate, channels)
+    parts = []
+    segments = []
+    position = 0
+    for index, (sentence, (pcm, _rate, _channels)) in enumerate(zip(sentences, results)):
+        if index:
+            parts.append(gap.samples)
+            position += gap.frames
+        part = AudioBuffer.from_pcm16(pcm, sample_rate, channels)
+        parts.append(part.samples)
+        start = position / sample_rate
+        position += part.frames
+        segments.append(SpeechSegment(text=sentence, start=start, end=position / sample_rate))
+    return AudioBuffer(np.concatenate(parts), sample_rate), segments
+
+
+def _split_clauses(segment: SpeechSegment) -> List[SpeechSegment]:
+    """
+    Divide a sentence's span among its clauses in proportion to their length, for subtitles.
+    Sentence boundaries stay exact; only the positions within a sentence are estimated.
+    """
+    clauses = split_into_sentences(segment.text)
+    if len(clauses) < 2:
+        return [segment]
+    char_time = (segment.end - segment.start) / sum(len(clause) for clause in clauses)
+    pieces = []
+    start = segment.start
+    for clause in clauses:
+        end = start + char_time * len(clause)
+        pieces.append(SpeechSegment(text=clause, start=start, end=end))
+        start = end
+    return pieces[:-1] + [SpeechSegment(text=pieces[-1].text, start=pieces[-1].start, end=segment.end)]
+
+
+class TTSWorkerPool:
+    """
+    Long-lived worker processes with Piper voices preloaded, for batch narration.
+
+    Each worker keeps its own VoiceCache, so after warm-up narrations only pay for
+    synthesis itself, and several narrations can be synthesized in parallel.
+    """
+
+    def __init__(self, workers: int = 2, voices: Iterable[str] = ()):
+        voices = tuple(voices)
+        for voice_name in voices:
+            # Download once in the parent so workers don't race for the same files
+            VoiceCache.ensure_voice_files(voice_name)
+        self.executor = ProcessPoolExecutor(max_workers=workers,
+                                            initializer=VoiceCache.preload,
+                                            initargs=(voices,))
+
+    async def synthesize(self, text: str, output_path: str, voice_name: str, speed: float = 1) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _synthesize_to_wav,
+                                          text, output_path, voice_name, speed)
+
+    async def synthesize_pcm(self, text: str, voice_name: str, speed: float = 1) -> Tuple[bytes, int, int]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _synthesize_pcm, text, voice_name, speed)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+class VoiceAI:
+    # Pool used by every VoiceAI that isn't given one, e.g. the CLI's --tts-workers
+    default_worker_pool: Optional[TTSWorkerPool] = None
+
+    def __init__(self, worker_pool: Optional[TTSWorkerPool] = None):
+        self.worker_pool = worker_pool or self.default_worker_pool
 
     def synthesize_speech(self,
                           text: str,
                           output_path: str,
                           voice_name: str,
                           speed: float = 1) -> AudioFile:
-        syn_config = SynthesisConfig(length_scale=speed)
-        voice_path = self._download_piper_voice(voice_name)
-        voice = PiperVoice.load(voice_path)
-        with wave.open(output_path, "wb") as wav_file:
-            voice.synthesize_wav(text, wav_file, syn_config=syn_config)
+        _synthesize_to_wav(text, output_path, voice_name, speed)
         return AudioFile(output_path)
+
+    async def synthesize_speech_async(self,
+                                      text: str,
+                                      output_path: str,
+                                      voice_name: str,
+                                      speed: float = 1) -> AudioFile:
+        """Synthesize on the worker pool if there is one, otherwise in a worker thread."""
+        if self.worker_pool:
+            async with limit("local"):
+                await self.worker_pool.synthesize(text, output_path, voice_name, speed)
+            return await AudioFile.from_wav_async(output_path)
+        async with limit("local"):
+            return await asyncio.to_thread(self.synthesize_speech,
+                                           text=text,
+                                           output_path=output_path,
+                                           voice_name=voice_name,
+                                           speed=speed)
+
+    async def synthesize_buffer_async(self,
+                                      text: str,
+                                      voice_name: str,
+                                      speed: float = 1) -> AudioBuffer:
+        """Synthesize ``text`` into memory, leaving encoding to the caller."""
+        pcm, sample_rate, channels = await self._synthesize_pcm_async(text, voice_name, speed)
+        return AudioBuffer.from_pcm16(pcm, sample_rate, channels)
+
+    async def _synthesize_pcm_async(self, text: str, voice_name: str, speed: float) -> Tuple[bytes, int, int]:
+        async with limit("local"):
+            if self.worker_pool:
+                return await self.worker_pool.synthesize_pcm(text, voice_name, speed)
+            return await asyncio.to_thread(_synthesize_pcm, text, voice_name, speed)
+
+    async def synthesize_timed_buffer_async(self,
+                                            text: str,
+                                            voice_name: str,
+                                            speed: float = 1,
+                                            sentence_gap: float = 0.1) -> Tuple[AudioBuffer, List[SpeechSegment]]:
+        """
+        Synthesize each sentence concurrently and stitch the audio in order, with
+        ``sentence_gap`` seconds of silence in between. Text is only split where sentences
+        end, so clauses keep their natural prosody. The exact position of every sentence
+        follows from its sample count; its clauses are returned as separate segments, for
+        subtitles. Sentences run on the worker pool if there is one, otherwise in threads
+        (ONNX inference releases the GIL).
+        """
+        sentences = split_at_sentence_ends(text)
+        if not sentences:
+            raise ValueError("Narration text is empty.")
+        results = await asyncio.gather(*[self._synthesize_pcm_async(s, voice_name, speed) for s in sentences])
+        buffer, segments = _stitch(sentences, results, sentence_gap)
+        logger.debug(f"Stitched {len(segments)} sentences ({buffer.duration:.2f}s)")
+        return buffer, [clause for segment in segments for clause in _split_clauses(segment)]
+
+    async def synthesize_sentences_async(self,
+                                         text: str,
+                                         output_path: str,
+                                         voice_name: str,
+                                         speed: float = 1,
+                                         sentence_gap: float = 0.1) -> Tuple[AudioFile, List[SpeechSegment]]:
+        """Like synthesize_timed_buffer_async, encoded to ``output_path``."""
+        buffer, segments = await self.synthesize_timed_buffer_async(text, voice_name, speed, sentence_gap)
+        return await buffer.encode_async(output_path), segments
@@ -0,0 +1,247 @@
+"""
+Batch runner: ``mediaichemy-cli [PROMPTS ...] [options]``.
+
+Prompts come from text files (one prompt per line), stdin (``-``) or a directory of
+``.txt`` files (one prompt per file, the ``prompts/`` directory by default). Every finished
+job is appended to a JSONL manifest; running the same batch again skips the jobs the
+manifest records as done, so an interrupted batch resumes where it stopped.
+
+Heavy modules (AI clients, media pipelines) are only imported once there is work to do.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Set
+
+from mediaichemy.prompts import load_prompt_file
+
+import logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROMPTS_DIR = "prompts"
+DEFAULT_MANIFEST = "media/manifest.jsonl"
+
+
+class PromptJob(NamedTuple):
+    id: str
+    prompt: str
+
+
+def _prompt_id(prompt: str, seen: Dict[str, int]) -> str:
+    digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:12]
+    seen[digest] = seen.get(digest, 0) + 1
+    return digest if seen[digest] == 1 else f"{digest}-{seen[digest]}"
+
+
+def _read_lines(lines: Sequence[str], seen: Dict[str, int]) -> Iterator[PromptJob]:
+    for line in lines:
+        prompt = line.strip()
+        if prompt and not prompt.startswith("#"):
+            yield PromptJob(_prompt_id(prompt, seen), prompt)
+
+
+def read_prompts(sources: Sequence[str], stdin=None) -> List[PromptJob]:
+    """
+    Jobs for each source: ``-`` reads stdin, a directory yields one job per ``.txt`` file
+    (identified by its file name) and a file yields one job per non-empty line (identified
+    by a hash of the prompt). Lines starting with ``#`` are ignored.
+    """
+    jobs: List[PromptJob] = []
+    seen: Dict[str, int] = {}
+    for source in sources or [DEFAULT_PROMPTS_DIR]:
+        if source == "-":
+            jobs.extend(_read_lines((stdin or sys.stdin).read().splitlines(), seen))
+        elif os.path.isdir(source):
+            for filename in sorted(f for f in os.listdir(source) if f.endswith(".txt")):
+                prompt = load_prompt_file(os.path.join(source, filename)).strip()
+                if prompt:
+                    jobs.append(PromptJob(os.path.splitext(filename)[0], prompt))
+        elif os.path.isfile(source):
+            with open(source, encoding="utf-8") as f:
+                jobs.extend(_read_lines(f.read().splitlines(), seen))
+        else:
+            raise FileNotFoundError(f"Prompt source '{source}' not found")
+    return jobs
+
+
+def completed_ids(manifest_path: str) -> Set[str]:
+    """Ids of the jobs the manifest records as successfully finished."""
+    done = set()
+    if not os.path.exists(manifest_path):
+        return done
+    with open(manifest_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by an interruption
+                continue
+            if record.get("status") == "ok":
+                done.add(record["id"])
+    return done
+
+
+def _parse_param(value: str):
+    key, sep, raw = value.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"Expected KEY=VALUE, got '{value}'")
+    try:
+        return key, json.loads(raw)
+    except json.JSONDecodeError:
+        return key, raw
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="mediaichemy-cli",
+                                     description="Create media for a batch of prompts.")
+    parser.add_argument("sources", nargs="*", metavar="PROMPTS",
+                        help=f"prompt files, directories of .txt prompts or '-' for stdin "
+                             f"(default: {DEFAULT_PROMPTS_DIR}/)")
+    parser.add_argument("-t", "--media-type",
+                        help="media type for every prompt (e.g. storyline_video); picked by the AI if omitted")
+    parser.add_argument("-m", "--model", help="LLM used to write outlines and captions")
+    parser.add_argument("--hedge-after", type=float, default=None, metavar="SECONDS",
+                        help="also ask the next model when an LLM request takes longer than this")
+    parser.add_argument("-p", "--param", action="append", type=_parse_param, default=[], metavar="KEY=VALUE",
+                        help="outline parameter to override, value parsed as JSON if possible (repeatable)")
+    parser.add_argument("-j", "--workers", type=int, default=4, help="prompts processed at a time (default: 4)")
+    parser.add_argument("--llm-limit", type=int, default=4, help="concurrent LLM calls (default: 4)")
+    parser.add_argument("--visual-limit", type=int, default=2, help="concurrent Runware generations (default: 2)")
+    parser.add_argument("--local-limit", type=int, default=None,
+                        help="concurrent local ffmpeg/TTS jobs (default: unlimited; ffmpeg is always "
+                             "capped at the number of cores)")
+    parser.add_argument("--tts-workers", type=int, default=0,
+                        help="worker processes with the narration voice preloaded (default: 0, use threads)")
+    parser.add_argument("-o", "--manifest", default=DEFAULT_MANIFEST,
+                        help=f"JSONL manifest of finished jobs (default: {DEFAULT_MANIFEST})")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="run every prompt, even those the manifest records as done")
+    parser.add_argument("-v", "--verbose", action="store_true", help="debug logging")
+    return parser
+
+
+def _resolve_media_type(name: Optional[str]):
+    if name is None:
+        return None
+    from mediaichemy.media.type_picker import MEDIA_TYPES
+    if name not in MEDIA_TYPES:
+        raise SystemExit(f"Unknown media type '{name}'. Choose one of: {', '.join(MEDIA_TYPES)}")
+    return MEDIA_TYPES[name][0]
+
+
+def _narration_voice(args: argparse.Namespace) -> str:
+    """The voice the batch narrates with: a -p narration_voice_name override or the default."""
+    from mediaichemy.media.parameters import NarrationParameters
+    default = NarrationParameters.model_fields["narration_voice_name"].default
+    return dict(args.param).get("narration_voice_name", default)
+
+
+def _output_paths(output):
+    """JSON-friendly form of a job output: files become paths, also inside lists."""
+    if isinstance(output, (list, tuple)):
+        return [_output_paths(item) for item in output]
+    return getattr(output, "path", output)
+
+
+def _record(job: PromptJob, result) -> dict:
+    return {
+        "id": job.id,
+        "prompt": job.prompt,
+        "status": "ok" if result.ok else "failed",
+        "media_type": type(result.media).__name__ if result.media is not None else None,
+        "output": _output_paths(result.output),
+        "cost": result.cost,
+        "elapsed": round(result.elapsed, 3),
+        "stage_timings": {name: round(seconds, 3) for name, seconds in result.stage_timings.items()},
+        "error": None if result.ok else f"{type(result.error).__name__}: {result.error}",
+        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+async def run_batch(args: argparse.Namespace, jobs: List[PromptJob]) -> int:
+    """Run ``jobs``, appending a manifest record as each finishes. Returns the number of failures."""
+    from mediaichemy.concurrency import ConcurrencyLimits
+    from mediaichemy.creator import MediaCreator
+
+    creator = MediaCreator(media_type=_resolve_media_type(args.media_type), creator_model=args.model,
+                           hedge_after=args.hedge_after)
+    limits = ConcurrencyLimits(llm=args.llm_limit, visual=args.visual_limit, local=args.local_limit)
+    manifest_dir = os.path.dirname(args.manifest)
+    if manifest_dir:
+        os.makedirs(manifest_dir, exist_ok=True)
+
+    if args.tts_workers:
+        from mediaichemy.ai.voice import TTSWorkerPool, VoiceAI
+        VoiceAI.default_worker_pool = TTSWorkerPool(workers=args.tts_workers, voices=[_narration_voice(args)])
+    try:
+        return await _run_jobs(args, jobs, creator, limits)
+    finally:
+        await creator.aclose()
+        if args.tts_workers:
+            VoiceAI.default_worker_pool.shutdown()
+            VoiceAI.default_worker_pool = None
+
+
+async def _run_jobs(args: argparse.Namespace, jobs: List[PromptJob], creator, limits) -> int:
+    failures = 0
+    with open(args.manifest, "a", encoding="utf-8") as manifest:
+        async for result in creator.create_many([job.prompt for job in jobs],
+                                                max_jobs=args.workers,
+                                                limits=limits,
+                                                **dict(args.param)):
+            job = jobs[result.index]
+            record = _record(job, result)
+            if not _write_record(manifest, record):
+                # Not recorded as done, so the job runs again on resume
+                record["status"] = "failed"
+            failures += record["status"] != "ok"
+            logger.info(f"[{job.id}] {record['status']}: {record['output'] or record['error']}")
+    return failures
+
+
+def _write_record(manifest, record: dict) -> bool:
+    """Append ``record`` to the manifest. A record that cannot be written must not stop the batch."""
+    try:
+        line = json.dumps(record, default=str)
+    except (TypeError, ValueError) as e:
+        logger.error(f"[{record['id']}] Could not serialize manifest record: {e}")
+        return False
+    try:
+        manifest.write(line + "\n")
+        manifest.flush()
+    except OSError as e:
+        logger.error(f"[{record['id']}] Could not write manifest record: {e}")
+        return False
+    return True
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        jobs = read_prompts(args.sources)
+    except FileNotFoundError as e:
+        logger.error(e)
+        return 2
+    if not args.no_resume:
+        done = completed_ids(args.manifest)
+        skipped = sum(job.id in done for job in jobs)
+        if skipped:
+            logger.info(f"Skipping {skipped} prompts already completed in {args.manifest}")
+        jobs = [job for job in jobs if job.id not in done]
+    if not jobs:
+        logger.info("Nothing to do")
+        return 0
+
+    failures = asyncio.run(run_batch(args, jobs))
+    logger.info(f"Finished {len(jobs) - failures}/{len(jobs)} prompts")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
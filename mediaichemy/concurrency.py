@@ -0,0 +1,50 @@
+import asyncio
+import contextvars
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict, Literal, Optional
+
+Resource = Literal["llm", "visual", "local"]
+
+
+class ConcurrencyLimits:
+    """
+    Separate caps on concurrent LLM calls, Runware generations and local ffmpeg/TTS work.
+
+    Limits apply to the tasks they are activated in (and the tasks those start), so batch
+    jobs can share a budget without affecting unrelated callers. ``None`` means unlimited.
+    """
+
+    def __init__(self, llm: Optional[int] = 4, visual: Optional[int] = 2, local: Optional[int] = None):
+        self.sizes: Dict[str, Optional[int]] = {"llm": llm, "visual": visual, "local": local}
+        self._semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]' = \
+            weakref.WeakKeyDictionary()
+
+    def semaphore(self, resource: Resource) -> Optional[asyncio.Semaphore]:
+        size = self.sizes[resource]
+        if size is None:
+            return None
+        semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        if resource not in semaphores:
+            semaphores[resource] = asyncio.Semaphore(size)
+        return semaphores[resource]
+
+    def activate(self) -> contextvars.Token:
+        """Apply these limits to the current task and the tasks it creates from now on."""
+        return _active_limits.set(self)
+
+
+_active_limits: 'contextvars.ContextVar[Optional[ConcurrencyLimits]]' = \
+    contextvars.ContextVar("mediaichemy_concurrency_limits", default=None)
+
+
+@asynccontextmanager
+async def limit(resource: Resource):
+    """Hold a slot of ``resource`` under the active limits, if any."""
+    limits = _active_limits.get()
+    semaphore = limits.semaphore(resource) if limits else None
+    if semaphore is None:
+        yield
+        return
+    async with semaphore:
+        yield
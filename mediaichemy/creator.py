@@ -1,12 +1,35 @@
-from typing import Type, Optional
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Optional, Type, Union
 
 from mediaichemy.ai import AgentAI
+from mediaichemy.concurrency import ConcurrencyLimits
 from mediaichemy.media.type_picker import MediaTypePicker
+from mediaichemy.media.stages import StageGraph
 
 import logging
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class JobResult:
+    """Outcome of one prompt of a batch. ``error`` is set instead of raising when the job failed."""
+    index: int
+    prompt: str
+    media: Any = None
+    output: Any = None
+    cost: float = 0
+    error: Optional[BaseException] = None
+    elapsed: float = 0
+    stage_timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 class MediaCreator:
     base_system_prompt = (
         "You are an expert content creator.\n"
@@ -17,9 +40,12 @@ class MediaCreator:
 
     def __init__(self,
                  media_type: Optional[Type] = None,
-                 creator_model: str = None):
+                 creator_model: str = None,
+                 hedge_after: Optional[float] = None):
+        """hedge_after: latency budget in seconds after which LLM requests are hedged (see ChatAI)."""
         self.media_type = media_type
         self.creator_model = creator_model
+        self.hedge_after = hedge_after
 
     @property
     def system_prompt(self) -> str:
@@ -31,20 +57,20 @@ class MediaCreator:
         await self.create_outline(user_prompt=user_prompt)
         if kwargs:
             self.adjust_outline_params(**kwargs)
-        await self.create_media()
-        await self.create_captions()
+        await self.create_media_with_captions()
         return self.media
 
     async def ensure_media_type(self, user_prompt: str):
         if self.media_type is None:
-            picker = MediaTypePicker(model=self.creator_model)
+            picker = MediaTypePicker(model=self.creator_model, hedge_after=self.hedge_after)
             self.media_type = await picker.pick(user_prompt)
 
     def initialize_agent(self):
         self.agent = AgentAI(
             output_type=self.media_type.params_class,
             system_prompt=self.system_prompt,
-            model=self.creator_model
+            model=self.creator_model,
+            hedge_after=self.hedge_after
         )
 
     async def create_outline(self, user_prompt: str):
@@ -78,6 +104,121 @@ class MediaCreator:
         await self.media.create()
         return self.media
 
+    async def create_media_with_captions(self):
+        """
+        Captions only depend on the outline, so they are written while the media renders.
+        If either side fails the other is cancelled.
+        """
+        self.initialize_media()
+        stages = (StageGraph()
+                  .add("media", self.media.create)
+                  .add("captions", self.create_captions))
+        try:
+            results = await stages.run()
+        finally:
+            self.stage_timings = stages.timings
+        self.output, self.cost = results["media"]
+        return self.media
+
     async def create_captions(self):
         self._check_outline()
-        return await self.media.create_captions(model=self.creator_model)
+        return await self.media.create_captions(model=self.creator_model, hedge_after=self.hedge_after)
+
+    async def create_many(self,
+                          prompts: Union[Iterable[str], AsyncIterable[str]],
+                          max_jobs: int = 4,
+                          limits: Optional[ConcurrencyLimits] = None,
+                          **kwargs) -> AsyncIterator[JobResult]:
+        """
+        Create one media per prompt, running up to ``max_jobs`` prompts at a time and
+        yielding a JobResult for each as soon as it finishes (not in prompt order).
+
+        Every job runs on its own MediaCreator, so this instance is never mutated. LLM calls,
+        Runware generations and local ffmpeg/TTS work are additionally capped by ``limits``
+        across all jobs. A failing job is reported through JobResult.error and does not
+        affect the others; an error raised by ``prompts`` itself stops the batch.
+        """
+        limits = limits or ConcurrencyLimits()
+        prompt_iterator = _aiter(prompts)
+        next_lock = asyncio.Lock()
+        results: asyncio.Queue = asyncio.Queue()
+        counter = itertools.count()
+
+        async def next_prompt():
+            async with next_lock:
+                try:
+                    return next(counter), await prompt_iterator.__anext__()
+                except StopAsyncIteration:
+                    return None
+
+        async def worker():
+            limits.activate()
+            try:
+                while (job := await next_prompt()) is not None:
+                    await results.put(await self._run_job(*job, **kwargs))
+            except Exception as e:
+                # Only the prompt source can fail here; jobs report their own errors
+                await results.put(e)
+            finally:
+                await results.put(None)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(max(1, max_jobs))]
+        try:
+            running = len(workers)
+            while running:
+                result = await results.get()
+                if result is None:
+                    running -= 1
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    @staticmethod
+    async def aclose() -> None:
+        """
+        Close the connections pooled for the running event loop (OpenRouter, Runware websockets
+        and downloads). Call it once all work on the loop is done; later requests would open new
+        connections.
+        """
+        from mediaichemy.ai.llm.provider_pool import ProviderPool
+        from mediaichemy.ai.visual.runware_pool import RunwarePool
+        from mediaichemy.file.download import AsyncHTTPDownloader
+        await ProviderPool.aclose()
+        await RunwarePool.close_all()
+        await AsyncHTTPDownloader.aclose()
+
+    async def _run_job(self, index: int, prompt: str, **kwargs) -> JobResult:
+        creator = MediaCreator(media_type=self.media_type, creator_model=self.creator_model,
+                               hedge_after=self.hedge_after)
+        start = time.monotonic()
+        try:
+            media = await creator.create(prompt, **kwargs)
+            return JobResult(index=index, prompt=prompt, media=media,
+                             output=creator.output, cost=creator.cost,
+                             elapsed=time.monotonic() - start,
+                             stage_timings=_collect_timings(creator))
+        except Exception as e:
+            logger.error(f"Job {index} ({prompt!r}) failed: {e}")
+            return JobResult(index=index, prompt=prompt, media=getattr(creator, "media", None), error=e,
+                             elapsed=time.monotonic() - start,
+                             stage_timings=_collect_timings(creator))
+
+
+def _collect_timings(creator: MediaCreator) -> Dict[str, float]:
+    timings = dict(getattr(creator, "stage_timings", {}))
+    timings.update(getattr(getattr(creator, "media", None), "stage_timings", {}))
+    return timings
+
+
+async def _aiter(prompts: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    if hasattr(prompts, "__aiter__"):
+        async for prompt in prompts:
+            yield prompt
+    else:
+        for prompt in prompts:
+            yield prompt
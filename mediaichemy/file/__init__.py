@@ -1,3 +1,4 @@
 from .file import File, download_file
-from .filetypes import JSONFile, ImageFile, VideoFile, AudioFile, SubtitleFile
-from .download import HTTPDownloader
+from .filetypes import JSONFile, TimingFile, ImageFile, VideoFile, AudioFile, SubtitleFile
+from .download import HTTPDownloader, AsyncHTTPDownloader
+from .audio_buffer import AudioBuffer
@@ -0,0 +1,160 @@
+from typing import Optional
+import os
+import wave
+
+import numpy as np
+
+from .filetypes import AudioFile
+from mediaichemy.process import MediaProcess
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class AudioBuffer:
+    """
+    Float PCM held in memory, shaped (frames, channels) with samples in [-1, 1].
+
+    Narrations are assembled on buffers (padding, gain, mixing) and encoded once at the
+    end, instead of being re-encoded by ffmpeg after every step.
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int):
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.ndim == 1:
+            samples = samples[:, np.newaxis]
+        self.samples = samples
+        self.sample_rate = sample_rate
+
+    @property
+    def channels(self) -> int:
+        return self.samples.shape[1]
+
+    @property
+    def frames(self) -> int:
+        return self.samples.shape[0]
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.sample_rate
+
+    @classmethod
+    def silence(cls, duration: float, sample_rate: int, channels: int = 1) -> 'AudioBuffer':
+        return cls(np.zeros((round(duration * sample_rate), channels), dtype=np.float32), sample_rate)
+
+    @classmethod
+    def from_pcm16(cls, pcm: bytes, sample_rate: int, channels: int = 1) -> 'AudioBuffer':
+        samples = np.frombuffer(pcm, dtype='<i2').astype(np.float32) / 32768.0
+        return cls(samples.reshape(-1, channels), sample_rate)
+
+    @classmethod
+    def from_wav(cls, path: str) -> 'AudioBuffer':
+        with wave.open(path, 'rb') as wav_file:
+            if wav_file.getsampwidth() != 2:
+                raise ValueError(f"Only 16-bit WAV files are supported, got {path}.")
+            pcm = wav_file.readframes(wav_file.getnframes())
+            return cls.from_pcm16(pcm, wav_file.getframerate(), wav_file.getnchannels())
+
+    @staticmethod
+    def _decode_command(path: str, sample_rate: int, channels: int,
+                        start: Optional[float], duration: Optional[float]) -> list:
+        command = ['ffmpeg', '-v', 'error']
+        if start:
+            # Input seeking: the decoder starts at the nearest seek point instead of decoding from 0
+            command += ['-ss', str(start)]
+        if duration:
+            command += ['-t', str(duration)]
+        return command + ['-i', path, '-f', 'f32le', '-ac', str(channels), '-ar', str(sample_rate), '-']
+
+    @classmethod
+    def decode(cls, path: str, sample_rate: int = 44100, channels: int = 2,
+               start: Optional[float] = None, duration: Optional[float] = None) -> 'AudioBuffer':
+        """Decode (a section of) any audio file ffmpeg can read, converted to the given format."""
+        result = MediaProcess.run(cls._decode_command(path, sample_rate, channels, start, duration),
+                                  capture_output=True)
+        return cls(np.frombuffer(result.stdout, dtype='<f4').reshape(-1, channels), sample_rate)
+
+    @classmethod
+    async def decode_async(cls, path: str, sample_rate: int = 44100, channels: int = 2,
+                           start: Optional[float] = None, duration: Optional[float] = None) -> 'AudioBuffer':
+        result = await MediaProcess.arun(cls._decode_command(path, sample_rate, channels, start, duration),
+                                         capture_output=True)
+        return cls(np.frombuffer(result.stdout, dtype='<f4').reshape(-1, channels), sample_rate)
+
+    def _remix(self, channels: int) -> 'AudioBuffer':
+        if channels == self.channels:
+            return self
+        mono = self.samples.mean(axis=1, keepdims=True)
+        return AudioBuffer(np.repeat(mono, channels, axis=1), self.sample_rate)
+
+    def _resample_command(self, sample_rate: int) -> list:
+        # Band-limited resampling by libswresample, piped raw in and out
+        return ['ffmpeg', '-v', 'error',
+                '-f', 'f32le', '-ar', str(self.sample_rate), '-ac', str(self.channels), '-i', '-',
+                '-af', 'aresample', '-f', 'f32le', '-ar', str(sample_rate), '-']
+
+    def _from_raw(self, raw: bytes, sample_rate: int) -> 'AudioBuffer':
+        return AudioBuffer(np.frombuffer(raw, dtype='<f4').reshape(-1, self.channels), sample_rate)
+
+    def conform(self, sample_rate: int, channels: int) -> 'AudioBuffer':
+        """
+        Return the buffer up/down-mixed and resampled to the given format. Resampling runs
+        through ffmpeg's filtered resampler, so upsampled speech gets no imaging artifacts.
+        """
+        buffer = self._remix(channels)
+        if sample_rate == buffer.sample_rate or not buffer.frames:
+            return AudioBuffer(buffer.samples, sample_rate)
+        result = MediaProcess.run(buffer._resample_command(sample_rate), input=buffer._pcm(), capture_output=True)
+        return buffer._from_raw(result.stdout, sample_rate)
+
+    async def conform_async(self, sample_rate: int, channels: int) -> 'AudioBuffer':
+        buffer = self._remix(channels)
+        if sample_rate == buffer.sample_rate or not buffer.frames:
+            return AudioBuffer(buffer.samples, sample_rate)
+        result = await MediaProcess.arun(buffer._resample_command(sample_rate), input=buffer._pcm(),
+                                         capture_output=True)
+        return buffer._from_raw(result.stdout, sample_rate)
+
+    def pad(self, duration: float) -> 'AudioBuffer':
+        """Return the buffer followed by ``duration`` seconds of silence."""
+        silence = np.zeros((round(duration * self.sample_rate), self.channels), dtype=np.float32)
+        return AudioBuffer(np.concatenate([self.samples, silence]), self.sample_rate)
+
+    def gain(self, factor: float) -> 'AudioBuffer':
+        return AudioBuffer(self.samples * factor, self.sample_rate)
+
+    def mix(self, other: 'AudioBuffer', background_relative_volume: float) -> 'AudioBuffer':
+        """
+        Mix ``other`` under this buffer with the same balance as AudioEditor.mix_with
+        (ffmpeg amix averages its inputs). The result has the format of this buffer and
+        the length of the longer input.
+        """
+        if not (0.0 <= background_relative_volume <= 2.0):
+            raise ValueError("background_relative_volume must be between 0 and 2.")
+        other = other.conform(self.sample_rate, self.channels)
+        frames = max(self.frames, other.frames)
+        mixed = np.zeros((frames, self.channels), dtype=np.float32)
+        mixed[:self.frames] += self.samples * (2.0 - background_relative_volume) / 2
+        mixed[:other.frames] += other.samples * background_relative_volume / 2
+        return AudioBuffer(mixed, self.sample_rate)
+
+    def _encode_command(self, output_path: str) -> list:
+        return ['ffmpeg', '-y', '-v', 'error',
+                '-f', 'f32le', '-ar', str(self.sample_rate), '-ac', str(self.channels), '-i', '-',
+                output_path]
+
+    def _pcm(self) -> bytes:
+        return np.clip(self.samples, -1.0, 1.0).astype('<f4').tobytes()
+
+    def encode(self, output_path: str) -> AudioFile:
+        """Encode the buffer once, in the format given by the output extension."""
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        MediaProcess.run(self._encode_command(output_path), input=self._pcm(), capture_output=True)
+        logger.debug(f"Encoded {self.duration:.2f}s of audio to {output_path}")
+        return AudioFile(output_path)
+
+    async def encode_async(self, output_path: str) -> AudioFile:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        await MediaProcess.arun(self._encode_command(output_path), input=self._pcm(), capture_output=True)
+        logger.debug(f"Encoded {self.duration:.2f}s of audio to {output_path}")
+        return AudioFile(output_path)
@@ -1,9 +1,13 @@
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import asyncio
+import weakref
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+import httpx
 import os
 from . import utils
 from logging import getLogger
+
+if TYPE_CHECKING:
+    import requests
 logger = getLogger(__name__)
 
 
@@ -19,8 +23,11 @@ class HTTPDownloader:
         self._backoff_factor = backoff_factor
         self.session = self._build_session()
 
-    def _build_session(self) -> requests.Session:
+    def _build_session(self) -> 'requests.Session':
         """Create a requests.Session configured with urllib3 Retry + HTTPAdapter."""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
         session = requests.Session()
         retry = Retry(
             total=self._max_retries,
@@ -51,3 +58,158 @@ class HTTPDownloader:
                     fh.write(chunk)
         logger.debug(f"Finished downloading {url} to {destination}")
         return destination
+
+
+class AsyncHTTPDownloader:
+    """
+    Non-blocking HTTP downloader built on httpx.
+
+    A single connection pool per event loop is shared by every instance, so concurrent
+    downloads to the same host reuse keep-alive connections. Bodies are streamed with large
+    buffers into a ``.part`` file that is resumed with a Range request after a failure and
+    moved into place once complete. Large files served with range support are fetched as
+    several segments in parallel; if one segment fails for good, the others are cancelled and
+    the partial file is removed.
+    """
+    chunk_size = 1024 * 1024
+    retry_statuses = {422, 429, 500, 502, 503, 504}
+    limits = httpx.Limits(max_connections=64, max_keepalive_connections=16, keepalive_expiry=60)
+
+    _clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]' = \
+        weakref.WeakKeyDictionary()
+
+    def __init__(self, *,
+                 max_retries: int = 5,
+                 backoff_factor: float = 0.5,
+                 timeout: int = 20,
+                 max_segments: int = 4,
+                 parallel_threshold: int = 32 * 1024 * 1024):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_segments = max_segments
+        self.parallel_threshold = parallel_threshold
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close the connection pool of the running loop."""
+        client = cls._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=self.timeout,
+                                       limits=self.limits,
+                                       follow_redirects=True)
+            self._clients[loop] = client
+        return client
+
+    async def download(self, url: str, destination: str) -> str:
+        """Download the URL to destination. Returns the destination path."""
+        logger.info(f"Downloading {url} to {destination}")
+        utils.ensure_dir(os.path.dirname(destination) or ".")
+        part_path = f"{destination}.part"
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+        size = await self._probe_ranged_size(url)
+        if size is not None and size >= self.parallel_threshold and self.max_segments > 1:
+            await self._download_segments(url, part_path, size)
+        else:
+            await self._with_retries(url, lambda: self._download_resumable(url, part_path))
+
+        os.replace(part_path, destination)
+        logger.debug(f"Finished downloading {url} to {destination}")
+        return destination
+
+    async def download_many(self,
+                            downloads: Iterable[Tuple[str, str]],
+                            concurrency: int = 8) -> List[str]:
+        """Download several (url, destination) pairs concurrently, preserving their order."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(url, destination):
+            async with semaphore:
+                return await self.download(url, destination)
+
+        return list(await asyncio.gather(*(bounded(url, dest) for url, dest in downloads)))
+
+    async def _with_retries(self, url: str, attempt):
+        for retry in range(self.max_retries + 1):
+            try:
+                return await attempt()
+            except (httpx.TransportError, httpx.HTTPStatusError) as error:
+                retryable = (not isinstance(error, httpx.HTTPStatusError)
+                             or error.response.status_code in self.retry_statuses)
+                if not retryable or retry == self.max_retries:
+                    raise
+                delay = self.backoff_factor * (2 ** retry)
+                logger.warning(f"Download of {url} failed ({error}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def _probe_ranged_size(self, url: str) -> Optional[int]:
+        """Return the content length if the server supports byte ranges, otherwise None."""
+        try:
+            response = await self.client.head(url)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return None
+        if response.headers.get("Accept-Ranges", "").lower() != "bytes":
+            return None
+        length = response.headers.get("Content-Length")
+        return int(length) if length and length.isdigit() else None
+
+    async def _download_resumable(self, url: str, part_path: str) -> None:
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        async with self.client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 416:
+                return  # The partial file is already complete
+            response.raise_for_status()
+            mode = "ab" if offset and response.status_code == 206 else "wb"
+            with open(part_path, mode) as fh:
+                async for chunk in response.aiter_bytes(self.chunk_size):
+                    fh.write(chunk)
+
+    async def _download_segments(self, url: str, part_path: str, size: int) -> None:
+        with open(part_path, "wb") as fh:
+            fh.truncate(size)
+        segment_size = -(-size // self.max_segments)
+        ranges = [(start, min(start + segment_size, size) - 1) for start in range(0, size, segment_size)]
+        logger.debug(f"Downloading {url} in {len(ranges)} parallel segments")
+        tasks = [asyncio.ensure_future(self._download_segment(url, part_path, start, end)) for start, end in ranges]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        except BaseException:
+            # Stop the other segments writing before the partial file goes away
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+
+    async def _download_segment(self, url: str, part_path: str, start: int, end: int) -> None:
+        written = 0
+
+        async def attempt():
+            nonlocal written
+            headers = {"Range": f"bytes={start + written}-{end}"}
+            async with self.client.stream("GET", url, headers=headers) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise httpx.HTTPStatusError("Server ignored the Range header",
+                                                request=response.request, response=response)
+                with open(part_path, "r+b") as fh:
+                    fh.seek(start + written)
+                    async for chunk in response.aiter_bytes(self.chunk_size):
+                        fh.write(chunk)
+                        written += len(chunk)
+
+        await self._with_retries(url, attempt)
@@ -1,8 +1,9 @@
 from .utils import get_next_available_path
-from typing import Tuple, List
+from .probe import MediaProbe
+from typing import Tuple, List, Iterator, BinaryIO
+import mmap
 import os
 import shutil
-import requests
 import logging
 import hashlib
 
@@ -16,30 +17,72 @@ class File:
         self.path = path
         self.extensions = extensions or []
         self.validate_extensions()
-        self.data = self.load()
+        self._data = None
+
+    @property
+    def data(self):
+        """File contents, loaded on first access only."""
+        if self._data is None:
+            self._data = self.load()
+        return self._data
+
+    @data.setter
+    def data(self, value) -> None:
+        self.unload()
+        self._data = value
+
+    def unload(self) -> None:
+        """Drop the loaded contents so they are read again on the next access."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = None
 
     def save(self) -> None:
         os.makedirs(self.dir, exist_ok=True)
+        data = self.data
+        if isinstance(data, mmap.mmap):
+            # Truncating a file while it is mapped is undefined, take a copy first
+            data = data[:]
+            self.unload()
         with open(self.path, 'wb') as f:
-            f.write(self.data)
+            f.write(data)
         logger.debug(f'File saved: {self.path}')
 
-    def load(self) -> bytes:
+    def load(self):
+        """Map the file read-only into memory. Pages are only read from disk when accessed."""
         self.validate_file()
+        if os.path.getsize(self.path) == 0:
+            return b''
         with open(self.path, 'rb') as f:
-            data = f.read()
-        logger.debug(f"Loaded file: {self.path}")
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        logger.debug(f"Mapped file: {self.path}")
         return data
 
+    def open(self) -> BinaryIO:
+        """Open the file for streaming reads."""
+        self.validate_file()
+        return open(self.path, 'rb')
+
+    def iter_chunks(self, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        with self.open() as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                yield chunk
+
     def replace_with(self, source_file: 'File') -> None:
-        if self.exists():
-            self.delete()
-        shutil.move(source_file.path, self.path)
-        self.data = self.load()
+        self.unload()
+        try:
+            os.replace(source_file.path, self.path)
+        except OSError:
+            # Source lives on another filesystem
+            shutil.move(source_file.path, self.path)
+        MediaProbe.invalidate(self.path)
+        MediaProbe.invalidate(source_file.path)
         logger.debug(f"Replaced {self.path} with {source_file.path}")
 
     def delete(self) -> None:
+        self.unload()
         os.remove(self.path)
+        MediaProbe.invalidate(self.path)
         logger.debug(f"Deleted file: {self.path}")
 
     def exists(self) -> bool:
@@ -93,13 +136,13 @@ class File:
     @property
     def hash(self):
         hash_obj = hashlib.sha256()
-        with open(self.path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                hash_obj.update(chunk)
+        for chunk in self.iter_chunks():
+            hash_obj.update(chunk)
         return hash_obj.hexdigest()
 
 
 def download_file(url: str, destination: str) -> str:
+    import requests
     destination = get_next_available_path(destination)
     response = requests.get(url)
     response.raise_for_status()
@@ -1,15 +1,17 @@
 from .file import File
 from .utils import get_next_available_path
 import json
-from typing import Optional, Union, Literal
+from typing import TYPE_CHECKING, Optional, Union, Literal, Tuple
 import os
-import subprocess
 from pathlib import Path
-from PIL import Image
-from mutagen.mp3 import MP3
 import logging
 import io
-from runware.types import IFrameImage
+from mediaichemy.process import MediaProcess
+from .probe import MediaProbe, MediaInfo
+
+if TYPE_CHECKING:
+    from PIL import Image
+    from runware.types import IFrameImage
 logger = logging.getLogger(__name__)
 
 
@@ -31,37 +33,65 @@ class JSONFile(File):
         logger.debug(f"Saved JSON file: {self.path}")
 
 
+class TimingFile(JSONFile):
+    """Sidecar with the start and end of each narrated sentence, in seconds."""
+
+    @classmethod
+    def create(cls, path: str, segments: list) -> 'TimingFile':
+        timing = cls(path)
+        timing.data = {"segments": segments}
+        timing.save()
+        return timing
+
+    @property
+    def segments(self) -> list:
+        return self.data["segments"]
+
+
 class VideoFile(File):
     def __init__(self, path):
         super().__init__(path, extensions=[".mp4", ".avi", ".mov", ".mkv", ".webm"])
 
+    @property
+    def info(self) -> MediaInfo:
+        """Container and stream metadata, probed once per file version."""
+        return MediaProbe.info(self.path)
+
+    async def get_info_async(self) -> MediaInfo:
+        return await MediaProbe.info_async(self.path)
+
     def get_duration(self) -> float:
-        result = subprocess.run(
-            [
-                'ffprobe',
-                '-v', 'error',
-                '-show_entries', 'format=duration',
-                '-of', 'default=noprint_wrappers=1:nokey=1',
-                self.path
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        duration = float(result.stdout.strip())
-        return duration
+        return self.info.duration
+
+    async def get_duration_async(self) -> float:
+        return (await self.get_info_async()).duration
+
+    def get_frame_count(self) -> int:
+        """Count the frames of the first video stream (demux only, no decoding)."""
+        return MediaProbe.packets(self.path).frame_count
+
+    async def get_frame_count_async(self) -> int:
+        return (await MediaProbe.packets_async(self.path)).frame_count
+
+    def get_keyframes(self) -> Tuple[float, ...]:
+        """Timestamps of the keyframes of the first video stream."""
+        return MediaProbe.packets(self.path).keyframes
+
+    async def get_keyframes_async(self) -> Tuple[float, ...]:
+        return (await MediaProbe.packets_async(self.path)).keyframes
 
 
 class ImageFile(File):
     def __init__(self, path):
         super().__init__(path, extensions=[".jpg", ".jpeg", ".png", ".gif", ".bmp"])
 
-    def save(self, data: Image.Image) -> None:
+    def save(self, data: 'Image.Image') -> None:
         os.makedirs(self.dir, exist_ok=True)
         data.save(self.path, format='JPEG')
         logger.debug(f"Saved JPEG file: {self.path}")
 
-    def load(self) -> Image.Image:
+    def load(self) -> 'Image.Image':
+        from PIL import Image
         image_data = Image.open(self.path)
         logger.debug(f"Loaded JPEG file: {self.path}")
         return image_data
@@ -85,7 +115,8 @@ class ImageFile(File):
         return f"data:{mime_type};base64,{base64_string}"
 
     def to_iframe_image(self, frame: Optional[Union[Literal["first", "last"], int]] = 'first'
-                        ) -> IFrameImage:
+                        ) -> 'IFrameImage':
+        from runware.types import IFrameImage
         # Fix: Call the method with () and use data URI format
         return IFrameImage(
             inputImage=self.to_data_uri(),  # Changed from self.to_bytes to self.to_data_uri()
@@ -101,19 +132,39 @@ class AudioFile(File):
 
         super().__init__(path, extensions=[".mp3", ".wav", ".m4a", ".flac", ".ogg"])
 
+    @property
+    def info(self) -> MediaInfo:
+        """Container and stream metadata, probed once per file version."""
+        return MediaProbe.info(self.path)
+
+    async def get_info_async(self) -> MediaInfo:
+        return await MediaProbe.info_async(self.path)
+
     def get_duration(self) -> float:
-        audio = MP3(self.path)
-        return audio.info.length
+        return self.info.duration
+
+    async def get_duration_async(self) -> float:
+        return (await self.get_info_async()).duration
+
+    @staticmethod
+    def _mp3_conversion(wav_path: str):
+        mp3_path = str(get_next_available_path(Path(wav_path).with_suffix('.mp3')))
+        return mp3_path, ['ffmpeg', '-i', wav_path, '-y', mp3_path]
 
     def _convert_to_mp3(self, wav_path: str) -> str:
         """Convert WAV to MP3."""
-        mp3_path = Path(wav_path).with_suffix('.mp3')
-        mp3_path = get_next_available_path(mp3_path)
-        subprocess.run(['ffmpeg', '-i',
-                        wav_path, '-y', str(mp3_path)],
-                       check=True, capture_output=True)
+        mp3_path, command = self._mp3_conversion(wav_path)
+        MediaProcess.run(command, capture_output=True)
+        os.remove(wav_path)
+        return mp3_path
+
+    @classmethod
+    async def from_wav_async(cls, wav_path: str) -> 'AudioFile':
+        """Convert a WAV file to MP3 without blocking the event loop."""
+        mp3_path, command = cls._mp3_conversion(wav_path)
+        await MediaProcess.arun(command, capture_output=True)
         os.remove(wav_path)
-        return str(mp3_path)
+        return cls(mp3_path)
 
 
 class SubtitleFile(File):
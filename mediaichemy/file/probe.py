@@ -0,0 +1,172 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from mediaichemy.process import MediaProcess
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    """Container and stream metadata reported by ffprobe."""
+    duration: float
+    format_name: Optional[str] = None
+    video_codec: Optional[str] = None
+    video_profile: Optional[str] = None
+    pix_fmt: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    audio_codec: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class PacketIndex:
+    """Frame count and keyframe timestamps of the first video stream."""
+    frame_count: int
+    keyframes: Tuple[float, ...]
+
+
+def _parse_rate(rate: Optional[str]) -> Optional[float]:
+    try:
+        numerator, denominator = (rate or "").split("/")
+        return float(numerator) / float(denominator) if float(denominator) else None
+    except ValueError:
+        return None
+
+
+class MediaProbe:
+    """
+    Memoized ffprobe results.
+
+    Entries are keyed by path and validated against the file's size and mtime on every
+    lookup, so files rewritten by an editor are re-probed automatically; ``invalidate`` can
+    also be called explicitly. Stream metadata costs one JSON ffprobe per file version; the
+    packet index (frame count, keyframes) needs a demux pass and is only built on demand.
+    """
+    max_entries = 512
+
+    _cache: 'OrderedDict[str, dict]' = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _info_command(path: str) -> list:
+        return ['ffprobe', '-v', 'error',
+                '-print_format', 'json',
+                '-show_format', '-show_streams',
+                path]
+
+    @staticmethod
+    def _packets_command(path: str) -> list:
+        return ['ffprobe', '-v', 'error',
+                '-select_streams', 'v:0',
+                '-show_entries', 'packet=pts_time,flags',
+                '-print_format', 'json',
+                path]
+
+    @staticmethod
+    def _parse_info(output: str) -> MediaInfo:
+        data = json.loads(output)
+        streams = data.get("streams", [])
+        video = next((s for s in streams if s.get("codec_type") == "video"), {})
+        audio = next((s for s in streams if s.get("codec_type") == "audio"), {})
+        fmt = data.get("format", {})
+        duration = fmt.get("duration") or video.get("duration") or audio.get("duration")
+        return MediaInfo(
+            duration=float(duration),
+            format_name=fmt.get("format_name"),
+            video_codec=video.get("codec_name"),
+            video_profile=video.get("profile"),
+            pix_fmt=video.get("pix_fmt"),
+            width=video.get("width"),
+            height=video.get("height"),
+            fps=_parse_rate(video.get("avg_frame_rate")) or _parse_rate(video.get("r_frame_rate")),
+            audio_codec=audio.get("codec_name"),
+            sample_rate=int(audio["sample_rate"]) if audio.get("sample_rate") else None,
+            channels=audio.get("channels"),
+        )
+
+    @staticmethod
+    def _parse_packets(output: str) -> PacketIndex:
+        packets = json.loads(output).get("packets", [])
+        keyframes = sorted(float(p["pts_time"]) for p in packets
+                           if "K" in p.get("flags", "") and p.get("pts_time") not in (None, "N/A"))
+        return PacketIndex(frame_count=len(packets), keyframes=tuple(keyframes))
+
+    @staticmethod
+    def _signature(path: str) -> Tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    @classmethod
+    def _lookup(cls, path: str, field: str):
+        key = os.path.abspath(path)
+        signature = cls._signature(path)
+        with cls._lock:
+            entry = cls._cache.get(key)
+            if entry is None or entry["signature"] != signature:
+                return key, signature, None
+            cls._cache.move_to_end(key)
+            return key, signature, entry.get(field)
+
+    @classmethod
+    def _store(cls, key: str, signature, field: str, value) -> None:
+        with cls._lock:
+            entry = cls._cache.get(key)
+            if entry is None or entry["signature"] != signature:
+                entry = cls._cache[key] = {"signature": signature}
+            entry[field] = value
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.max_entries:
+                cls._cache.popitem(last=False)
+
+    @classmethod
+    def invalidate(cls, path: str) -> None:
+        with cls._lock:
+            cls._cache.pop(os.path.abspath(path), None)
+
+    @classmethod
+    def info(cls, path: str) -> MediaInfo:
+        key, signature, info = cls._lookup(path, "info")
+        if info is None:
+            result = MediaProcess.run(cls._info_command(path), capture_output=True, text=True, limited=False)
+            info = cls._parse_info(result.stdout)
+            cls._store(key, signature, "info", info)
+            logger.debug(f"Probed {path}: {info}")
+        return info
+
+    @classmethod
+    async def info_async(cls, path: str) -> MediaInfo:
+        key, signature, info = cls._lookup(path, "info")
+        if info is None:
+            result = await MediaProcess.arun(cls._info_command(path), capture_output=True, text=True, limited=False)
+            info = cls._parse_info(result.stdout)
+            cls._store(key, signature, "info", info)
+            logger.debug(f"Probed {path}: {info}")
+        return info
+
+    @classmethod
+    def packets(cls, path: str) -> PacketIndex:
+        key, signature, packets = cls._lookup(path, "packets")
+        if packets is None:
+            result = MediaProcess.run(cls._packets_command(path), capture_output=True, text=True, limited=False)
+            packets = cls._parse_packets(result.stdout)
+            cls._store(key, signature, "packets", packets)
+        return packets
+
+    @classmethod
+    async def packets_async(cls, path: str) -> PacketIndex:
+        key, signature, packets = cls._lookup(path, "packets")
+        if packets is None:
+            result = await MediaProcess.arun(cls._packets_command(path), capture_output=True, text=True,
+                                             limited=False)
+            packets = cls._parse_packets(result.stdout)
+            cls._store(key, signature, "packets", packets)
+        return packets
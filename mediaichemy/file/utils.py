@@ -1,4 +1,10 @@
 import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 
 def get_next_available_path(base_path):
@@ -29,3 +35,36 @@ def ensure_dir(path: str) -> None:
 
 def delete_dir(path):
     os.rmdir(path)
+
+
+def get_cache_dir(*subdirs: str) -> str:
+    """Return (and create) a mediaichemy cache directory.
+
+    Honours ``MEDIAICHEMY_CACHE_DIR`` and falls back to ``$XDG_CACHE_HOME/mediaichemy``
+    or ``~/.cache/mediaichemy``.
+    """
+    base = os.getenv("MEDIAICHEMY_CACHE_DIR")
+    if not base:
+        xdg_cache = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        base = os.path.join(xdg_cache, "mediaichemy")
+    path = os.path.join(base, *subdirs)
+    ensure_dir(path)
+    return path
+
+
+@contextmanager
+def cache_lock(directory: str):
+    """Hold an exclusive lock on a cache directory, shared by every process using it.
+
+    Without ``fcntl`` (Windows) this is a no-op, so callers must still tolerate files
+    disappearing under them.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, ".lock"), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -1,4 +1,23 @@
+import importlib
 
-from mediaichemy.media.single import (Image, Video, Narration)
-from mediaichemy.media.multi import (ImageVideo, NarrationWithBackground,
-                                     StorylineVideo)
+# Loaded on first use, so that importing e.g. mediaichemy.media.parameters stays cheap
+_EXPORTS = {
+    "Image": "mediaichemy.media.single",
+    "Video": "mediaichemy.media.single",
+    "Narration": "mediaichemy.media.single",
+    "ImageVideo": "mediaichemy.media.multi",
+    "NarrationWithBackground": "mediaichemy.media.multi",
+    "StorylineVideo": "mediaichemy.media.multi",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return __all__
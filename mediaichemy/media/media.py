@@ -43,6 +43,13 @@ class Media(ABC):
     def name(self) -> str:
         return self.__class__.__name__.lower()
 
-    async def create_captions(self, model: str = None):
-        return await self.studio.create_captions(self.output_dir,
-                                                 model=model)
+    @property
+    def captions_dir(self) -> str:
+        """Where the final media ends up, so captions can be matched to it."""
+        return self.directory
+
+    async def create_captions(self, model: str = None, hedge_after: float = None):
+        # Captions are written while the media renders, so they go straight to the final location
+        return await self.studio.create_captions(self.captions_dir,
+                                                 model=model,
+                                                 hedge_after=hedge_after)
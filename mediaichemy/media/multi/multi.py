@@ -3,14 +3,26 @@ from abc import ABC
 
 from mediaichemy.media.media import Media
 from mediaichemy.file import utils, File
+from mediaichemy.media.stages import StageGraph
 
 
 class MultiMedia(Media, ABC):
+    # Whether create() moves its output out of the working subdirectory (see unpack)
+    unpacked = True
+
     def __init__(self,
                  params: Any = None):
         super().__init__(params=params)
+        self.stage_timings = {}
         self.create_subdirectory()
 
+    async def run_stages(self, stages: StageGraph) -> dict:
+        """Run a stage graph, keeping its per-stage timings on the media."""
+        try:
+            return await stages.run()
+        finally:
+            self.stage_timings.update(stages.timings)
+
     def create_subdirectory(self):
         subdirectory = self.directory + self.name
         self.subdirectory = utils.get_next_available_path(subdirectory)
@@ -20,6 +32,10 @@ class MultiMedia(Media, ABC):
     def output_dir(self) -> str:
         return self.subdirectory + "/"
 
+    @property
+    def captions_dir(self) -> str:
+        return self.directory if self.unpacked else self.output_dir
+
     def unpack(self, ready_media: File) -> File:
         _, name, ext = ready_media.split_name()
         final_path = self.directory + name + ext
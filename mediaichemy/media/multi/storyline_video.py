@@ -3,6 +3,7 @@ from mediaichemy.media.parameters import StorylineVideoParameters
 from mediaichemy.media.parameters import NarratedVideoParameters
 from mediaichemy.media.parameters import NarrationWithBackgroundParameters
 from mediaichemy.media.multi.multi import MultiMedia
+from mediaichemy.media.stages import StageGraph
 
 
 class NarrationWithBackground(MultiMedia):
@@ -13,41 +14,85 @@ class NarrationWithBackground(MultiMedia):
         super().__init__(params=params)
 
     async def create(self):
-        narration = self.create_narration_with_background()
+        narration = await self.create_narration_with_background()
         return self.unpack(narration), None
 
-    def create_narration_with_background(self):
-        narration = self.studio.create_narration(self.output_dir)
-        narration_with_background = self.studio.download_and_mix_youtube_audio(
-            directory=self.output_dir,
-            original_audio=narration
-        )
-        return narration_with_background
+    def narration_stages(self) -> StageGraph:
+        """Synthesis and the background download are independent, only the mix needs both."""
+        return (StageGraph()
+                .add("narration", self.studio.synthesize_narration)
+                .add("background_track", self.studio.prefetch_background)
+                .add("mix", self._mix_stage, depends_on=("narration", "background_track")))
+
+    async def _mix_stage(self, narration, background_track):
+        return await self.studio.mix_narration_with_background(self.output_dir, narration, background_track)
+
+    async def create_narration_with_background(self):
+        results = await self.run_stages(self.narration_stages())
+        return results["mix"]
 
 
 class NarratedVideo(NarrationWithBackground):
     params_class = NarratedVideoParameters
+    # Synthesize sentence by sentence and keep the timings, for subclasses that need them
+    timed_narration = False
 
     def __init__(self,
                  params: NarratedVideoParameters):
         super().__init__(params=params)
+        self.timing = None
 
     async def create(self):
         narrated_video, cost = await self.create_narrated_video()
         return self.unpack(narrated_video), cost
 
-    async def create_narrated_video(self):
-        narration_w_bg = self.create_narration_with_background()
-        video, cost = await self.studio.create_image_video(directory=self.output_dir)
-        self.studio.loop_to_duration(video=video,
-                                     target_duration=narration_w_bg.get_duration())
-        self.studio.add_audio_track_to_video(video=video, audio=narration_w_bg)
-        narration_w_bg.delete()
+    def narrated_video_stages(self) -> StageGraph:
+        """
+        narration ───────────────┬─> background ─┐
+        background_track ────────┘               ├─> assemble
+        visual (image -> video) ─────────────────┘
+        """
+        return (StageGraph()
+                .add("narration", self._narration_stage)
+                .add("background_track", self.studio.prefetch_background)
+                .add("visual", self._visual_stage)
+                .add("background", self._background_stage, depends_on=("narration", "background_track"))
+                .add("assemble", self._assemble_stage, depends_on=("narration", "background", "visual")))
+
+    async def _narration_stage(self):
+        # Lossless intermediate, the narration is only encoded lossily with the video
+        if self.timed_narration:
+            narration, self.timing = await self.studio.create_timed_narration(self.output_dir, extension='.flac')
+            return narration
+        return await self.studio.create_narration(self.output_dir, extension='.flac')
+
+    async def _visual_stage(self):
+        return await self.studio.create_image_video(directory=self.output_dir)
+
+    async def _background_stage(self, narration, background_track):
+        return await self.studio.select_background_section(duration=await narration.get_duration_async(),
+                                                           video=background_track)
+
+    async def _assemble_stage(self, narration, background, visual):
+        video, cost = visual
+        await self.studio.assemble_narrated_video(video=video,
+                                                  narration=narration,
+                                                  background=background)
+        narration.delete()
+        if background:
+            background.release()
         return video, cost
 
+    async def create_narrated_video(self):
+        results = await self.run_stages(self.narrated_video_stages())
+        return results["assemble"]
+
 
 class StorylineVideo(NarratedVideo):
     params_class = StorylineVideoParameters
+    timed_narration = True
+    # One video per subtitle position, left together in the working subdirectory
+    unpacked = False
 
     def __init__(self,
                  params: StorylineVideoParameters):
@@ -57,8 +102,20 @@ class StorylineVideo(NarratedVideo):
         subtitled_videos, cost = await self.create_subtitled_video()
         return subtitled_videos, cost
 
-    async def create_subtitled_video(self):
-        narrated_video, cost = await self.create_narrated_video()
-        subtitled_videos = self.studio.produce_subtitled_videos(narrated_video)
-        narrated_video.delete()
+    async def _assemble_stage(self, narration, background, visual):
+        """Loop, mux and burn every subtitle variant in one ffmpeg pass, one video per position."""
+        video, cost = visual
+        subtitled_videos = await self.studio.assemble_subtitled_videos(video=video,
+                                                                       narration=narration,
+                                                                       timing=self.timing,
+                                                                       background=background)
+        narration.delete()
+        if background:
+            background.release()
+        video.delete()
+        self.timing.delete()
         return subtitled_videos, cost
+
+    async def create_subtitled_video(self):
+        results = await self.run_stages(self.narrated_video_stages())
+        return results["assemble"]
@@ -5,6 +5,8 @@ from pydantic import BaseModel, Field, model_validator
 class VisualParameters(BaseModel):
     width: Literal[1088, 1920] = 1088
     height: Literal[1088, 1920] = 1920
+    # Fixed seeds make generations reproducible, and cacheable (see GenerationCache)
+    seed: Optional[int] = None
 
 
 class ImageParameters(VisualParameters):
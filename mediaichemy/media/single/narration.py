@@ -11,4 +11,4 @@ class Narration(SingleMedia):
 
     async def create(self):
         cost = None
-        return self.studio.create_narration(self.output_dir), cost
+        return await self.studio.create_narration(self.output_dir), cost
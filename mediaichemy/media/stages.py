@@ -0,0 +1,84 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+
+
+class StageGraph:
+    """
+    Dependency graph of the asynchronous stages of a media pipeline.
+
+    Each stage is called with the results of the stages it depends on as keyword arguments.
+    ``run`` starts every stage as soon as its dependencies are done, so independent branches
+    (e.g. narration and AI video generation) overlap and the total time is that of the
+    longest branch. If a stage fails, the stages still running are cancelled and the error
+    is raised. Wall-clock time per stage is kept in ``timings``.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Stage] = {}
+        self.timings: Dict[str, float] = {}
+
+    def add(self, name: str, func: Callable[..., Awaitable[Any]], depends_on: Tuple[str, ...] = ()) -> 'StageGraph':
+        if name in self.stages:
+            raise ValueError(f"Stage {name} is already defined.")
+        self.stages[name] = Stage(name=name, func=func, depends_on=tuple(depends_on))
+        return self
+
+    def order(self) -> List[Stage]:
+        """Stages in dependency order. Raises ValueError for unknown dependencies and cycles."""
+        ordered: List[Stage] = []
+        visiting, done = set(), set()
+
+        def visit(name: str, path: Tuple[str, ...]):
+            if name in done:
+                return
+            if name not in self.stages:
+                raise ValueError(f"Stage {path[-1]} depends on unknown stage {name}.")
+            if name in visiting:
+                raise ValueError(f"Stage dependencies form a cycle: {' -> '.join(path + (name,))}")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency, path + (name,))
+            visiting.discard(name)
+            done.add(name)
+            ordered.append(self.stages[name])
+
+        for name in self.stages:
+            visit(name, ())
+        return ordered
+
+    async def _run_stage(self, stage: Stage, tasks: Dict[str, asyncio.Task]) -> Any:
+        inputs = {dependency: await tasks[dependency] for dependency in stage.depends_on}
+        start = time.monotonic()
+        logger.debug(f"Stage {stage.name} started")
+        result = await stage.func(**inputs)
+        self.timings[stage.name] = time.monotonic() - start
+        logger.debug(f"Stage {stage.name} finished in {self.timings[stage.name]:.2f}s")
+        return result
+
+    async def run(self) -> Dict[str, Any]:
+        """Run all stages and return their results by name."""
+        tasks: Dict[str, asyncio.Task] = {}
+        for stage in self.order():
+            tasks[stage.name] = asyncio.ensure_future(self._run_stage(stage, tasks))
+        try:
+            done, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+            failed = next((task for task in done if not task.cancelled() and task.exception()), None)
+            if failed:
+                raise failed.exception()
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+        return {name: task.result() for name, task in tasks.items()}
@@ -41,7 +41,7 @@ class MediaTypeChoice(BaseModel):
 
 
 class MediaTypePicker(AgentAI):
-    def __init__(self, model=None):
+    def __init__(self, model=None, hedge_after=None):
         system_prompt = f"""
         You are an expert media format selector. Choose the most appropriate
         media type based on the user's prompt requirements.
@@ -55,7 +55,8 @@ class MediaTypePicker(AgentAI):
         super().__init__(
             output_type=MediaTypeChoice,
             system_prompt=system_prompt,
-            model=model
+            model=model,
+            hedge_after=hedge_after
         )
 
     def get_media_type(self, media_type: str):
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import subprocess
+import threading
+import weakref
+from typing import List, Optional
+
+from mediaichemy.concurrency import limit
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class MediaProcess:
+    """
+    Runs external media tools (ffmpeg, ffprobe, yt-dlp), either blocking or on the event loop.
+
+    CPU-bound processes are capped by a global limit (the number of cores by default), so
+    concurrent jobs queue for ffmpeg instead of oversubscribing the machine. Network-bound
+    tools can opt out with ``limited=False``. The async variant kills the process when the
+    awaiting task is cancelled or its timeout expires.
+    """
+    max_concurrency: int = os.cpu_count() or 1
+
+    _thread_semaphore = threading.BoundedSemaphore(max_concurrency)
+    _loop_semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = \
+        weakref.WeakKeyDictionary()
+
+    @classmethod
+    def set_max_concurrency(cls, max_concurrency: int) -> None:
+        cls.max_concurrency = max_concurrency
+        cls._thread_semaphore = threading.BoundedSemaphore(max_concurrency)
+        cls._loop_semaphores = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def _loop_semaphore(cls) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = cls._loop_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = cls._loop_semaphores[loop] = asyncio.Semaphore(cls.max_concurrency)
+        return semaphore
+
+    @classmethod
+    def run(cls,
+            command: List[str],
+            *,
+            timeout: Optional[float] = None,
+            check: bool = True,
+            capture_output: bool = False,
+            text: bool = False,
+            input: Optional[bytes] = None,
+            limited: bool = True) -> subprocess.CompletedProcess:
+        logger.debug(f"Running: {' '.join(command)}")
+        semaphore = cls._thread_semaphore if limited else None
+        if semaphore:
+            semaphore.acquire()
+        try:
+            return subprocess.run(command, timeout=timeout, check=check, input=input,
+                                  capture_output=capture_output, text=text)
+        finally:
+            if semaphore:
+                semaphore.release()
+
+    @classmethod
+    async def arun(cls,
+                   command: List[str],
+                   *,
+                   timeout: Optional[float] = None,
+                   check: bool = True,
+                   capture_output: bool = False,
+                   text: bool = False,
+                   input: Optional[bytes] = None,
+                   limited: bool = True) -> subprocess.CompletedProcess:
+        if limited:
+            async with limit("local"), cls._loop_semaphore():
+                return await cls._arun(command, timeout, check, capture_output, text, input)
+        return await cls._arun(command, timeout, check, capture_output, text, input)
+
+    @staticmethod
+    async def _arun(command, timeout, check, capture_output, text, input=None) -> subprocess.CompletedProcess:
+        logger.debug(f"Running (async): {' '.join(command)}")
+        pipe = asyncio.subprocess.PIPE if capture_output else None
+        stdin = asyncio.subprocess.DEVNULL if input is None else asyncio.subprocess.PIPE
+        process = await asyncio.create_subprocess_exec(*command,
+                                                       stdin=stdin,
+                                                       stdout=pipe,
+                                                       stderr=pipe)
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(input), timeout=timeout)
+        except asyncio.TimeoutError:
+            await MediaProcess._kill(process)
+            raise subprocess.TimeoutExpired(command, timeout)
+        except asyncio.CancelledError:
+            await MediaProcess._kill(process)
+            raise
+
+        if text:
+            stdout = stdout.decode() if stdout is not None else None
+            stderr = stderr.decode() if stderr is not None else None
+        if check and process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+        return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process) -> None:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
@@ -1 +1,12 @@
-from .studio_facade import StudioFacade as Studio
+import importlib
+
+
+def __getattr__(name):
+    # The facade pulls in every editor and AI service; load it on first use
+    if name == "Studio":
+        return importlib.import_module("mediaichemy.studio.studio_facade").StudioFacade
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return ["Studio"]
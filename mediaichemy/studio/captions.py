@@ -63,12 +63,14 @@ class CaptionMaker:
     def __init__(self,
                  parameters: BaseModel,
                  platforms: List[str] = ['youtube_shorts', 'instagram_reels', 'tiktok'],
-                 model: Optional[str] = None):
+                 model: Optional[str] = None,
+                 hedge_after: Optional[float] = None):
         self.parameters = parameters
         self.platforms = platforms
         self.agent = AgentAI(output_type=Captions,
                              system_prompt=self.system_prompt,
-                             model=model)
+                             model=model,
+                             hedge_after=hedge_after)
 
     def extract_content_from_parameters(self) -> str:
         parameters_dict = self.parameters.model_dump()
@@ -1,3 +1,4 @@
 from .audio import AudioEditor
 from .subtitles import SubtitleEditor
 from .video import VideoEditor
+from .plan import EditPlan
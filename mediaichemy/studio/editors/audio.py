@@ -1,6 +1,5 @@
 from .editor import Editor
-from mediaichemy.file import AudioFile
-import subprocess
+from mediaichemy.file import AudioFile, AudioBuffer
 import random
 
 
@@ -11,7 +10,7 @@ class AudioEditor(Editor):
 
     @Editor.edit_file
     def add_silence_tail(self, duration: int):
-        command = [
+        return [
             "ffmpeg",
             "-y",
             "-i", self.file.path,
@@ -22,22 +21,33 @@ class AudioEditor(Editor):
             "-map", "[out]",
             self.working_file.path
         ]
-        subprocess.run(command, check=True)
 
-    @Editor.edit_file
-    def extract_section(self,
-                        start: int,
-                        duration: int):
+    def _cut_command(self, start: float, duration: float, accurate: bool) -> list[str]:
         command = [
             "ffmpeg",
             "-y",
-            "-i", self.file.path,
+            # Input seeking: ffmpeg jumps to the nearest seek point instead of decoding up to start
             "-ss", str(start),
+            "-i", self.file.path,
             "-t", str(duration),
-            "-c", "copy",
-            self.working_file.path
         ]
-        subprocess.run(command, check=True)
+        if not accurate:
+            command += ["-c", "copy"]
+        return command + [self.working_file.path]
+
+    @Editor.edit_file
+    def cut(self, start: float, duration: float, accurate: bool = True):
+        """
+        Keep ``duration`` seconds from ``start``. Accurate cuts are re-encoded and exact to the
+        sample; otherwise packets are copied and the cut is exact to the codec frame (~26ms for MP3).
+        """
+        return self._cut_command(start, duration, accurate)
+
+    @Editor.edit_file
+    def extract_section(self,
+                        start: int,
+                        duration: int):
+        return self._cut_command(start, duration, accurate=False)
 
     @Editor.edit_file
     def mix_with(self,
@@ -51,7 +61,7 @@ class AudioEditor(Editor):
 
         original_volume = 2.0 - background_relative_volume
         new_volume = background_relative_volume
-        command = [
+        return [
             "ffmpeg",
             "-y",
             "-i", self.file.path,
@@ -62,14 +72,33 @@ class AudioEditor(Editor):
             "-c:a", "libmp3lame",
             self.working_file.path
             ]
-        subprocess.run(command, check=True)
 
-    def extract_random_section(self,
-                               duration: int):
-        total_duration = self.file.get_duration()
+    def _random_start(self, duration: int, total_duration: float) -> int:
         if duration > total_duration:
             raise ValueError(
                 f"Specified duration ({duration}s) is longer than the MP3 file's total duration ({total_duration}s).")
-        random_start = random.randint(0, int(total_duration - duration))
+        return random.randint(0, int(total_duration - duration))
+
+    def extract_random_section(self,
+                               duration: int):
+        random_start = self._random_start(duration, self.file.get_duration())
         self.extract_section(start=random_start,
                              duration=duration)
+
+    async def extract_random_section_async(self,
+                                           duration: int):
+        random_start = self._random_start(duration, await self.file.get_duration_async())
+        await self.extract_section_async(start=random_start,
+                                         duration=duration)
+
+    async def decode_random_section_async(self,
+                                          duration: float,
+                                          sample_rate: int = 44100,
+                                          channels: int = 2) -> AudioBuffer:
+        """Decode a random section straight into memory, without writing an intermediate file."""
+        random_start = self._random_start(duration, await self.file.get_duration_async())
+        return await AudioBuffer.decode_async(self.file.path,
+                                              sample_rate=sample_rate,
+                                              channels=channels,
+                                              start=random_start,
+                                              duration=duration)
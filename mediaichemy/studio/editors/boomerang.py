@@ -0,0 +1,153 @@
+import hashlib
+import os
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
+
+from mediaichemy.file import VideoFile, utils
+from mediaichemy.file.probe import MediaInfo
+
+from logging import getLogger
+logger = getLogger(__name__)
+
+Command = List[str]
+
+
+class BoomerangBuilder:
+    """
+    Builds forward-then-reversed clips without ffmpeg's ``reverse`` filter, which keeps every
+    decoded frame of the clip in memory.
+
+    The clip is cut into chunks at keyframes (at most ``chunk_duration`` long), each chunk is
+    reversed on its own and the chunks are joined in reverse order. Peak memory is bounded by
+    the frames of one chunk, whatever the clip length. Reversed renditions are cached by the
+    source's path, size and mtime, so a clip is only reversed once however often it is looped.
+    The cache is shared between processes: lookups, publishing and eviction hold its lock.
+    """
+    chunk_duration = 2.0
+    max_cached_renditions = 32
+
+    def __init__(self,
+                 file: VideoFile,
+                 keyframes: Sequence[float],
+                 info: MediaInfo,
+                 add_scratch_file: Callable[[str], str]):
+        self.file = file
+        self.keyframes = keyframes
+        self.info = info
+        self.add_scratch_file = add_scratch_file
+
+    @property
+    def reversed_path(self) -> str:
+        stat = os.stat(self.file.path)
+        key = f"{os.path.abspath(self.file.path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        name = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(utils.get_cache_dir("reversed"), f"{name}.ts")
+
+    def chunks(self) -> List[Tuple[float, float]]:
+        """(start, duration) pairs covering the clip, starting on keyframes where possible."""
+        bounds = sorted({0.0, *[k for k in self.keyframes if 0 < k < self.info.duration]})
+        edges = []
+        for start, end in zip(bounds, bounds[1:] + [self.info.duration]):
+            position = start
+            while position < end:
+                edges.append(position)
+                position += self.chunk_duration
+        edges.append(self.info.duration)
+        return [(start, end - start) for start, end in zip(edges, edges[1:]) if end - start > 1e-6]
+
+    def _scratch_path(self, suffix: str) -> str:
+        return self.add_scratch_file(os.path.join(self.file.dir, f".{self.file.name}_{suffix}"))
+
+    @staticmethod
+    def _concat_command(list_path: str, paths: Sequence[str], output_path: str) -> Command:
+        with open(list_path, "w") as f:
+            for path in paths:
+                f.write(f"file '{os.path.abspath(path)}'\n")
+        return ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_path, "-c", "copy", output_path]
+
+    def _encode_args(self) -> Command:
+        return ["-an", "-c:v", "libx264", "-pix_fmt", "yuv420p"]
+
+    def _reverse_commands(self, output_path: str) -> List[Command]:
+        commands = []
+        chunk_paths = []
+        for index, (start, duration) in enumerate(self.chunks()):
+            chunk_path = self._scratch_path(f"reverse{index}.ts")
+            chunk_paths.append(chunk_path)
+            commands.append(["ffmpeg", "-y", "-ss", str(start), "-i", self.file.path, "-t", str(duration),
+                             "-vf", "reverse", *self._encode_args(), chunk_path])
+        commands.append(self._concat_command(self._scratch_path("reverse.txt"),
+                                             list(reversed(chunk_paths)), output_path))
+        return commands
+
+    def _cached_rendition(self) -> Tuple[str, bool]:
+        reversed_path = self.reversed_path
+        with utils.cache_lock(os.path.dirname(reversed_path)):
+            try:
+                # Touching marks it recently used, so no other process evicts it next
+                os.utime(reversed_path)
+            except FileNotFoundError:
+                return reversed_path, False
+        logger.debug(f"Reusing reversed rendition of {self.file.path}")
+        return reversed_path, True
+
+    def _partial_path(self, reversed_path: str) -> str:
+        # Unique per process, so two processes building the same rendition don't share a file
+        return self.add_scratch_file(f"{reversed_path}.{os.getpid()}.partial.ts")
+
+    def _publish(self, partial_path: str, reversed_path: str) -> None:
+        """Move a complete rendition into the cache, evicting the least recently used ones."""
+        directory = os.path.dirname(reversed_path)
+        with utils.cache_lock(directory):
+            self._evict(directory)
+            os.replace(partial_path, reversed_path)
+
+    def ensure_reversed(self, run: Callable[[Command], object]) -> str:
+        """Return the path of the reversed rendition, building it with ``run`` if it isn't cached."""
+        reversed_path, cached = self._cached_rendition()
+        if not cached:
+            partial_path = self._partial_path(reversed_path)
+            for command in self._reverse_commands(partial_path):
+                run(command)
+            # Only publish complete renditions
+            self._publish(partial_path, reversed_path)
+        return reversed_path
+
+    async def ensure_reversed_async(self, arun: Callable[[Command], Awaitable[object]]) -> str:
+        reversed_path, cached = self._cached_rendition()
+        if not cached:
+            partial_path = self._partial_path(reversed_path)
+            for command in self._reverse_commands(partial_path):
+                await arun(command)
+            self._publish(partial_path, reversed_path)
+        return reversed_path
+
+    def commands(self, reversed_path: str, output_path: str) -> List[Command]:
+        """Commands writing the clip followed by its reversed rendition to ``output_path``."""
+        forward_path = self._scratch_path("forward.ts")
+        # Encoded like the reversed chunks (never stream-copied), so the concat demuxer joins
+        # streams with the same profile, pixel format and timebase
+        forward = ["ffmpeg", "-y", "-i", self.file.path, *self._encode_args(), forward_path]
+        join = self._concat_command(self._scratch_path("boomerang.txt"),
+                                    [forward_path, reversed_path], output_path)
+        return [forward, join]
+
+    @classmethod
+    def _evict(cls, directory: Optional[str] = None) -> None:
+        """Make room for one more rendition. Call with the cache lock held."""
+        directory = directory or utils.get_cache_dir("reversed")
+        renditions = []
+        for name in os.listdir(directory):
+            if not name.endswith(".ts") or name.endswith(".partial.ts"):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                renditions.append((os.path.getmtime(path), path))
+            except FileNotFoundError:
+                # Removed by a process that doesn't lock (no fcntl)
+                continue
+        renditions.sort()
+        for _, path in renditions[:max(0, len(renditions) - cls.max_cached_renditions + 1)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -1,15 +1,41 @@
 from functools import wraps
 from logging import getLogger
+import inspect
+import os
+import shutil
+import tempfile
+from typing import List, Optional, Union
 from mediaichemy.file import File
+from mediaichemy.process import MediaProcess
 from abc import ABC, abstractmethod
 
+Command = List[str]
+
 
 class Editor(ABC):
+    """
+    Base class for ffmpeg based editors.
+
+    Operations decorated with ``edit_file`` return the command(s) that write
+    ``self.working_file``; the decorator runs them and swaps the result in. Every such
+    operation also gets an ``<name>_async`` counterpart that runs the same commands
+    through MediaProcess.arun without blocking the event loop.
+    """
+    process_timeout: Optional[float] = None
+
     def __init__(self, file: File):
         self.file = file
         self.working_file = None
+        self.scratch_files: List[str] = []
         self.validate_file()
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, attr in list(vars(cls).items()):
+            operation = getattr(attr, "__edit_operation__", None)
+            if operation and f"{name}_async" not in vars(cls):
+                setattr(cls, f"{name}_async", Editor._async_operation(operation))
+
     @property
     @abstractmethod
     def file_type(self):
@@ -22,31 +48,117 @@ class Editor(ABC):
             raise TypeError(f"This editor only works with {self.file_type.__name__} files,"
                             f" but got {type(self.file).__name__}")
 
+    @staticmethod
+    def _as_commands(commands: Union[None, Command, List[Command]]) -> List[Command]:
+        if not commands:
+            return []
+        if isinstance(commands[0], str):
+            return [commands]
+        return commands
+
+    def run(self, command: Command, **kwargs):
+        kwargs.setdefault("timeout", self.process_timeout)
+        return MediaProcess.run(command, **kwargs)
+
+    async def arun(self, command: Command, **kwargs):
+        kwargs.setdefault("timeout", self.process_timeout)
+        return await MediaProcess.arun(command, **kwargs)
+
     @staticmethod
     def edit_file(func):
         """
-        Decorator that creates a working copy of the file before editing,
-        replacing the original if the operation succeeds.
+        Decorator that gives the operation an empty working file next to the original
+        to write its output to, atomically replacing the original if the operation succeeds.
         """
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                self._begin_edit()
+                try:
+                    for command in self._as_commands(await func(self, *args, **kwargs)):
+                        await self.arun(command)
+                except BaseException as e:
+                    self._abort_edit(func, e)
+                    raise
+                return self._commit_edit(func)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(self, *args, **kwargs):
-            logger = getLogger()
+            self._begin_edit()
             try:
-                self.working_file = self.file.copy()
-                func(self, *args, **kwargs)
-                self._replace_with_working_copy()
-                logger.debug(f"{self.__class__.__name__}:{func.__name__} succeeded")
-                return self.file
+                for command in self._as_commands(func(self, *args, **kwargs)):
+                    self.run(command)
             except Exception as e:
-                self._cleanup_working_file()
-                logger.error(f"{func.__name__} failed: {e}")
+                self._abort_edit(func, e)
                 raise
+            return self._commit_edit(func)
+        wrapper.__edit_operation__ = func
         return wrapper
 
+    @staticmethod
+    def _async_operation(func):
+        @wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            self._begin_edit()
+            try:
+                for command in self._as_commands(func(self, *args, **kwargs)):
+                    await self.arun(command)
+            except BaseException as e:
+                self._abort_edit(func, e)
+                raise
+            return self._commit_edit(func)
+        async_wrapper.__name__ = f"{func.__name__}_async"
+        return async_wrapper
+
+    def _begin_edit(self):
+        self.working_file = self._allocate_working_file()
+
+    def _commit_edit(self, func):
+        self._replace_with_working_copy()
+        self._cleanup_scratch_files()
+        getLogger().debug(f"{self.__class__.__name__}:{func.__name__} succeeded")
+        return self.file
+
+    def _abort_edit(self, func, error):
+        self._cleanup_working_file()
+        self._cleanup_scratch_files()
+        getLogger().error(f"{func.__name__} failed: {error!r}")
+
+    def add_scratch_file(self, path: str) -> str:
+        """Register an intermediate file to be removed once the current operation finishes."""
+        self.scratch_files.append(path)
+        return path
+
+    def _cleanup_scratch_files(self):
+        for path in self.scratch_files:
+            if os.path.exists(path):
+                os.remove(path)
+        self.scratch_files = []
+
+    def _allocate_working_file(self) -> File:
+        """Reserve a temporary path on the same filesystem as the file, so it can be os.replace'd."""
+        fd, path = tempfile.mkstemp(prefix=f".{self.file.name}_",
+                                    suffix=self.file.ext,
+                                    dir=self.file.dir or ".")
+        os.close(fd)
+        return File(path)
+
+    def _match_mode(self, path: str) -> None:
+        """mkstemp files are owner-only; give the edited file the permissions of the original."""
+        if os.path.exists(self.file.path):
+            shutil.copymode(self.file.path, path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(path, 0o666 & ~umask)
+
     def _replace_with_working_copy(self):
+        self._match_mode(self.working_file.path)
         self.file.replace_with(self.working_file)
         self.working_file = None
 
     def _cleanup_working_file(self):
         if self.working_file and self.working_file.exists():
             self.working_file.delete()
+        self.working_file = None
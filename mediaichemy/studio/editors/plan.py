@@ -0,0 +1,237 @@
+import os
+from typing import List, Literal, Optional, Sequence, Tuple
+
+from mediaichemy.file import VideoFile, AudioFile, SubtitleFile
+from mediaichemy.studio.editors.editor import Editor
+from mediaichemy.studio.editors.boomerang import BoomerangBuilder
+
+from logging import getLogger
+logger = getLogger(__name__)
+
+
+def escape_filter_path(path: str) -> str:
+    """Escape a file path for use as a filtergraph option value."""
+    escaped = path.replace("\\", "/").replace(":", "\\:").replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+class EditPlan(Editor):
+    """
+    Collects video operations and compiles them into one ffmpeg ``filter_complex`` run,
+    so the whole chain costs a single decode/encode pass, e.g.
+    ``EditPlan(video).loop(30).add_audio(narration).mix_audio(background, 0.5).render()``
+
+    With ``burn_subtitles`` the plan writes one output per subtitle variant instead of editing
+    the clip (``render_subtitled``): frames are decoded and filtered once, then split into a
+    subtitle branch and an encode per output, still in the same ffmpeg run.
+
+    With the "segmented" boomerang_mode, boomerang loops are built from a cached reversed
+    rendition (see BoomerangBuilder) and looped by the demuxer, so no frames are buffered;
+    "filter" reverses and loops inside the filtergraph, buffering the whole clip.
+    """
+    boomerang_mode: Literal["segmented", "filter"] = "segmented"
+
+    def __init__(self, file: VideoFile):
+        super().__init__(file)
+        self.loop_duration: Optional[float] = None
+        self.boomerang = True
+        self.duration: Optional[float] = None
+        self.audio: Optional[AudioFile] = None
+        self.background: Optional[AudioFile] = None
+        self.background_relative_volume = 0.5
+        self.background_start: Optional[float] = None
+        self.subtitles: List[SubtitleFile] = []
+        self.subtitle_outputs: List[str] = []
+        self.loop_source: Optional[str] = None
+
+    @property
+    def file_type(self):
+        return VideoFile
+
+    def loop(self, target_duration: float, boomerang: bool = True) -> 'EditPlan':
+        """Loop the clip (forward-reverse when ``boomerang``) until ``target_duration``."""
+        if target_duration <= 0:
+            raise ValueError("Target duration must be greater than 0 seconds.")
+        self.loop_duration = target_duration
+        self.boomerang = boomerang
+        return self.trim(target_duration)
+
+    def trim(self, duration: float) -> 'EditPlan':
+        self.duration = duration
+        return self
+
+    def add_audio(self, audio: AudioFile) -> 'EditPlan':
+        """Use ``audio`` as the audio track of the output."""
+        self.audio = audio
+        return self
+
+    def mix_audio(self, audio: AudioFile, background_relative_volume: float,
+                  start: Optional[float] = None) -> 'EditPlan':
+        """
+        Mix ``audio`` under the audio track, with the same volume balance as AudioEditor.mix_with.
+        ``start`` seeks into ``audio`` first, so sections of long tracks need no intermediate file.
+        """
+        if not self.audio:
+            raise ValueError("add_audio() must be called before mix_audio().")
+        if not (0.0 <= background_relative_volume <= 2.0):
+            raise ValueError("background_relative_volume must be between 0 and 2.")
+        self.background = audio
+        self.background_relative_volume = background_relative_volume
+        self.background_start = start
+        return self
+
+    def burn_subtitles(self, subtitles: Sequence[SubtitleFile], output_paths: Sequence[str]) -> 'EditPlan':
+        """Write a copy of the result to ``output_paths[i]`` with ``subtitles[i]`` burnt in."""
+        if not subtitles or len(subtitles) != len(output_paths):
+            raise ValueError("burn_subtitles() needs one output path per subtitle file.")
+        self.subtitles = list(subtitles)
+        self.subtitle_outputs = list(output_paths)
+        return self
+
+    def _input_args(self) -> List[str]:
+        inputs = []
+        if self.loop_duration and not self._filter_boomerang:
+            # Looping a plain clip is done by the demuxer, without buffering any frames
+            inputs += ["-stream_loop", "-1"]
+        inputs += ["-i", self.loop_source or self.file.path]
+        if self.audio:
+            inputs += ["-i", self.audio.path]
+        if self.background:
+            if self.background_start:
+                inputs += ["-ss", str(self.background_start)]
+            inputs += ["-i", self.background.path]
+        return inputs
+
+    @property
+    def _filter_boomerang(self) -> bool:
+        return bool(self.loop_duration and self.boomerang and self.boomerang_mode == "filter")
+
+    @property
+    def _segmented_boomerang(self) -> bool:
+        return bool(self.loop_duration and self.boomerang and self.boomerang_mode == "segmented")
+
+    def _video_filters(self) -> List[str]:
+        """Filter chains producing the [v] output label, or [v0], [v1], ... per subtitle variant."""
+        chains = []
+        source = "[0:v]"
+        if self._filter_boomerang:
+            frames = 2 * self.file.get_frame_count()
+            chains.append(f"{source}split[fw][bw];[bw]reverse[rv];[fw][rv]concat=n=2:v=1:a=0[bm]")
+            chains.append(f"[bm]loop=loop=-1:size={frames}:start=0[lp]")
+            source = "[lp]"
+
+        filters = []
+        if self.duration:
+            filters.append(f"trim=duration={self.duration},setpts=PTS-STARTPTS")
+        if not self.subtitles:
+            filters.append("format=yuv420p")
+            chains.append(f"{source}{','.join(filters)}[v]")
+            return chains
+
+        branches = "".join(f"[s{i}]" for i in range(len(self.subtitles)))
+        chains.append(f"{source}{','.join(filters + [f'split={len(self.subtitles)}'])}{branches}")
+        chains += [f"[s{i}]subtitles={escape_filter_path(subtitle.path)},format=yuv420p[v{i}]"
+                   for i, subtitle in enumerate(self.subtitles)]
+        return chains
+
+    def _audio_filters(self) -> List[str]:
+        """Filter chains producing the [a] output label, if there is audio to process."""
+        if not self.background:
+            return []
+        original_volume = 2.0 - self.background_relative_volume
+        chains = [f"[1:a]volume={original_volume}[a0]",
+                  f"[2:a]volume={self.background_relative_volume}[a1]",
+                  "[a0][a1]amix=inputs=2:duration=first:dropout_transition=2[a]"]
+        if len(self.subtitles) > 1:
+            # A filter output can only be mapped once
+            chains.append(f"[a]asplit={len(self.subtitles)}" + "".join(f"[a{i}s]" for i in range(len(self.subtitles))))
+        return chains
+
+    def _outputs(self, output_path: Optional[str], mixed_audio: bool) -> List[Tuple[str, Optional[str], str]]:
+        """(video label, audio map, path) per output."""
+        if not self.subtitles:
+            if output_path is None:
+                raise ValueError("An output path is needed unless burn_subtitles() was called.")
+            audio = "[a]" if mixed_audio else "1:a" if self.audio else None
+            return [("[v]", audio, output_path)]
+        if output_path is not None:
+            raise ValueError("A plan burning subtitles writes its own outputs; use render_subtitled().")
+        outputs = []
+        for i, path in enumerate(self.subtitle_outputs):
+            if mixed_audio:
+                audio = f"[a{i}s]" if len(self.subtitles) > 1 else "[a]"
+            else:
+                audio = "1:a" if self.audio else None
+            outputs.append((f"[v{i}]", audio, path))
+        return outputs
+
+    def compile(self, output_path: Optional[str] = None) -> List[str]:
+        audio_filters = self._audio_filters()
+        command = ["ffmpeg", "-y", *self._input_args(),
+                   "-filter_complex", ";".join(self._video_filters() + audio_filters)]
+        for video, audio, path in self._outputs(output_path, mixed_audio=bool(audio_filters)):
+            command += ["-map", video]
+            command += ["-map", audio] if audio else ["-an"]
+            command += ["-c:v", "libx264"]
+            if self.audio:
+                command += ["-c:a", "aac"]
+            if self.duration:
+                command += ["-t", str(self.duration)]
+            command.append(path)
+        return command
+
+    def _boomerang_commands(self, builder: BoomerangBuilder, reversed_path: str) -> List[List[str]]:
+        self.loop_source = self.add_scratch_file(os.path.join(self.file.dir, f".{self.file.name}_boomerang.ts"))
+        return builder.commands(reversed_path, self.loop_source)
+
+    def _loop_commands(self) -> List[List[str]]:
+        if not self._segmented_boomerang:
+            return []
+        builder = BoomerangBuilder(self.file, self.file.get_keyframes(), self.file.info, self.add_scratch_file)
+        return self._boomerang_commands(builder, builder.ensure_reversed(self.run))
+
+    async def _loop_commands_async(self) -> List[List[str]]:
+        if not self._segmented_boomerang:
+            return []
+        builder = BoomerangBuilder(self.file,
+                                   await self.file.get_keyframes_async(),
+                                   await self.file.get_info_async(),
+                                   self.add_scratch_file)
+        return self._boomerang_commands(builder, await builder.ensure_reversed_async(self.arun))
+
+    @Editor.edit_file
+    def render(self):
+        return self._loop_commands() + [self.compile(self.working_file.path)]
+
+    @Editor.edit_file
+    async def render_async(self):
+        return await self._loop_commands_async() + [self.compile(self.working_file.path)]
+
+    def _discard_subtitled_outputs(self, error: BaseException) -> None:
+        for path in self.subtitle_outputs:
+            if os.path.exists(path):
+                os.remove(path)
+        logger.error(f"render_subtitled failed: {error!r}")
+
+    def render_subtitled(self) -> List[VideoFile]:
+        """Run a plan set up with burn_subtitles(), leaving the clip itself untouched."""
+        try:
+            for command in self._loop_commands() + [self.compile()]:
+                self.run(command)
+        except BaseException as error:
+            self._discard_subtitled_outputs(error)
+            raise
+        finally:
+            self._cleanup_scratch_files()
+        return [VideoFile(path) for path in self.subtitle_outputs]
+
+    async def render_subtitled_async(self) -> List[VideoFile]:
+        try:
+            for command in await self._loop_commands_async() + [self.compile()]:
+                await self.arun(command)
+        except BaseException as error:
+            self._discard_subtitled_outputs(error)
+            raise
+        finally:
+            self._cleanup_scratch_files()
+        return [VideoFile(path) for path in self.subtitle_outputs]
@@ -1,12 +1,19 @@
+import asyncio
 import subprocess
-import re
+import os
 import logging
-from mediaichemy.file import VideoFile, SubtitleFile
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Literal
+from mediaichemy.file import VideoFile, SubtitleFile, TimingFile
+from mediaichemy.text import split_into_sentences
 from .editor import Editor
-import pysubs2
+from .plan import escape_filter_path
 from pydantic.dataclasses import dataclass
 from mediaichemy.media.parameters import SubtitleParameters
 
+if TYPE_CHECKING:
+    import pysubs2
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,9 +31,7 @@ class SubtitleTimingEngine:
         self.text = text
         self.duration = duration
 
-    @staticmethod
-    def split_into_sentences(text: str) -> list[str]:
-        return [s.strip() for s in re.split(r'(?<=[!.,:?])(?=\s|\n|")+', text) if s.strip()]
+    split_into_sentences = staticmethod(split_into_sentences)
 
     def make_entries(self) -> list[SubtitleEntry]:
         """Generate timed subtitle entries for the given duration."""
@@ -51,18 +56,24 @@ class SubtitleTimingEngine:
         logger.debug(f"Generated {len(entries)} subtitle entries")
         return entries
 
+    @staticmethod
+    def entries_from_timing(timing: TimingFile) -> list[SubtitleEntry]:
+        """Use the exact sentence timestamps recorded during narration synthesis."""
+        return [SubtitleEntry(start=segment["start"], end=segment["end"], text=segment["text"])
+                for segment in timing.segments]
+
 
 class SubtitlesASSMaker:
     ALIGNMENTS_MAP = {
-        "bottom_left": pysubs2.Alignment.BOTTOM_LEFT,
-        "bottom_center": pysubs2.Alignment.BOTTOM_CENTER,
-        "bottom_right": pysubs2.Alignment.BOTTOM_RIGHT,
-        "middle_left": pysubs2.Alignment.MIDDLE_LEFT,
-        "middle_center": pysubs2.Alignment.MIDDLE_CENTER,
-        "middle_right": pysubs2.Alignment.MIDDLE_RIGHT,
-        "top_left": pysubs2.Alignment.TOP_LEFT,
-        "top_center": pysubs2.Alignment.TOP_CENTER,
-        "top_right": pysubs2.Alignment.TOP_RIGHT,
+        "bottom_left": "BOTTOM_LEFT",
+        "bottom_center": "BOTTOM_CENTER",
+        "bottom_right": "BOTTOM_RIGHT",
+        "middle_left": "MIDDLE_LEFT",
+        "middle_center": "MIDDLE_CENTER",
+        "middle_right": "MIDDLE_RIGHT",
+        "top_left": "TOP_LEFT",
+        "top_center": "TOP_CENTER",
+        "top_right": "TOP_RIGHT",
     }
 
     def __init__(self,
@@ -73,7 +84,7 @@ class SubtitlesASSMaker:
         self.params = params
         self.video = video
 
-    def create_styled_subtitle_templates_for_positions(self) -> list[pysubs2.SSAFile]:
+    def create_styled_subtitle_templates_for_positions(self) -> 'list[pysubs2.SSAFile]':
         positions = self._get_alignment_positions()
         subtitle_templates = []
 
@@ -83,11 +94,13 @@ class SubtitlesASSMaker:
 
         return subtitle_templates
 
-    def _get_alignment_positions(self) -> list[pysubs2.Alignment]:
-        return [self.ALIGNMENTS_MAP[align_str]
+    def _get_alignment_positions(self) -> 'list[pysubs2.Alignment]':
+        import pysubs2
+        return [pysubs2.Alignment[self.ALIGNMENTS_MAP[align_str]]
                 for align_str in self.params.subtitle_positions]
 
-    def _create_subtitle_file_for_position(self, position: pysubs2.Alignment) -> pysubs2.SSAFile:
+    def _create_subtitle_file_for_position(self, position: 'pysubs2.Alignment') -> 'pysubs2.SSAFile':
+        import pysubs2
         subtitle_file = pysubs2.SSAFile()
         style = subtitle_file.styles["Default"]
 
@@ -119,7 +132,8 @@ class SubtitlesASSMaker:
 
         return subtitle_file
 
-    def _hex_to_pysubs_color(self, hex_color: str) -> pysubs2.Color:
+    def _hex_to_pysubs_color(self, hex_color: str) -> 'pysubs2.Color':
+        import pysubs2
         h = hex_color.lstrip('#')
         r, g, b = tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
         a = 0
@@ -129,6 +143,7 @@ class SubtitlesASSMaker:
         return pysubs2.Color(r, g, b, a)
 
     def make_files(self, subtitle_entries: list[SubtitleEntry]) -> list[str]:
+        import pysubs2
         templates = self.create_styled_subtitle_templates_for_positions()
         files = []
         for sub in templates:
@@ -151,13 +166,23 @@ class SubtitlesASSMaker:
 
 
 class SubtitleEditor(Editor):
+    """
+    render_mode controls how the subtitle variants are burnt:
+    - "split": decode the source once and encode every variant from one ffmpeg process
+    - "parallel": one ffmpeg process per variant, run concurrently
+    - "sequential": one ffmpeg process per variant, one after another
+    """
+    render_mode: Literal["split", "parallel", "sequential"] = "split"
+
     def __init__(self,
                  file: VideoFile,
                  text: str = '',
-                 params: SubtitleParameters = SubtitleParameters()):
+                 params: SubtitleParameters = SubtitleParameters(),
+                 timing: TimingFile = None):
         super().__init__(file)
         self.text = text
         self.params = params
+        self.timing = timing
 
     @property
     def file_type(self):
@@ -170,11 +195,20 @@ class SubtitleEditor(Editor):
         logger.info("Text successfully added to the video as subtitles.")
         return subtitled_videos
 
+    async def add_text_to_video_async(self, output_path: str = None):
+        entries = self.create_timed_entries()
+        ass_files = self.create_subtitle_files(entries)
+        subtitled_videos = await self.add_subtitles_async(subtitles=ass_files)
+        logger.info("Text successfully added to the video as subtitles.")
+        return subtitled_videos
+
     @property
     def subtitle_duration(self):
         return self.file.get_duration() - self.params.narration_silence_tail
 
     def create_timed_entries(self) -> list[SubtitleEntry]:
+        if self.timing:
+            return SubtitleTimingEngine.entries_from_timing(self.timing)
         timing_engine = SubtitleTimingEngine(text=self.text,
                                              duration=self.subtitle_duration)
         return timing_engine.make_entries()
@@ -185,27 +219,65 @@ class SubtitleEditor(Editor):
                                            params=self.params)
         return subtitle_maker.make_files(subtitle_entries=entries)
 
+    def _single_command(self, subtitle: SubtitleFile, output_path: str) -> list[str]:
+        return [
+            "ffmpeg",
+            "-y",
+            "-i", self.file.path,
+            "-vf", f"subtitles={escape_filter_path(subtitle.path)}",
+            "-c:a", "copy",
+            output_path
+        ]
+
+    def _split_command(self, subtitles: list[SubtitleFile], output_paths: list[str]) -> list[str]:
+        """One decode, split into a branch per subtitle variant, one encode per output."""
+        branches = "".join(f"[s{i}]" for i in range(len(subtitles)))
+        graph = [f"[0:v]split={len(subtitles)}{branches}"]
+        graph += [f"[s{i}]subtitles={escape_filter_path(subtitle.path)}[v{i}]"
+                  for i, subtitle in enumerate(subtitles)]
+        command = ["ffmpeg", "-y", "-i", self.file.path, "-filter_complex", ";".join(graph)]
+        for i, output_path in enumerate(output_paths):
+            command += ["-map", f"[v{i}]", "-map", "0:a?", "-c:a", "copy", output_path]
+        return command
+
+    def _render_commands(self, subtitles: list[SubtitleFile], output_paths: list[str]) -> list[list[str]]:
+        if self.render_mode == "split" and len(subtitles) > 1:
+            return [self._split_command(subtitles, output_paths)]
+        return [self._single_command(subtitle, output_path)
+                for subtitle, output_path in zip(subtitles, output_paths)]
+
     def add_subtitles(self,
-                      subtitles: list[dict[str, float | str]]):
-        subtitled_videos = []
-        for subtitle in subtitles:
-            temp_output_path = subtitle.path.replace(".ass", ".mp4")
-            try:
-                # Use ffmpeg to add subtitles to the video
-                command = [
-                    "ffmpeg",
-                    "-y",
-                    "-i", self.file.path,
-                    "-vf", f"subtitles={subtitle.path}",
-                    "-c:a", "copy",
-                    temp_output_path
-                ]
-                subprocess.run(command, check=True)
-                logger.info(f"Subtitles added successfully. Output saved to: {temp_output_path}")
-                subtitled_videos.append(VideoFile(temp_output_path))
-            except subprocess.CalledProcessError as e:
-                logger.error(f"Failed to add subtitles to video: {e}")
-                raise
-            finally:
+                      subtitles: list[SubtitleFile]):
+        output_paths = [subtitle.path.replace(".ass", ".mp4") for subtitle in subtitles]
+        try:
+            commands = self._render_commands(subtitles, output_paths)
+            workers = os.cpu_count() if self.render_mode == "parallel" else 1
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(self.run, commands))
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Failed to add subtitles to video: {e}")
+            raise
+        finally:
+            for subtitle in subtitles:
                 subtitle.delete()
-        return subtitled_videos
+        logger.info(f"Subtitles added successfully. Outputs saved to: {output_paths}")
+        return [VideoFile(output_path) for output_path in output_paths]
+
+    async def add_subtitles_async(self,
+                                  subtitles: list[SubtitleFile]):
+        output_paths = [subtitle.path.replace(".ass", ".mp4") for subtitle in subtitles]
+        try:
+            commands = self._render_commands(subtitles, output_paths)
+            if self.render_mode == "parallel":
+                await asyncio.gather(*(self.arun(command) for command in commands))
+            else:
+                for command in commands:
+                    await self.arun(command)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Failed to add subtitles to video: {e}")
+            raise
+        finally:
+            for subtitle in subtitles:
+                subtitle.delete()
+        logger.info(f"Subtitles added successfully. Outputs saved to: {output_paths}")
+        return [VideoFile(output_path) for output_path in output_paths]
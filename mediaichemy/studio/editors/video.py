@@ -1,17 +1,27 @@
 
-import subprocess
 import os
 from math import ceil
+from typing import Literal, Optional, Sequence
 
 from mediaichemy.file import VideoFile, ImageFile
+from mediaichemy.file.probe import MediaInfo
 from mediaichemy.ai import VideoAI
 from mediaichemy.studio.editors.editor import Editor
+from mediaichemy.studio.editors.boomerang import BoomerangBuilder
+from mediaichemy.process import MediaProcess
 
 from logging import getLogger
 logger = getLogger(__name__)
 
 
 class VideoEditor(Editor):
+    """
+    boomerang_mode controls how the reversed half of a boomerang is made:
+    - "segmented": reverse keyframe-aligned chunks separately, with bounded memory (see BoomerangBuilder)
+    - "filter": ffmpeg's reverse filter, which buffers the whole decoded clip
+    """
+    boomerang_mode: Literal["segmented", "filter"] = "segmented"
+
     @property
     def file_type(self):
         return VideoFile
@@ -30,11 +40,10 @@ class VideoEditor(Editor):
             "-shortest",  # Ensure the output duration matches the shortest input
             self.working_file.path
         ]
-        subprocess.run(command, check=True)
+        return command
 
-    @Editor.edit_file
-    def apply_boomerang(self):
-        command = [
+    def _boomerang_filter_command(self) -> list[str]:
+        return [
             'ffmpeg',
             '-y',
             '-ss', '0',
@@ -43,7 +52,23 @@ class VideoEditor(Editor):
             '-filter_complex', "[0]split[b][c];[c]reverse[r];[b][r]concat",
             self.working_file.path
         ]
-        subprocess.run(command, check=True)
+
+    @Editor.edit_file
+    def apply_boomerang(self):
+        if self.boomerang_mode == "filter":
+            return self._boomerang_filter_command()
+        builder = BoomerangBuilder(self.file, self.file.get_keyframes(), self.file.info, self.add_scratch_file)
+        return builder.commands(builder.ensure_reversed(self.run), self.working_file.path)
+
+    @Editor.edit_file
+    async def apply_boomerang_async(self):
+        if self.boomerang_mode == "filter":
+            return self._boomerang_filter_command()
+        builder = BoomerangBuilder(self.file,
+                                   await self.file.get_keyframes_async(),
+                                   await self.file.get_info_async(),
+                                   self.add_scratch_file)
+        return builder.commands(await builder.ensure_reversed_async(self.arun), self.working_file.path)
 
     def _create_concat_list(self,
                             output_path: str,
@@ -53,9 +78,11 @@ class VideoEditor(Editor):
                 f.write(f"file '{os.path.abspath(path)}'\n")
         return output_path
 
-    def _run_ffmpeg_concat(self, concat_list_path: str, output_path: str) -> None:
-        """Run ffmpeg to concatenate videos listed in the concat file."""
-        command = [
+    def _ffmpeg_concat_command(self, file_paths: list[str], output_path: str) -> list[str]:
+        """Write a concat list for file_paths and return the ffmpeg command concatenating them."""
+        concat_list_path = self.add_scratch_file(os.path.join(self.file.dir, f".{self.file.name}_concat.txt"))
+        self._create_concat_list(concat_list_path, file_paths)
+        return [
             'ffmpeg', '-y',
             '-f', 'concat',
             '-safe', '0',
@@ -63,46 +90,122 @@ class VideoEditor(Editor):
             '-c', 'copy',
             output_path
         ]
-        subprocess.run(command, check=True)
-        os.remove(concat_list_path)
 
     @Editor.edit_file
     def concat_with_videos(self, videos_to_add):
-        concat_list_path = os.path.join(self.file.dir, "concat_list.txt")
         file_paths = [self.file.path] + [video.path for video in videos_to_add]
-
-        # Create concat list and run ffmpeg
-        self._create_concat_list(concat_list_path, file_paths)
-        self._run_ffmpeg_concat(concat_list_path, self.working_file.path)
+        return self._ffmpeg_concat_command(file_paths, self.working_file.path)
 
     @Editor.edit_file
     def repeat_video(self, n: int):
         if n <= 0:
             raise ValueError("Number of repetitions must be greater than 0.")
-
-        # Create concat list with repeated entries
-        concat_list_path = os.path.join(self.file.dir, "concat_list.txt")
-        file_paths = [self.file.path] * n
-
-        # Create concat list and run ffmpeg
-        self._create_concat_list(concat_list_path, file_paths)
-        self._run_ffmpeg_concat(concat_list_path, self.working_file.path)
+        return self._ffmpeg_concat_command([self.file.path] * n, self.working_file.path)
 
     @Editor.edit_file
-    def trim_video(self, duration: int) -> str:
-        command = [
-            'ffmpeg',
+    def trim_video(self, duration: int):
+        # Cuts from 0 always start on a keyframe, so stream copy is exact
+        return self._segment_command(0, duration, self.working_file.path, ["-c", "copy"])
+
+    def _segment_command(self, start: float, duration: float, output_path: str, codec_args: list[str]) -> list[str]:
+        """Input seeking: ffmpeg jumps to the seek point before ``start`` instead of decoding up to it."""
+        return [
+            'ffmpeg', '-y',
+            '-ss', str(start),
             '-i', self.file.path,
             '-t', str(duration),
-            '-c', 'copy',
-            '-y',
-            self.working_file.path
+            *codec_args,
+            '-avoid_negative_ts', 'make_zero',
+            output_path
         ]
-        subprocess.run(command, check=True)
 
-    def extract_last_frame(self) -> ImageFile:
-        output_path = self.file.path.replace(".mp4", "_lastframe.jpg")
-        command = [
+    # ffprobe H.264 profile -> libx264 -profile:v
+    X264_PROFILES = {"Constrained Baseline": "baseline", "Baseline": "baseline", "Main": "main", "High": "high",
+                     "High 10": "high10", "High 4:2:2": "high422", "High 4:4:4 Predictive": "high444"}
+    X264_PIX_FMTS = {"yuv420p", "yuvj420p", "yuv422p", "yuv444p", "yuv420p10le", "yuv422p10le", "yuv444p10le"}
+
+    @classmethod
+    def _can_smart_cut(cls, info: MediaInfo) -> bool:
+        """
+        Re-encoded and copied GOPs can only be joined if the re-encode matches the source stream:
+        same codecs, profile and pixel format (hence bit depth). The resolution is never changed
+        by a cut, so it matches by construction.
+        """
+        return (info.video_codec == "h264"
+                and info.video_profile in cls.X264_PROFILES
+                and info.pix_fmt in cls.X264_PIX_FMTS
+                and info.audio_codec in (None, "aac"))
+
+    @classmethod
+    def _head_encode_args(cls, info: MediaInfo) -> list[str]:
+        """Encoder settings reproducing the source's stream parameters, for the re-encoded head of a smart cut."""
+        args = ["-c:v", "libx264", "-pix_fmt", info.pix_fmt, "-profile:v", cls.X264_PROFILES[info.video_profile]]
+        if info.audio_codec:
+            args += ["-c:a", "aac"]
+            if info.sample_rate:
+                args += ["-ar", str(info.sample_rate)]
+            if info.channels:
+                args += ["-ac", str(info.channels)]
+        return args
+
+    def _cut_commands(self,
+                      start: float,
+                      duration: float,
+                      accurate: bool,
+                      keyframes: Sequence[float],
+                      info: Optional[MediaInfo]) -> list[list[str]]:
+        """
+        Without ``accurate`` the cut is a stream copy that snaps to the keyframe before ``start``.
+        Otherwise a cut starting on a keyframe is still copied; one starting mid-GOP re-encodes
+        only up to the next keyframe and copies the rest, joined through MPEG-TS so both parts
+        carry their own codec headers. Sources that can't be joined like that are re-encoded.
+        """
+        copy = ["-c", "copy"]
+        output_path = self.working_file.path
+        if not accurate:
+            return [self._segment_command(start, duration, output_path, copy)]
+
+        end = start + duration
+        tolerance = 0.5 / info.fps if info.fps else 0.001
+        keyframe = next((k for k in keyframes if k >= start - tolerance), None)
+        if keyframe is not None and abs(keyframe - start) <= tolerance:
+            return [self._segment_command(start, duration, output_path, copy)]
+
+        reencode = ["-c:v", "libx264", "-pix_fmt", "yuv420p"]
+        if info.audio_codec:
+            reencode += ["-c:a", "aac"]
+        if keyframe is None or keyframe >= end or not self._can_smart_cut(info):
+            return [self._segment_command(start, duration, output_path, reencode)]
+
+        head = self.add_scratch_file(os.path.join(self.file.dir, f".{self.file.name}_head.ts"))
+        tail = self.add_scratch_file(os.path.join(self.file.dir, f".{self.file.name}_tail.ts"))
+        concat_list = self.add_scratch_file(os.path.join(self.file.dir, f".{self.file.name}_cut.txt"))
+        self._create_concat_list(concat_list, [head, tail])
+        join = ['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', concat_list, '-c', 'copy']
+        if info.audio_codec:
+            join += ['-bsf:a', 'aac_adtstoasc']
+        logger.debug(f"Smart cut: re-encoding {keyframe - start:.3f}s up to the keyframe at {keyframe}s")
+        return [self._segment_command(start, keyframe - start, head, self._head_encode_args(info)),
+                self._segment_command(keyframe, end - keyframe, tail, copy),
+                join + [output_path]]
+
+    @Editor.edit_file
+    def cut(self, start: float, duration: float, accurate: bool = True):
+        """Keep ``duration`` seconds from ``start``, using the cached keyframe index to avoid re-encoding."""
+        if accurate:
+            return self._cut_commands(start, duration, accurate, self.file.get_keyframes(), self.file.info)
+        return self._cut_commands(start, duration, accurate, (), None)
+
+    @Editor.edit_file
+    async def cut_async(self, start: float, duration: float, accurate: bool = True):
+        if accurate:
+            return self._cut_commands(start, duration, accurate,
+                                      await self.file.get_keyframes_async(),
+                                      await self.file.get_info_async())
+        return self._cut_commands(start, duration, accurate, (), None)
+
+    def _last_frame_command(self, output_path: str) -> list[str]:
+        return [
             "ffmpeg",
             "-y",
             "-sseof", "-3",
@@ -112,13 +215,20 @@ class VideoEditor(Editor):
             "-update", "true",
             output_path
         ]
-        subprocess.run(command, check=True)
+
+    def extract_last_frame(self) -> ImageFile:
+        output_path = self.file.path.replace(".mp4", "_lastframe.jpg")
+        self.run(self._last_frame_command(output_path))
+        return ImageFile(output_path)
+
+    async def extract_last_frame_async(self) -> ImageFile:
+        output_path = self.file.path.replace(".mp4", "_lastframe.jpg")
+        await self.arun(self._last_frame_command(output_path))
         return ImageFile(output_path)
 
     @staticmethod
-    def create_image_video(image: ImageFile, duration: int) -> VideoFile:
-        video_path = image.path.replace(".jpg", "_video.mp4")
-        command = [
+    def _image_video_command(image: ImageFile, duration: int, video_path: str) -> list[str]:
+        return [
             "ffmpeg",
             "-y",  # Overwrite output file if it exists
             "-loop", "1",  # Loop the image
@@ -128,8 +238,17 @@ class VideoEditor(Editor):
             "-pix_fmt", "yuv420p",
             video_path
         ]
-        subprocess.run(command, check=True)
 
+    @staticmethod
+    def create_image_video(image: ImageFile, duration: int) -> VideoFile:
+        video_path = image.path.replace(".jpg", "_video.mp4")
+        MediaProcess.run(VideoEditor._image_video_command(image, duration, video_path))
+        return VideoFile(video_path)
+
+    @staticmethod
+    async def create_image_video_async(image: ImageFile, duration: int) -> VideoFile:
+        video_path = image.path.replace(".jpg", "_video.mp4")
+        await MediaProcess.arun(VideoEditor._image_video_command(image, duration, video_path))
         return VideoFile(video_path)
 
     def loop_to_duration(self, target_duration: float):
@@ -142,7 +261,16 @@ class VideoEditor(Editor):
             self.repeat_video(n_repeat)
         self.trim_video(duration=target_duration)
 
-    @Editor.edit_file
+    async def loop_to_duration_async(self, target_duration: float):
+        if target_duration <= 0:
+            raise ValueError("Target duration must be greater than 0 seconds.")
+
+        await self.apply_boomerang_async()
+        n_repeat = ceil(target_duration / await self.file.get_duration_async())
+        if n_repeat > 1:
+            await self.repeat_video_async(n_repeat)
+        await self.trim_video_async(duration=target_duration)
+
     async def ai_generate_to_duration(self, target_duration: float, prompt: str = None,
                                       video_model: str = 'bytedance:1@1'):
         if target_duration <= 0:
@@ -153,22 +281,24 @@ class VideoEditor(Editor):
 
         current_video = self.file
         videos_to_add = []
+        total_duration = await self.file.get_duration_async()
 
-        while sum([v.get_duration() for v in [self.file] + videos_to_add]) < target_duration:
+        while total_duration < target_duration:
             n = len(videos_to_add)
             n_path = self.file.path.replace(".mp4", f"_ai_extension{n}.mp4")
-            lastframe = self.extract_last_frame() if current_video == self.file else \
-                VideoEditor(current_video).extract_last_frame()
+            lastframe = await VideoEditor(current_video).extract_last_frame_async()
             video_continue, _ = await VideoAI().create(
                 prompt=prompt,
                 output_path=n_path,
-                frameImage=lastframe.path,
+                frameImages=[lastframe.to_iframe_image()],
                 video_model=video_model
             )
+            lastframe.delete()
 
             videos_to_add.append(video_continue)
             current_video = video_continue
+            total_duration += await video_continue.get_duration_async()
 
         if videos_to_add:
-            self.concat_with_videos(videos_to_add)
-        self.trim_video(duration=target_duration)
+            await self.concat_with_videos_async(videos_to_add)
+        await self.trim_video_async(duration=target_duration)
@@ -0,0 +1,218 @@
+import asyncio
+import atexit
+import json
+import os
+import random
+import secrets
+import tempfile
+import threading
+import time
+import weakref
+from typing import Dict, NamedTuple, Optional
+
+from mediaichemy.file import AudioFile, utils
+from mediaichemy.file.probe import MediaProbe
+from mediaichemy.process import MediaProcess
+from mediaichemy.studio.sources.platforms import YoutubeVideo, YoutubeVideoList
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class BackgroundSection(NamedTuple):
+    """A section of a background track, to be read by seeking into ``file``."""
+    file: AudioFile
+    start: float
+    duration: float
+    temporary: bool = False
+
+    def release(self) -> None:
+        """Delete the file if it was downloaded for this section only."""
+        if self.temporary and self.file.exists():
+            self.file.delete()
+
+
+class BackgroundLibrary:
+    """
+    Persistent store of background tracks, keyed by YouTube video id.
+
+    Each track is downloaded once, loudness-normalized and stored as FLAC (lossless and
+    cheaply seekable). Durations live in ``index.json`` so serving a section needs neither
+    a download nor a probe. Least recently used tracks are evicted beyond ``max_bytes``.
+    Lookups only record their access time in memory. Access times are written to the index
+    (under a lock shared with other processes) at most every ``flush_interval`` seconds, when
+    a track is added and at exit, so reads don't rewrite the index every time.
+
+    With ``stream_on_miss`` a track that is not in the library is not stored: only its
+    metadata is fetched, the window is chosen up front and just that section is downloaded.
+    """
+    max_bytes = 2 * 1024 * 1024 * 1024
+    loudness_filter = "loudnorm=I=-16:TP=-1.5:LRA=11"
+    sample_rate = 44100
+    stream_on_miss = False
+    flush_interval = 30.0
+
+    _default: Optional['BackgroundLibrary'] = None
+
+    def __init__(self, directory: str = None, max_bytes: int = None, stream_on_miss: bool = None):
+        self.directory = directory or utils.get_cache_dir("backgrounds")
+        self.max_bytes = max_bytes or self.max_bytes
+        if stream_on_miss is not None:
+            self.stream_on_miss = stream_on_miss
+        self.index_path = os.path.join(self.directory, "index.json")
+        self._index_lock = threading.Lock()
+        # asyncio locks are bound to the loop they are first used on
+        self._fetch_locks: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]' = \
+            weakref.WeakKeyDictionary()
+        self._last_used: Dict[str, float] = {}
+        self._flushed_at = time.monotonic()
+
+    @classmethod
+    def default(cls) -> 'BackgroundLibrary':
+        if cls._default is None:
+            cls._default = cls()
+            atexit.register(cls._default.flush)
+        return cls._default
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_index(self, index: dict) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".index_", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=4)
+        os.replace(tmp_path, self.index_path)
+
+    def _track_path(self, video_id: str) -> str:
+        return os.path.join(self.directory, f"{video_id}.flac")
+
+    def lookup(self, video_id: str) -> Optional[dict]:
+        """Return the index entry of a stored track, marking it as recently used."""
+        entry = self._read_index().get(video_id)
+        if entry is None or not os.path.exists(self._track_path(video_id)):
+            return None
+        with self._index_lock:
+            entry["last_used"] = self._last_used[video_id] = time.time()
+            due = time.monotonic() - self._flushed_at >= self.flush_interval
+        if due:
+            self.flush()
+        return entry
+
+    def _merge_last_used(self, index: dict) -> None:
+        for used_id, last_used in self._last_used.items():
+            if used_id in index:
+                index[used_id]["last_used"] = max(index[used_id]["last_used"], last_used)
+        self._last_used.clear()
+        self._flushed_at = time.monotonic()
+
+    def flush(self) -> None:
+        """Write the access times recorded by lookups to the index."""
+        with self._index_lock:
+            if not self._last_used:
+                return
+            try:
+                with utils.cache_lock(self.directory):
+                    index = self._read_index()
+                    self._merge_last_used(index)
+                    self._write_index(index)
+            except OSError as error:
+                logger.warning(f"Could not update the background library index: {error}")
+
+    def _add(self, video_id: str, duration: float) -> dict:
+        with self._index_lock, utils.cache_lock(self.directory):
+            index = self._read_index()
+            self._merge_last_used(index)
+            entry = index[video_id] = {"duration": duration,
+                                       "size": os.path.getsize(self._track_path(video_id)),
+                                       "last_used": time.time()}
+            self._evict(index, keep=video_id)
+            self._write_index(index)
+            return entry
+
+    def _evict(self, index: dict, keep: str) -> None:
+        total = sum(entry["size"] for entry in index.values())
+        for video_id in sorted(index, key=lambda video_id: index[video_id]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if video_id == keep:
+                continue
+            total -= index.pop(video_id)["size"]
+            if os.path.exists(self._track_path(video_id)):
+                os.remove(self._track_path(video_id))
+            logger.info(f"Evicted background track {video_id} from the library")
+
+    def _normalize_command(self, source_path: str, output_path: str) -> list:
+        return ["ffmpeg", "-y", "-v", "error",
+                "-i", source_path,
+                "-vn", "-af", self.loudness_filter,
+                "-ar", str(self.sample_rate), "-ac", "2",
+                "-c:a", "flac",
+                output_path]
+
+    async def _fetch(self, video: YoutubeVideo) -> dict:
+        download_path = os.path.join(self.directory, f".{video.id}_download.mp3")
+        track_path = self._track_path(video.id)
+        partial_path = os.path.join(self.directory, f".{video.id}_partial.flac")
+        download = await video.download_async(download_path)
+        try:
+            await MediaProcess.arun(self._normalize_command(download.path, partial_path), capture_output=True)
+            os.replace(partial_path, track_path)
+        finally:
+            download.delete()
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        duration = (await MediaProbe.info_async(track_path)).duration
+        logger.info(f"Added background track {video.id} ({duration:.1f}s) to the library")
+        return self._add(video.id, duration)
+
+    async def _fetch_section(self, video: YoutubeVideo, duration: float) -> BackgroundSection:
+        start = self._random_start(duration, await video.get_duration_async())
+        section_path = os.path.join(self.directory, f".{video.id}_{start}.flac")
+        ffmpeg_args = f"-af {self.loudness_filter} -ar {self.sample_rate} -ac 2"
+        section = await video.download_section_async(section_path, start, duration, postprocessor_args=ffmpeg_args)
+        logger.debug(f"Downloaded {duration}s of {video.id} from {start}s")
+        return BackgroundSection(file=section, start=0, duration=duration, temporary=True)
+
+    @staticmethod
+    def _random_start(duration: float, total_duration: float) -> int:
+        if duration > total_duration:
+            raise ValueError(f"Specified duration ({duration}s) is longer than the background track "
+                             f"({total_duration}s).")
+        return random.randint(0, int(total_duration - duration))
+
+    async def get_async(self, video: YoutubeVideo) -> dict:
+        """Return the index entry of ``video``, downloading and normalizing it on a miss."""
+        entry = self.lookup(video.id)
+        if entry:
+            return entry
+        locks = self._fetch_locks.setdefault(asyncio.get_running_loop(), {})
+        lock = locks.setdefault(video.id, asyncio.Lock())
+        async with lock:
+            # Another job may have fetched it while we were waiting
+            return self.lookup(video.id) or await self._fetch(video)
+
+    async def choose_async(self, videos: YoutubeVideoList) -> YoutubeVideo:
+        """
+        Pick a random track and make sure it is in the library (unless sections are streamed),
+        so the fetch can run before the section length is known.
+        """
+        video = secrets.choice(videos.videos)
+        if not self.stream_on_miss:
+            await self.get_async(video)
+        return video
+
+    async def section_async(self, video: YoutubeVideo, duration: float) -> BackgroundSection:
+        """A random section of ``duration`` seconds of ``video``."""
+        if self.stream_on_miss and not self.lookup(video.id):
+            return await self._fetch_section(video, duration)
+        entry = await self.get_async(video)
+        start = self._random_start(duration, entry["duration"])
+        return BackgroundSection(file=AudioFile(self._track_path(video.id)), start=start, duration=duration)
+
+    async def random_section_async(self, videos: YoutubeVideoList, duration: float) -> BackgroundSection:
+        """Pick a random track and a random section of ``duration`` seconds within it."""
+        return await self.section_async(await self.choose_async(videos), duration)
@@ -1,9 +1,10 @@
 import secrets
 import subprocess
 from mediaichemy.file import AudioFile, utils
+from mediaichemy.process import MediaProcess
 from mediaichemy.studio.editors.subtitles import SubtitleEntry
-from youtube_transcript_api import YouTubeTranscriptApi
 import re
+from functools import cached_property
 import logging
 logger = logging.getLogger(__name__)
 
@@ -12,7 +13,12 @@ class YoutubeVideo:
     def __init__(self, url: str):
         self.url = url
         self.id = self.extract_id()
-        self.ytt_api = YouTubeTranscriptApi()
+        self._duration = None
+
+    @cached_property
+    def ytt_api(self):
+        from youtube_transcript_api import YouTubeTranscriptApi
+        return YouTubeTranscriptApi()
 
     def extract_id(self) -> str:
         youtube_patterns = [
@@ -27,19 +33,66 @@ class YoutubeVideo:
 
         raise ValueError(f"Could not extract video ID from URL: {self.url}")
 
-    def download(self, output_path) -> AudioFile:
-        output_path = utils.get_next_available_path(output_path)
-        command = [
+    def _download_command(self, output_path) -> list:
+        return [
             "yt-dlp",
             "-x",
             "--audio-format", "mp3",
             "-o", output_path,
             self.url
         ]
-        result = subprocess.run(command, check=True,
-                                capture_output=True,
-                                text=True
-                                )
+
+    def _section_command(self, output_path, start: float, duration: float, postprocessor_args: str = None) -> list:
+        command = [
+            "yt-dlp",
+            "-x",
+            "--audio-format", "flac",
+            "--download-sections", f"*{start}-{start + duration}",
+        ]
+        if postprocessor_args:
+            command += ["--postprocessor-args", f"ExtractAudio:{postprocessor_args}"]
+        return command + ["-o", output_path, self.url]
+
+    async def get_duration_async(self) -> float:
+        """Duration of the video from its metadata, without downloading any media."""
+        if self._duration is None:
+            result = await MediaProcess.arun(["yt-dlp", "--skip-download", "--print", "duration", self.url],
+                                             capture_output=True,
+                                             text=True,
+                                             limited=False)
+            self._duration = float(result.stdout.strip().splitlines()[-1])
+        return self._duration
+
+    async def download_section_async(self,
+                                     output_path,
+                                     start: float,
+                                     duration: float,
+                                     postprocessor_args: str = None) -> AudioFile:
+        """Download only ``duration`` seconds of audio from ``start``, as FLAC."""
+        output_path = utils.get_next_available_path(output_path)
+        result = await MediaProcess.arun(self._section_command(output_path, start, duration, postprocessor_args),
+                                         capture_output=True,
+                                         text=True,
+                                         limited=False)
+        return self._check_download(result, output_path)
+
+    def download(self, output_path) -> AudioFile:
+        output_path = utils.get_next_available_path(output_path)
+        result = MediaProcess.run(self._download_command(output_path),
+                                  capture_output=True,
+                                  text=True,
+                                  limited=False)
+        return self._check_download(result, output_path)
+
+    async def download_async(self, output_path) -> AudioFile:
+        output_path = utils.get_next_available_path(output_path)
+        result = await MediaProcess.arun(self._download_command(output_path),
+                                         capture_output=True,
+                                         text=True,
+                                         limited=False)
+        return self._check_download(result, output_path)
+
+    def _check_download(self, result: subprocess.CompletedProcess, output_path) -> AudioFile:
         logger.debug(f"Downloaded audio from {self.url} to {output_path}")
         if "ERROR" in result.stderr:
             error = ("Error downloading background music."
@@ -107,3 +160,7 @@ class YoutubeVideoList:
         youtube_video = self.select_random_video()
         video = youtube_video.download(output_path)
         return video
+
+    async def download_random_from_list_async(self, output_path) -> AudioFile:
+        youtube_video = self.select_random_video()
+        return await youtube_video.download_async(output_path)
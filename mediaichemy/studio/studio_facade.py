@@ -1,15 +1,18 @@
-from mediaichemy.file import utils, AudioFile, VideoFile
+from mediaichemy.file import utils, AudioFile, AudioBuffer, VideoFile, TimingFile
+from dataclasses import asdict
 
 from mediaichemy.ai import (ImageAI,
                             VideoAI,
                             ImageVideoAI,
                             VoiceAI,
                             ChatAI)
-from mediaichemy.studio.editors import (AudioEditor,
-                                        VideoEditor,
-                                        SubtitleEditor)
-from mediaichemy.studio.sources.platforms import YoutubeVideoList
+from mediaichemy.studio.editors import (VideoEditor,
+                                        SubtitleEditor,
+                                        EditPlan)
+from mediaichemy.studio.sources.platforms import YoutubeVideo, YoutubeVideoList
+from mediaichemy.studio.sources.library import BackgroundLibrary, BackgroundSection
 from mediaichemy.studio.captions import CaptionMaker
+from typing import List, Optional
 import logging
 logger = logging.getLogger(__name__)
 
@@ -46,20 +49,53 @@ class StudioFacade:
                                      system_prompt=system_prompt)
         return agent
 
-    def create_narration(self, directory: str):
-        output_path = utils.get_next_available_path(directory + 'narration.wav')
-        narration = VoiceAI().synthesize_speech(text=self.params.narration_text,
-                                                voice_name=self.params.narration_voice_name,
-                                                speed=self.params.narration_speed,
-                                                output_path=output_path)
-        AudioEditor(narration).add_silence_tail(duration=self.params.narration_silence_tail)
-        return narration
+    async def synthesize_narration(self) -> AudioBuffer:
+        narration = await VoiceAI().synthesize_buffer_async(text=self.params.narration_text,
+                                                            voice_name=self.params.narration_voice_name,
+                                                            speed=self.params.narration_speed)
+        return narration.pad(self.params.narration_silence_tail)
+
+    async def create_narration(self, directory: str, extension: str = '.mp3'):
+        """Synthesize the narration and encode it once. Use a lossless extension for intermediates."""
+        output_path = utils.get_next_available_path(directory + f'narration{extension}')
+        narration = await self.synthesize_narration()
+        return await narration.encode_async(output_path)
+
+    async def create_timed_narration(self, directory: str, extension: str = '.mp3'):
+        """Like create_narration, sentence by sentence, plus a sidecar with the exact sentence timings."""
+        narration, segments = await VoiceAI().synthesize_timed_buffer_async(
+            text=self.params.narration_text,
+            voice_name=self.params.narration_voice_name,
+            speed=self.params.narration_speed)
+        narration = narration.pad(self.params.narration_silence_tail)
+        output_path = utils.get_next_available_path(directory + f'narration{extension}')
+        timing_path = utils.get_next_available_path(directory + 'narration_timing.json')
+        timing = TimingFile.create(timing_path, [asdict(segment) for segment in segments])
+        return await narration.encode_async(output_path), timing
+
+    async def mix_narration_with_background(self,
+                                            directory: str,
+                                            narration: AudioBuffer,
+                                            background_video: Optional[YoutubeVideo] = None):
+        """Mix the narration with a background section in memory and encode the result once."""
+        output_path = utils.get_next_available_path(directory + 'narration.mp3')
+        section = await self.select_background_section(duration=narration.duration, video=background_video)
+        if section:
+            background = await AudioBuffer.decode_async(section.file.path,
+                                                        start=section.start,
+                                                        duration=section.duration)
+            section.release()
+            narration = await narration.conform_async(background.sample_rate, background.channels)
+            narration = narration.mix(background, background_relative_volume=self.params.background_relative_volume)
+        return await narration.encode_async(output_path)
 
     async def create_captions(self,
                               directory: str,
-                              model: str = None):
+                              model: str = None,
+                              hedge_after: Optional[float] = None):
         caption_maker = CaptionMaker(parameters=self.params,
-                                     model=model)
+                                     model=model,
+                                     hedge_after=hedge_after)
         self.captions = await caption_maker.create_captions_from_parameters()
         captions_str = self.captions.to_string()
         output_path = utils.get_next_available_path(directory + 'captions.txt')
@@ -68,30 +104,75 @@ class StudioFacade:
             f.write(captions_str)
         return self.captions
 
-    def download_and_mix_youtube_audio(self,
-                                       directory: str,
-                                       original_audio: AudioFile):
+    async def prefetch_background(self) -> Optional[YoutubeVideo]:
+        """Choose one of the background tracks and get it into the local library, or None if there are none."""
         if not self.params.background_youtube_urls:
-            return original_audio
-        output_path = utils.get_next_available_path(directory + 'youtube.mp3')
+            return None
         yt_videos = YoutubeVideoList(self.params.background_youtube_urls)
-        background = yt_videos.download_random_from_list(output_path=output_path)
-        AudioEditor(background).extract_random_section(duration=original_audio.get_duration())
-        AudioEditor(original_audio).mix_with(audio=background,
-                                             background_relative_volume=self.params.background_relative_volume)
-        background.delete()
-        return original_audio
+        return await BackgroundLibrary.default().choose_async(yt_videos)
+
+    async def select_background_section(self,
+                                        duration: float,
+                                        video: Optional[YoutubeVideo] = None) -> Optional[BackgroundSection]:
+        """A random section of ``video`` (or of a random background track), or None if there are none."""
+        video = video or await self.prefetch_background()
+        if not video:
+            return None
+        return await BackgroundLibrary.default().section_async(video, duration=duration)
+
+    async def loop_to_duration(self, video: VideoFile, target_duration: float):
+        return await VideoEditor(video).loop_to_duration_async(target_duration)
 
-    def loop_to_duration(self, video: VideoFile, target_duration: float):
-        return VideoEditor(video).loop_to_duration(target_duration)
+    async def add_audio_track_to_video(self, video: VideoFile, audio: AudioFile):
+        return await VideoEditor(video).add_audio_track_to_video_async(audio)
+
+    async def assemble_narrated_video(self,
+                                      video: VideoFile,
+                                      narration: AudioFile,
+                                      background: Optional[BackgroundSection] = None):
+        """Loop the video to the narration length and add the (mixed) narration in one ffmpeg pass."""
+        plan = await self._narrated_video_plan(video, narration, background)
+        return await plan.render_async()
+
+    async def assemble_subtitled_videos(self,
+                                        video: VideoFile,
+                                        narration: AudioFile,
+                                        timing: TimingFile,
+                                        background: Optional[BackgroundSection] = None) -> List[VideoFile]:
+        """
+        Like assemble_narrated_video, also burning in the narration's subtitles. Every subtitle
+        position gets its own video, all written by the same ffmpeg pass; ``video`` is left as is.
+        """
+        sub_editor = SubtitleEditor(video,
+                                    text=self.params.narration_text,
+                                    params=self.params,
+                                    timing=timing)
+        subtitles = sub_editor.create_subtitle_files(sub_editor.create_timed_entries())
+        output_paths = [subtitle.path.replace(".ass", ".mp4") for subtitle in subtitles]
+        try:
+            plan = await self._narrated_video_plan(video, narration, background)
+            return await plan.burn_subtitles(subtitles, output_paths).render_subtitled_async()
+        finally:
+            for subtitle in subtitles:
+                subtitle.delete()
 
-    def add_audio_track_to_video(self, video: VideoFile, audio: AudioFile):
-        return VideoEditor(video).add_audio_track_to_video(audio)
+    async def _narrated_video_plan(self,
+                                   video: VideoFile,
+                                   narration: AudioFile,
+                                   background: Optional[BackgroundSection] = None) -> EditPlan:
+        plan = EditPlan(video).loop(await narration.get_duration_async()).add_audio(narration)
+        if background:
+            plan.mix_audio(background.file,
+                           background_relative_volume=self.params.background_relative_volume,
+                           start=background.start)
+        return plan
 
-    def produce_subtitled_videos(self,
-                                 video: VideoFile):
+    async def produce_subtitled_videos(self,
+                                       video: VideoFile,
+                                       timing: Optional[TimingFile] = None):
         sub_editor = SubtitleEditor(video,
                                     text=self.params.narration_text,
-                                    params=self.params)
-        subtitled_videos = sub_editor.add_text_to_video()
+                                    params=self.params,
+                                    timing=timing)
+        subtitled_videos = await sub_editor.add_text_to_video_async()
         return subtitled_videos
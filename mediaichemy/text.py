@@ -0,0 +1,11 @@
+import re
+
+
+def split_into_sentences(text: str) -> list[str]:
+    """Split text at sentence and clause punctuation, dropping empty pieces."""
+    return [s.strip() for s in re.split(r'(?<=[!.,:?])(?=\s|\n|")+', text) if s.strip()]
+
+
+def split_at_sentence_ends(text: str) -> list[str]:
+    """Split text only where a sentence ends (. ! ?), keeping clauses together."""
+    return [s.strip() for s in re.split(r'(?<=[!.?])(?=\s|\n|")+', text) if s.strip()]
@@ -43,7 +43,7 @@ setup(
     extras_require={
         "tests": test_requires,
     },
-    python_requires=">=3.8,<3.13",
+    python_requires=">=3.9,<3.13",
     classifiers=[
         "Development Status :: 4 - Beta",
         "Programming Language :: Python :: 3",
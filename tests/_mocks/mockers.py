@@ -45,3 +45,6 @@ class MockDownloader:
             Path(output_path).write_bytes(b"mock data")
 
         return output_path
+
+    async def async_download(self, url, output_path):
+        return self.download(url, output_path)
@@ -2,7 +2,9 @@ import random
 import pytest
 
 from mediaichemy import ai
-from mediaichemy.file import HTTPDownloader
+from mediaichemy.ai.voice import SpeechSegment
+from mediaichemy.text import split_into_sentences
+from mediaichemy.file import HTTPDownloader, AsyncHTTPDownloader, AudioBuffer
 
 from tests._mocks.mockers import MockDownloader, MockRunwareClient, MockAgent
 from tests._mocks.files import mocks as mock_files
@@ -16,7 +18,8 @@ def mock_downloader(monkeypatch):
     mock.add_mock_file("mp4", mock_files.video.path)
 
     monkeypatch.setattr(HTTPDownloader, "download", mock.download)
-    monkeypatch.setattr(ai.VisualAI, "download", staticmethod(mock.download))
+    monkeypatch.setattr(AsyncHTTPDownloader, "download", mock.async_download)
+    monkeypatch.setattr(ai.VisualAI, "download", staticmethod(mock.async_download))
 
     return mock
 
@@ -29,6 +32,14 @@ def mock_runware_client(monkeypatch):
     return get_mock_client
 
 
+@pytest.fixture(autouse=True)
+def isolated_generation_cache(monkeypatch, tmp_path):
+    # Own subdirectory: eviction would otherwise count (and delete) the test's outputs
+    cache = ai.GenerationCache(directory=str(tmp_path / "generation_cache"))
+    monkeypatch.setattr(ai.GenerationCache, "_default", cache)
+    return cache
+
+
 @pytest.fixture(autouse=True)
 def mock_agent(monkeypatch):
     def get_mock_agent(*args, **kwargs):
@@ -67,4 +78,17 @@ def mock_narration_synthesis(monkeypatch):
         output = mock_audio.copy(output_path)
         return output
 
+    async def mock_synthesize_buffer(self, text, voice_name, speed=1):
+        return await AudioBuffer.decode_async(mock_files.narration.path, sample_rate=22050, channels=1)
+
+    async def mock_synthesize_timed_buffer(self, text, voice_name, speed=1, sentence_gap=0.1):
+        buffer = await mock_synthesize_buffer(self, text, voice_name, speed)
+        sentences = split_into_sentences(text)
+        step = buffer.duration / len(sentences)
+        segments = [SpeechSegment(text=sentence, start=i * step, end=(i + 1) * step)
+                    for i, sentence in enumerate(sentences)]
+        return buffer, segments
+
     monkeypatch.setattr(ai.VoiceAI, "synthesize_speech", mock_synthesize)
+    monkeypatch.setattr(ai.VoiceAI, "synthesize_timed_buffer_async", mock_synthesize_timed_buffer)
+    monkeypatch.setattr(ai.VoiceAI, "synthesize_buffer_async", mock_synthesize_buffer)
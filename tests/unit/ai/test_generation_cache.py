@@ -0,0 +1,71 @@
+import os
+
+import pytest
+from runware import IImageInference, IVideoInference
+from runware.types import IFrameImage
+
+from mediaichemy.ai import GenerationCache, ImageAI
+
+
+def test_key_ignores_task_uuid_but_not_request_content():
+    first = IImageInference(positivePrompt="a fox", model="m", width=512, height=512, taskUUID="1")
+    retry = IImageInference(positivePrompt="a fox", model="m", width=512, height=512, taskUUID="2")
+    seeded = IImageInference(positivePrompt="a fox", model="m", width=512, height=512, seed=7)
+
+    assert GenerationCache.key("image", first) == GenerationCache.key("image", retry)
+    assert GenerationCache.key("image", first) != GenerationCache.key("image", seeded)
+    assert GenerationCache.key("image", first) != GenerationCache.key("video", first)
+    assert (GenerationCache.key("video", {"frameImages": [IFrameImage(inputImage="a", frame="first")]})
+            != GenerationCache.key("video", {"frameImages": [IFrameImage(inputImage="b", frame="first")]}))
+
+
+def test_hard_links_hits_and_evicts_least_recently_used(tmp_path):
+    cache = GenerationCache(directory=str(tmp_path / "cache"), max_bytes=25)
+    for name in ("a", "b"):
+        (tmp_path / f"{name}.jpg").write_bytes(b"x" * 10)
+        cache.put(name, str(tmp_path / f"{name}.jpg"), cost=0.5)
+
+    hit = cache.get("a", str(tmp_path / "job" / "image.jpg"))
+    assert hit.cost == 0.5
+    assert os.path.samefile(hit.path, os.path.join(cache.directory, "a.jpg"))
+
+    (tmp_path / "c.jpg").write_bytes(b"x" * 10)
+    os.utime(os.path.join(cache.directory, "b.jpg"), (0, 0))
+    cache.put("c", str(tmp_path / "c.jpg"), cost=0.5)
+    assert cache.get("b", str(tmp_path / "b_again.jpg")) is None
+    assert cache.get("a", str(tmp_path / "a_again.jpg")) is not None
+
+
+@pytest.mark.asyncio
+async def test_identical_seeded_requests_are_only_paid_once(tmp_path, mock_runware_client):
+    first, first_cost = await ImageAI().create("a fox", str(tmp_path / "1.jpg"), image_model="m", seed=7)
+    second, second_cost = await ImageAI().create("a fox", str(tmp_path / "2.jpg"), image_model="m", seed=7)
+
+    assert first_cost == 0.1 and second_cost == 0
+    assert first.hash == second.hash
+
+
+@pytest.mark.asyncio
+async def test_unseeded_requests_always_generate(tmp_path, mock_runware_client):
+    costs = [(await ImageAI().create("a fox", str(tmp_path / f"{n}.jpg"), image_model="m"))[1] for n in range(2)]
+
+    assert costs == [0.1, 0.1]
+
+
+def test_frame_images_are_part_of_the_key():
+    first = IVideoInference(positivePrompt="go on", model="m", seed=1,
+                            frameImages=[IFrameImage(inputImage="data:image/jpeg;base64,AAAA", frame="first")])
+    next_extension = IVideoInference(positivePrompt="go on", model="m", seed=1,
+                                     frameImages=[IFrameImage(inputImage="data:image/jpeg;base64,BBBB",
+                                                              frame="first")])
+
+    assert GenerationCache().key_for("video", first) != GenerationCache().key_for("video", next_extension)
+
+
+def test_put_leaves_no_temporary_files_and_eviction_skips_foreign_ones(tmp_path):
+    cache = GenerationCache(directory=str(tmp_path / "cache"), max_bytes=5)
+    (tmp_path / "a.jpg").write_bytes(b"x" * 10)
+    (tmp_path / "cache" / ".b.jpg.in-flight").write_bytes(b"x" * 10)
+    cache.put("a", str(tmp_path / "a.jpg"), cost=0.5)
+
+    assert sorted(os.listdir(cache.directory)) == [".b.jpg.in-flight", "a.jpg", "a.json"]
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from pydantic_ai.exceptions import ModelHTTPError
+
+from mediaichemy.ai.llm import modelfallback
+from mediaichemy.ai.llm.modelfallback import ModelHealth, ModelHealthBoard, with_model_fallback
+
+
+class FakeChat:
+    def __init__(self, behaviours, hedge_after=None):
+        """behaviours: model -> (delay in seconds, exception to raise or None)."""
+        self.behaviours = behaviours
+        self.model_list = list(behaviours)
+        self.current_model = self.model_list[0]
+        self.hedge_after = hedge_after
+        self.calls = []
+
+    @with_model_fallback
+    async def create(self, prompt):
+        self.calls.append(self.current_model)
+        delay, error = self.behaviours[self.current_model]
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return f"{self.current_model}: {prompt}"
+
+
+@pytest.fixture(autouse=True)
+def clean_board():
+    ModelHealthBoard.reset()
+    yield
+    ModelHealthBoard.reset()
+
+
+@pytest.fixture
+def no_retry_pause(monkeypatch):
+    real_sleep = asyncio.sleep
+
+    async def sleep(delay, *args, **kwargs):
+        return await real_sleep(0 if delay == 1 else delay, *args, **kwargs)
+    monkeypatch.setattr(modelfallback.asyncio, "sleep", sleep)
+
+
+@pytest.mark.asyncio
+async def test_sequential_falls_back_on_retryable_errors(no_retry_pause):
+    chat = FakeChat({"a": (0, ModelHTTPError(429, "a")), "b": (0, None)})
+
+    assert await chat.create("hi") == "b: hi"
+    assert chat.current_model == "a"
+    assert ModelHealthBoard.get("a").consecutive_failures == 1
+    assert len(ModelHealthBoard.get("b").latencies) == 1
+
+
+@pytest.mark.asyncio
+async def test_sequential_raises_other_errors_immediately():
+    chat = FakeChat({"a": (0, ValueError("bad prompt")), "b": (0, None)})
+
+    with pytest.raises(ValueError):
+        await chat.create("hi")
+    assert chat.calls == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_and_the_slow_model_is_penalized():
+    chat = FakeChat({"slow": (1, None), "fast": (0, None)}, hedge_after=0.05)
+
+    assert await chat.create("hi") == "fast: hi"
+    slow = ModelHealthBoard.get("slow")
+    assert len(slow.latencies) == 1 and slow.latencies[0] >= 0.05
+    assert slow.consecutive_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_hedges_immediately_when_the_first_model_fails():
+    chat = FakeChat({"a": (0, ModelHTTPError(503, "a")), "b": (0, None)}, hedge_after=10)
+
+    assert await chat.create("hi") == "b: hi"
+
+
+@pytest.mark.asyncio
+async def test_a_failing_hedge_fires_the_next_model_without_waiting():
+    chat = FakeChat({"slow": (2, None), "broken": (0, ModelHTTPError(503, "broken")), "fast": (0, None)},
+                    hedge_after=0.2)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    assert await chat.create("hi") == "fast: hi"
+    # "broken" is fired after 0.2s and fails at once; "fast" must not wait for another budget
+    assert loop.time() - started < 0.35
+
+
+def test_circuit_breaker_opens_half_opens_and_closes(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(modelfallback.time, "monotonic", lambda: now[0])
+    health = ModelHealth()
+
+    for _ in range(ModelHealth.failure_threshold):
+        health.record_failure()
+    assert not health.available
+
+    now[0] += ModelHealth.cooldown
+    assert health.available  # half-open: one trial request goes through
+    assert health.admit()
+    assert not health.available and not health.admit()
+
+    health.record_failure()  # the trial failed, so the circuit opens again
+    assert health.opened_at == now[0] and not health.available
+
+    now[0] += ModelHealth.cooldown
+    assert health.admit()
+    health.record_success(0.5)
+    assert health.available and health.opened_at is None
+
+
+def test_models_with_an_open_circuit_are_skipped():
+    chat = FakeChat({"a": (0, None), "b": (0, None)})
+    for _ in range(ModelHealth.failure_threshold):
+        ModelHealthBoard.get("a").record_failure()
+
+    assert modelfallback.ModelFallback.get_models_to_try(chat) == ["b"]
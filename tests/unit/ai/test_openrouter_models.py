@@ -0,0 +1,155 @@
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+from mediaichemy.ai.llm.openrouter_models import (ModelIndex, ModelInfo, Pricing,
+                                                  Architecture, Capability, CatalogueCache)
+
+
+def make_model(id, prompt, tools=False, context_length=8000, input_modalities=None):
+    return ModelInfo(id=id,
+                     context_length=context_length,
+                     pricing=Pricing(prompt=prompt, completion=prompt),
+                     architecture=Architecture(input_modalities=input_modalities or ["text"]),
+                     supported_parameters=["tools"] if tools else [])
+
+
+MODELS = [
+    make_model("a/ten", "10", tools=True),
+    make_model("b/two", "2", context_length=1000),
+    make_model("c/point-five", "0.5", tools=True, input_modalities=["text", "image"]),
+    make_model("d/variable", "-1", tools=True),
+    make_model("e/unpriced", None),
+]
+
+
+def test_orders_numerically_with_unusable_prices_last():
+    index = ModelIndex(MODELS)
+    assert index.cheapest_ids() == ["c/point-five", "b/two", "a/ten", "d/variable", "e/unpriced"]
+
+
+def test_filters_by_capabilities_and_context():
+    index = ModelIndex(MODELS)
+    assert index.cheapest_ids(capabilities=Capability.TOOLS) == ["c/point-five", "a/ten", "d/variable"]
+    assert index.cheapest_ids(n=2, min_context=4000) == ["c/point-five", "a/ten"]
+    assert index.cheapest_ids(capabilities=Capability.TOOLS | Capability.IMAGE_INPUT) == ["c/point-five"]
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None, headers=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = headers or {}
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}")
+
+
+class FakeTransport:
+    """Stands in for requests.get, answering with the queued responses (or exceptions) in order."""
+
+    def __init__(self, monkeypatch, *responses):
+        self.responses = list(responses)
+        self.requests = []
+        monkeypatch.setattr(requests, "get", self.get)
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+PAYLOAD = {"data": [{"id": "a/model", "pricing": {"prompt": "1", "completion": "1"}}]}
+
+
+@pytest.fixture
+def catalogue(tmp_path):
+    CatalogueCache._memory.clear()
+    cache = CatalogueCache("https://example.test/models", ttl=3600, cache_path=str(tmp_path / "models.json"))
+    yield cache
+    cache.wait()
+    CatalogueCache._memory.clear()
+
+
+def expire(catalogue):
+    with open(catalogue.cache_path) as f:
+        snapshot = json.load(f)
+    snapshot["fetched_at"] -= catalogue.ttl + 1
+    with open(catalogue.cache_path, "w") as f:
+        json.dump(snapshot, f)
+    CatalogueCache._memory.clear()
+    return snapshot["fetched_at"]
+
+
+def test_revalidates_with_conditional_headers_and_reuses_on_304(monkeypatch, catalogue):
+    transport = FakeTransport(monkeypatch,
+                              FakeResponse(payload=PAYLOAD, headers={"ETag": "v1", "Last-Modified": "Mon"}),
+                              FakeResponse(status_code=304))
+    models = catalogue.get()
+    assert catalogue.get() is models
+    assert len(transport.requests) == 1
+
+    stale_at = expire(catalogue)
+    assert [m.id for m in catalogue.get()] == ["a/model"]
+    catalogue.wait()
+    assert transport.requests[1] == {"If-None-Match": "v1", "If-Modified-Since": "Mon"}
+    with open(catalogue.cache_path) as f:
+        assert json.load(f)["fetched_at"] > stale_at
+
+
+def test_serves_stale_catalogue_offline_and_retries_after_backoff(monkeypatch, catalogue):
+    transport = FakeTransport(monkeypatch,
+                              FakeResponse(payload=PAYLOAD, headers={"ETag": "v1"}),
+                              requests.ConnectionError("offline"),
+                              FakeResponse(status_code=304))
+    catalogue.get()
+    stale_at = expire(catalogue)
+
+    assert [m.id for m in catalogue.get()] == ["a/model"]
+    catalogue.wait()
+    with open(catalogue.cache_path) as f:
+        assert json.load(f)["fetched_at"] == stale_at  # still stale on disk
+    catalogue.get()
+    assert len(transport.requests) == 2  # within the back-off
+
+    monkeypatch.setattr(CatalogueCache, "retry_backoff", 0)
+    CatalogueCache._memory[catalogue.api_url]["retry_at"] = 0
+    catalogue.get()
+    catalogue.wait()
+    assert len(transport.requests) == 3
+
+
+def test_stale_catalogue_is_served_without_waiting_for_the_network(monkeypatch, catalogue):
+    release = threading.Event()
+
+    class SlowResponse(FakeResponse):
+        def raise_for_status(self):
+            release.wait(5)
+
+    transport = FakeTransport(monkeypatch, FakeResponse(payload=PAYLOAD), SlowResponse(payload=PAYLOAD))
+    catalogue.get()
+    expire(catalogue)
+
+    started = time.monotonic()
+    assert [m.id for m in catalogue.get()] == ["a/model"]
+    assert time.monotonic() - started < 1
+    release.set()
+    catalogue.wait()
+    assert len(transport.requests) == 2
+    assert catalogue.get_entry()["fetched_at"] > time.time() - 5
+
+
+def test_offline_without_a_snapshot_raises(monkeypatch, catalogue):
+    FakeTransport(monkeypatch, requests.ConnectionError("offline"))
+
+    with pytest.raises(requests.ConnectionError):
+        catalogue.get()
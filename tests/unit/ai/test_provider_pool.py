@@ -0,0 +1,16 @@
+import pytest
+
+from mediaichemy.ai.llm.provider_pool import ProviderPool
+
+
+@pytest.mark.asyncio
+async def test_clients_are_shared_per_key_and_closed_by_aclose():
+    client = ProviderPool.get_http_client("key")
+    assert ProviderPool.get_http_client("key") is client
+    assert ProviderPool.get_http_client("other") is not client
+
+    await ProviderPool.aclose()
+
+    assert client.is_closed
+    assert ProviderPool.get_http_client("key") is not client
+    await ProviderPool.aclose()
@@ -0,0 +1,91 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from piper import PiperVoice
+
+from mediaichemy.ai import voice
+from mediaichemy.ai.voice import VoiceAI, VoiceCache, _stitch
+
+
+def test_loads_each_voice_once_and_evicts_by_size(tmp_path, monkeypatch):
+    for name, size in [("a", 40), ("b", 40), ("c", 40)]:
+        (tmp_path / f"{name}.onnx").write_bytes(b"x" * size)
+        (tmp_path / f"{name}.onnx.json").write_text("{}")
+    loads = []
+    monkeypatch.setattr(PiperVoice, "load", lambda path: loads.append(path.stem) or object())
+    monkeypatch.setattr(VoiceCache, "voices_dir", tmp_path)
+    monkeypatch.setattr(VoiceCache, "max_bytes", 100)
+    VoiceCache.clear()
+
+    first = VoiceCache.get("a")
+    assert VoiceCache.get("a") is first
+    VoiceCache.get("b")
+    VoiceCache.get("c")
+    assert loads == ["a", "b", "c"]
+    assert list(VoiceCache._voices) == ["b", "c"]
+    VoiceCache.clear()
+
+
+def test_stitches_sentences_in_order_with_exact_timings():
+    rate = 1000
+    results = [(b"\0\40" * 500, rate, 1), (b"\0\100" * 250, rate, 1)]
+
+    buffer, segments = _stitch(["One.", "Two."], results, sentence_gap=0.1)
+
+    assert [(s.text, s.start, s.end) for s in segments] == [("One.", 0.0, 0.5), ("Two.", 0.6, 0.85)]
+    assert buffer.frames == 850
+    assert buffer.samples[550, 0] == 0.0
+    assert buffer.samples[600, 0] == 0.5
+
+
+def test_concurrent_misses_load_the_voice_once(tmp_path, monkeypatch):
+    (tmp_path / "a.onnx").write_bytes(b"x" * 10)
+    (tmp_path / "a.onnx.json").write_text("{}")
+    loads = []
+
+    def slow_load(path):
+        loads.append(path.stem)
+        time.sleep(0.05)
+        return object()
+
+    monkeypatch.setattr(PiperVoice, "load", slow_load)
+    monkeypatch.setattr(VoiceCache, "voices_dir", tmp_path)
+    VoiceCache.clear()
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        voices = list(pool.map(VoiceCache.get, ["a"] * 5))
+
+    assert loads == ["a"]
+    assert all(voice is voices[0] for voice in voices)
+    VoiceCache.clear()
+
+
+REAL_SYNTHESIZE_TIMED_BUFFER = VoiceAI.synthesize_timed_buffer_async
+
+
+@pytest.mark.asyncio
+async def test_synthesizes_whole_sentences_and_times_their_clauses(monkeypatch):
+    synthesized = []
+
+    def fake_synthesize_pcm(text, voice_name, speed):
+        synthesized.append(text)
+        return b"\0\0" * len(text) * 10, 1000, 1
+
+    monkeypatch.setattr(voice, "_synthesize_pcm", fake_synthesize_pcm)
+
+    _, segments = await REAL_SYNTHESIZE_TIMED_BUFFER(VoiceAI(), "First, then second. Done!", "v", sentence_gap=0)
+
+    assert sorted(synthesized) == ["Done!", "First, then second."]
+    # Sentence bounds are exact; the clause boundary is split by length (6 of 18 characters)
+    assert [s.text for s in segments] == ["First,", "then second.", "Done!"]
+    assert [(s.start, s.end) for s in segments] == [(0.0, pytest.approx(0.19 / 3)),
+                                                    (pytest.approx(0.19 / 3), 0.19),
+                                                    (0.19, 0.24)]
+
+
+def test_voice_ai_uses_the_default_worker_pool(monkeypatch):
+    pool = object()
+    monkeypatch.setattr(VoiceAI, "default_worker_pool", pool)
+
+    assert VoiceAI().worker_pool is pool
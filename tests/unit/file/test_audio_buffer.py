@@ -0,0 +1,44 @@
+import subprocess
+
+import numpy as np
+
+from mediaichemy.file import AudioBuffer
+from mediaichemy.process import MediaProcess
+
+
+def test_pads_and_mixes_like_amix():
+    narration = AudioBuffer(np.full(100, 0.5), sample_rate=100).pad(0.5)
+    background = AudioBuffer(np.full((100, 2), 0.2), sample_rate=100)
+
+    mixed = narration.conform(100, 2).mix(background, background_relative_volume=0.5)
+
+    assert narration.duration == 1.5
+    assert (mixed.sample_rate, mixed.channels, mixed.frames) == (100, 2, 150)
+    assert np.allclose(mixed.samples[0], 0.5 * 1.5 / 2 + 0.2 * 0.5 / 2)
+    assert np.allclose(mixed.samples[-1], 0.0)
+
+
+def test_reads_16_bit_pcm():
+    pcm = np.array([0, 16384, -32768], dtype='<i2').tobytes()
+    assert np.allclose(AudioBuffer.from_pcm16(pcm, 8000).samples[:, 0], [0.0, 0.5, -1.0])
+
+
+def test_resampling_goes_through_ffmpeg(monkeypatch):
+    commands = []
+
+    def fake_run(command, input=None, **kwargs):
+        commands.append(command)
+        # Stand in for ffmpeg: two output frames per input frame
+        samples = np.frombuffer(input, dtype='<f4').reshape(-1, 2)
+        return subprocess.CompletedProcess(command, 0, np.repeat(samples, 2, axis=0).tobytes(), b"")
+
+    monkeypatch.setattr(MediaProcess, "run", fake_run)
+    narration = AudioBuffer(np.full(100, 0.5), sample_rate=22050)
+
+    resampled = narration.conform(44100, 2)
+
+    assert (resampled.sample_rate, resampled.channels, resampled.frames) == (44100, 2, 200)
+    command = commands[0]
+    assert command[command.index("-i") - 6:command.index("-i")] == ["-f", "f32le", "-ar", "22050", "-ac", "2"]
+    assert command[-3:] == ["-ar", "44100", "-"]
+    assert narration.conform(22050, 2).frames == 100 and len(commands) == 1
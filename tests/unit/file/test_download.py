@@ -0,0 +1,93 @@
+import asyncio
+
+import httpx
+import pytest
+
+from mediaichemy.file.download import AsyncHTTPDownloader
+
+BODY = bytes(range(256)) * 40
+URL = "https://example.test/asset.mp4"
+# conftest replaces download for every test, so keep the real one
+REAL_DOWNLOAD = AsyncHTTPDownloader.download
+
+
+@pytest.fixture(autouse=True)
+def real_download(monkeypatch):
+    monkeypatch.setattr(AsyncHTTPDownloader, "download", REAL_DOWNLOAD)
+
+
+def use_transport(handler):
+    """Route the downloader's shared client for the running loop through ``handler``."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    AsyncHTTPDownloader._clients[asyncio.get_running_loop()] = client
+    return client
+
+
+def ranged_response(request):
+    start, end = request.headers["Range"][len("bytes="):].split("-")
+    start, end = int(start), int(end) if end else len(BODY) - 1
+    return httpx.Response(206, content=BODY[start:end + 1])
+
+
+@pytest.mark.asyncio
+async def test_ranged_download_fetches_segments_in_parallel(tmp_path):
+    ranges = []
+
+    def handler(request):
+        if request.method == "HEAD":
+            return httpx.Response(200, headers={"Accept-Ranges": "bytes", "Content-Length": str(len(BODY))})
+        ranges.append(request.headers["Range"])
+        return ranged_response(request)
+
+    use_transport(handler)
+    destination = tmp_path / "asset.mp4"
+    await AsyncHTTPDownloader(max_segments=4, parallel_threshold=1).download(URL, str(destination))
+
+    assert destination.read_bytes() == BODY
+    assert len(ranges) == 4
+    assert not (tmp_path / "asset.mp4.part").exists()
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_a_single_stream_without_range_support(tmp_path):
+    requests = []
+
+    def handler(request):
+        requests.append((request.method, request.headers.get("Range")))
+        if request.method == "HEAD":
+            return httpx.Response(200, headers={"Content-Length": str(len(BODY))})
+        return httpx.Response(200, content=BODY)
+
+    use_transport(handler)
+    destination = tmp_path / "asset.mp4"
+    await AsyncHTTPDownloader(max_segments=4, parallel_threshold=1).download(URL, str(destination))
+
+    assert destination.read_bytes() == BODY
+    assert requests == [("HEAD", None), ("GET", None)]
+
+
+@pytest.mark.asyncio
+async def test_failed_segment_cancels_the_others_and_removes_the_partial(tmp_path):
+    cancelled = []
+
+    async def handler(request):
+        if request.method == "HEAD":
+            return httpx.Response(200, headers={"Accept-Ranges": "bytes", "Content-Length": str(len(BODY))})
+        if request.headers["Range"].startswith("bytes=0-"):
+            return httpx.Response(404)
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(request.headers["Range"])
+            raise
+        return ranged_response(request)
+
+    use_transport(handler)
+    destination = tmp_path / "asset.mp4"
+    with pytest.raises(httpx.HTTPStatusError):
+        await asyncio.wait_for(
+            AsyncHTTPDownloader(max_segments=4, parallel_threshold=1).download(URL, str(destination)), 5)
+
+    assert len(cancelled) == 3
+    assert not destination.exists()
+    assert not (tmp_path / "asset.mp4.part").exists()
@@ -0,0 +1,47 @@
+import json
+import subprocess
+
+from mediaichemy.file.probe import MediaProbe
+from mediaichemy.process import MediaProcess
+
+FFPROBE_OUTPUT = json.dumps({
+    "streams": [
+        {"codec_type": "video", "codec_name": "h264", "profile": "High", "pix_fmt": "yuv420p",
+         "width": 720, "height": 1280, "avg_frame_rate": "30000/1001"},
+        {"codec_type": "audio", "codec_name": "aac", "sample_rate": "44100", "channels": 2},
+    ],
+    "format": {"format_name": "mov,mp4,m4a,3gp,3g2,mj2", "duration": "5.005"},
+})
+
+
+def test_parses_format_and_streams():
+    info = MediaProbe._parse_info(FFPROBE_OUTPUT)
+    assert info.duration == 5.005
+    assert (info.video_codec, info.width, info.height) == ("h264", 720, 1280)
+    assert (info.video_profile, info.pix_fmt) == ("High", "yuv420p")
+    assert round(info.fps, 2) == 29.97
+    assert (info.audio_codec, info.sample_rate, info.channels) == ("aac", 44100, 2)
+
+
+def test_probes_once_per_file_version(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_run(command, **kwargs):
+        calls.append(command)
+        return subprocess.CompletedProcess(command, 0, FFPROBE_OUTPUT, "")
+
+    monkeypatch.setattr(MediaProcess, "run", fake_run)
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"v1")
+
+    MediaProbe.info(str(path))
+    MediaProbe.info(str(path))
+    assert len(calls) == 1
+
+    path.write_bytes(b"version 2")
+    MediaProbe.info(str(path))
+    assert len(calls) == 2
+
+    MediaProbe.invalidate(str(path))
+    MediaProbe.info(str(path))
+    assert len(calls) == 3
@@ -0,0 +1,10 @@
+from mediaichemy.media.multi import NarratedVideo, NarratedVideoParameters, StorylineVideo, StorylineVideoParameters
+
+
+def test_captions_go_where_the_final_media_ends_up():
+    narrated = NarratedVideo(params=NarratedVideoParameters(narration_text="hi", video_prompt=""))
+    storyline = StorylineVideo(params=StorylineVideoParameters(narration_text="hi", video_prompt=""))
+
+    # Narrated videos are unpacked into the media directory; storyline videos stay in their subdirectory
+    assert narrated.captions_dir == narrated.directory
+    assert storyline.captions_dir == storyline.output_dir != storyline.directory
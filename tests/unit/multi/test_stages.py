@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from mediaichemy.media.stages import StageGraph
+
+
+@pytest.mark.asyncio
+async def test_runs_independent_branches_concurrently():
+    events = []
+
+    async def slow(name):
+        events.append(f"{name} start")
+        await asyncio.sleep(0.05)
+        events.append(f"{name} end")
+        return name
+
+    async def join(narration, visual):
+        return f"{narration}+{visual}"
+
+    graph = (StageGraph()
+             .add("narration", lambda: slow("narration"))
+             .add("visual", lambda: slow("visual"))
+             .add("assemble", join, depends_on=("narration", "visual")))
+    results = await graph.run()
+
+    assert results["assemble"] == "narration+visual"
+    assert events[:2] == ["narration start", "visual start"]
+    assert set(graph.timings) == {"narration", "visual", "assemble"}
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_running_stages():
+    cancelled = asyncio.Event()
+
+    async def long_running():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def failing():
+        raise RuntimeError("render failed")
+
+    graph = StageGraph().add("visual", long_running).add("narration", failing)
+    with pytest.raises(RuntimeError, match="render failed"):
+        await graph.run()
+    assert cancelled.is_set()
+
+
+def test_rejects_cycles():
+    async def stage(**_):
+        pass
+
+    graph = StageGraph().add("a", stage, depends_on=("b",)).add("b", stage, depends_on=("a",))
+    with pytest.raises(ValueError, match="cycle"):
+        graph.order()
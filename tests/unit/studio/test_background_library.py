@@ -0,0 +1,53 @@
+import json
+
+from mediaichemy.studio.sources.library import BackgroundLibrary
+from mediaichemy.studio.sources.platforms import YoutubeVideo
+
+
+def add_track(library, video_id, size):
+    with open(library._track_path(video_id), "wb") as f:
+        f.write(b"x" * size)
+    return library._add(video_id, duration=60.0)
+
+
+def test_serves_indexed_tracks_and_evicts_least_recently_used(tmp_path):
+    library = BackgroundLibrary(directory=str(tmp_path), max_bytes=250)
+    add_track(library, "aaaaaaaaaaa", 100)
+    add_track(library, "bbbbbbbbbbb", 100)
+    assert library.lookup("aaaaaaaaaaa")["duration"] == 60.0
+
+    add_track(library, "ccccccccccc", 100)
+
+    assert library.lookup("bbbbbbbbbbb") is None
+    assert not (tmp_path / "bbbbbbbbbbb.flac").exists()
+    assert library.lookup("aaaaaaaaaaa") and library.lookup("ccccccccccc")
+
+
+def test_lookups_do_not_rewrite_the_index(tmp_path):
+    library = BackgroundLibrary(directory=str(tmp_path), max_bytes=250)
+    add_track(library, "aaaaaaaaaaa", 100)
+    written = (tmp_path / "index.json").read_text()
+
+    used_at = library.lookup("aaaaaaaaaaa")["last_used"]
+    assert (tmp_path / "index.json").read_text() == written
+
+    # Access times are written with the next added track, so eviction still sees the lookup
+    add_track(library, "bbbbbbbbbbb", 100)
+    assert json.loads((tmp_path / "index.json").read_text())["aaaaaaaaaaa"]["last_used"] == used_at
+
+
+def test_lookup_access_times_are_flushed_after_the_interval(tmp_path, monkeypatch):
+    library = BackgroundLibrary(directory=str(tmp_path), max_bytes=250)
+    add_track(library, "aaaaaaaaaaa", 100)
+    monkeypatch.setattr(BackgroundLibrary, "flush_interval", 0)
+
+    used_at = library.lookup("aaaaaaaaaaa")["last_used"]
+
+    assert json.loads((tmp_path / "index.json").read_text())["aaaaaaaaaaa"]["last_used"] == used_at
+    assert library._last_used == {}
+
+
+def test_section_command_downloads_only_the_window():
+    video = YoutubeVideo("https://youtu.be/aaaaaaaaaaa")
+    command = video._section_command("out.flac", start=30, duration=20)
+    assert command[command.index("--download-sections") + 1] == "*30-50"
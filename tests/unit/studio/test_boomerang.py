@@ -0,0 +1,62 @@
+import os
+
+from mediaichemy.file import VideoFile
+from mediaichemy.file.probe import MediaInfo
+from mediaichemy.studio.editors import EditPlan
+from mediaichemy.studio.editors.boomerang import BoomerangBuilder
+
+
+def test_chunks_follow_keyframes_and_stay_bounded():
+    builder = BoomerangBuilder(VideoFile("clip.mp4"), keyframes=(0.0, 5.0), info=MediaInfo(duration=6.0),
+                               add_scratch_file=lambda path: path)
+    assert builder.chunks() == [(0.0, 2.0), (2.0, 2.0), (4.0, 1.0), (5.0, 1.0)]
+
+
+def test_segmented_boomerang_loops_with_the_demuxer():
+    plan = EditPlan(VideoFile("clip.mp4")).loop(30)
+    plan.loop_source = ".clip_boomerang.ts"
+    command = plan.compile("out.mp4")
+    first_input = command.index("-i")
+    assert command[first_input - 2:first_input + 2] == ["-stream_loop", "-1", "-i", ".clip_boomerang.ts"]
+    assert "reverse" not in " ".join(command)
+
+
+def make_builder(tmp_path, codec="h264"):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"frames")
+    return BoomerangBuilder(VideoFile(str(clip)), keyframes=(0.0,), info=MediaInfo(duration=3.0, video_codec=codec),
+                            add_scratch_file=lambda path: path)
+
+
+def test_forward_half_is_encoded_like_the_reversed_half(tmp_path):
+    builder = make_builder(tmp_path)
+    forward, _ = builder.commands("reversed.ts", "out.ts")
+    reverse_chunk = builder._reverse_commands("partial.ts")[0]
+    assert "copy" not in forward
+    assert " ".join(builder._encode_args()) in " ".join(forward)
+    assert " ".join(builder._encode_args()) in " ".join(reverse_chunk)
+
+
+def test_renditions_are_published_once_and_evicted_least_recently_used(tmp_path, monkeypatch):
+    monkeypatch.setenv("MEDIAICHEMY_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(BoomerangBuilder, "max_cached_renditions", 2)
+    cache_dir = tmp_path / "cache" / "reversed"
+    cache_dir.mkdir(parents=True)
+    for age, name in enumerate(["newer.ts", "older.ts"]):
+        (cache_dir / name).write_bytes(b"")
+        os.utime(cache_dir / name, (1000 - age, 1000 - age))
+    (cache_dir / "building.1.partial.ts").write_bytes(b"")
+    runs = []
+
+    def run(command):
+        runs.append(command)
+        with open(command[-1], "wb") as f:
+            f.write(b"reversed")
+
+    builder = make_builder(tmp_path)
+    reversed_path = builder.ensure_reversed(run)
+    assert builder.ensure_reversed(run) == reversed_path
+    assert len(runs) == len(builder._reverse_commands("unused.ts"))
+
+    assert sorted(os.listdir(cache_dir)) == sorted([".lock", "building.1.partial.ts", "newer.ts",
+                                                    os.path.basename(reversed_path)])
@@ -0,0 +1,49 @@
+from dataclasses import replace
+
+from mediaichemy.file import File, VideoFile
+from mediaichemy.file.probe import MediaInfo
+from mediaichemy.studio.editors import VideoEditor
+
+INFO = MediaInfo(duration=60.0, video_codec="h264", video_profile="High", pix_fmt="yuv420p", fps=25.0,
+                 audio_codec="aac", sample_rate=48000, channels=2)
+KEYFRAMES = (0.0, 2.0, 4.0, 6.0)
+
+
+def make_editor(tmp_path):
+    editor = VideoEditor(VideoFile(str(tmp_path / "clip.mp4")))
+    editor.working_file = File(str(tmp_path / "out.mp4"))
+    return editor
+
+
+def test_cut_on_keyframe_is_a_single_stream_copy(tmp_path):
+    commands = make_editor(tmp_path)._cut_commands(4.0, 1.5, True, KEYFRAMES, INFO)
+    assert len(commands) == 1
+    assert commands[0][:4] == ["ffmpeg", "-y", "-ss", "4.0"]
+    assert "copy" in commands[0]
+
+
+def test_cut_mid_gop_reencodes_only_up_to_next_keyframe(tmp_path):
+    head, tail, join = make_editor(tmp_path)._cut_commands(3.0, 2.5, True, KEYFRAMES, INFO)
+    assert head[head.index("-t") + 1] == "1.0" and "libx264" in head
+    assert tail[tail.index("-ss") + 1] == "4.0" and "copy" in tail
+    assert join[-1] == str(tmp_path / "out.mp4")
+
+
+def test_cut_reencodes_sources_that_cannot_be_joined(tmp_path):
+    info = MediaInfo(duration=60.0, video_codec="vp9", fps=25.0)
+    commands = make_editor(tmp_path)._cut_commands(3.0, 2.5, True, KEYFRAMES, info)
+    assert len(commands) == 1 and "libx264" in commands[0]
+
+
+def test_smart_cut_head_is_encoded_with_the_source_parameters(tmp_path):
+    info = replace(INFO, video_profile="High 4:4:4 Predictive", pix_fmt="yuv444p")
+    head, _, _ = make_editor(tmp_path)._cut_commands(3.0, 2.5, True, KEYFRAMES, info)
+    assert head[head.index("-pix_fmt") + 1] == "yuv444p"
+    assert head[head.index("-profile:v") + 1] == "high444"
+    assert head[head.index("-ar") + 1] == "48000" and head[head.index("-ac") + 1] == "2"
+
+
+def test_cut_reencodes_h264_the_encoder_cannot_match(tmp_path):
+    for info in (replace(INFO, pix_fmt="yuv420p12le"), replace(INFO, video_profile=None)):
+        commands = make_editor(tmp_path)._cut_commands(3.0, 2.5, True, KEYFRAMES, info)
+        assert len(commands) == 1 and "libx264" in commands[0]
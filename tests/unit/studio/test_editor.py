@@ -0,0 +1,26 @@
+import os
+import stat
+import sys
+
+from mediaichemy.file import File
+from mediaichemy.studio.editors.editor import Editor
+
+
+class TextEditor(Editor):
+    file_type = File
+
+    @Editor.edit_file
+    def rewrite(self, text):
+        return [sys.executable, "-c", f"open({self.working_file.path!r}, 'w').write({text!r})"]
+
+
+def test_edit_keeps_the_permissions_of_the_original(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("before")
+    os.chmod(path, 0o644)
+
+    editor = TextEditor(File(str(path)))
+    editor.rewrite("after")
+
+    assert path.read_text() == "after"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
@@ -0,0 +1,31 @@
+import pytest
+
+from mediaichemy.file import AudioFile, SubtitleFile, VideoFile
+from mediaichemy.studio.editors import EditPlan
+
+
+def test_subtitle_variants_are_rendered_from_one_decode():
+    plan = (EditPlan(VideoFile("clip.mp4"))
+            .trim(10)
+            .add_audio(AudioFile("narration.flac"))
+            .mix_audio(AudioFile("background.flac"), 0.5)
+            .burn_subtitles([SubtitleFile("clip_2.ass"), SubtitleFile("clip_8.ass")],
+                            ["clip_2.mp4", "clip_8.mp4"]))
+
+    command = plan.compile()
+
+    graph = command[command.index("-filter_complex") + 1]
+    assert command.count("-i") == 3
+    assert "split=2[s0][s1]" in graph and "asplit=2[a0s][a1s]" in graph
+    assert "[s0]subtitles='clip_2.ass',format=yuv420p[v0]" in graph
+    outputs = command[command.index("-filter_complex") + 2:]
+    assert outputs == ["-map", "[v0]", "-map", "[a0s]", "-c:v", "libx264", "-c:a", "aac", "-t", "10", "clip_2.mp4",
+                       "-map", "[v1]", "-map", "[a1s]", "-c:v", "libx264", "-c:a", "aac", "-t", "10", "clip_8.mp4"]
+
+
+def test_a_subtitled_plan_has_no_single_output():
+    plan = EditPlan(VideoFile("clip.mp4")).burn_subtitles([SubtitleFile("clip_2.ass")], ["clip_2.mp4"])
+
+    with pytest.raises(ValueError):
+        plan.compile("out.mp4")
+    assert plan.compile()[-1] == "clip_2.mp4"
@@ -0,0 +1,112 @@
+import io
+import json
+
+import pytest
+
+from mediaichemy import cli
+from mediaichemy.creator import JobResult, MediaCreator
+
+
+def test_read_prompts_from_files_directories_and_stdin(tmp_path):
+    prompt_file = tmp_path / "batch.txt"
+    prompt_file.write_text("a koan\n\n# skipped\na koan\na dog\n")
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    (prompts_dir / "ocean.txt").write_text("waves at night\n")
+
+    jobs = cli.read_prompts([str(prompt_file), str(prompts_dir), "-"], stdin=io.StringIO("from stdin\n"))
+
+    assert [job.prompt for job in jobs] == ["a koan", "a koan", "a dog", "waves at night", "from stdin"]
+    assert jobs[1].id == f"{jobs[0].id}-2"
+    assert jobs[3].id == "ocean"
+
+
+def test_main_writes_manifest_and_resumes(tmp_path, monkeypatch):
+    calls = []
+
+    async def fake_create_many(self, prompts, max_jobs=4, limits=None, **kwargs):
+        for index, prompt in enumerate(prompts):
+            calls.append(prompt)
+            error = RuntimeError("boom") if prompt == "fails" else None
+            yield JobResult(index=index, prompt=prompt, output=f"{prompt}.mp4", cost=0.1, error=error,
+                            stage_timings={"media": 1.0})
+
+    monkeypatch.setattr(MediaCreator, "create_many", fake_create_many)
+    prompt_file = tmp_path / "batch.txt"
+    prompt_file.write_text("works\nfails\n")
+    manifest = tmp_path / "manifest.jsonl"
+
+    assert cli.main([str(prompt_file), "-o", str(manifest)]) == 1
+    records = [json.loads(line) for line in manifest.read_text().splitlines()]
+    assert [(r["prompt"], r["status"]) for r in records] == [("works", "ok"), ("fails", "failed")]
+    assert records[0]["stage_timings"] == {"media": 1.0}
+
+    calls.clear()
+    cli.main([str(prompt_file), "-o", str(manifest)])
+    assert calls == ["fails"]
+
+
+def test_list_outputs_are_recorded_as_paths(tmp_path, monkeypatch):
+    from mediaichemy.file import VideoFile
+
+    async def fake_create_many(self, prompts, max_jobs=4, limits=None, **kwargs):
+        for index, prompt in enumerate(prompts):
+            output = [VideoFile(str(tmp_path / f"{prompt}_{position}.mp4")) for position in ("top", "bottom")]
+            yield JobResult(index=index, prompt=prompt, output=output, cost=0.3)
+
+    monkeypatch.setattr(MediaCreator, "create_many", fake_create_many)
+    prompt_file = tmp_path / "batch.txt"
+    prompt_file.write_text("first\nsecond\n")
+    manifest = tmp_path / "manifest.jsonl"
+
+    assert cli.main([str(prompt_file), "-o", str(manifest)]) == 0
+    records = [json.loads(line) for line in manifest.read_text().splitlines()]
+    assert [r["output"] for r in records] == [[str(tmp_path / f"{p}_top.mp4"), str(tmp_path / f"{p}_bottom.mp4")]
+                                              for p in ("first", "second")]
+
+
+def test_pooled_connections_are_closed_after_the_batch(tmp_path, monkeypatch):
+    closed = []
+
+    async def fake_create_many(self, prompts, max_jobs=4, limits=None, **kwargs):
+        raise RuntimeError("prompt source failed")
+        yield
+
+    async def fake_aclose():
+        closed.append(True)
+
+    monkeypatch.setattr(MediaCreator, "create_many", fake_create_many)
+    monkeypatch.setattr(MediaCreator, "aclose", staticmethod(fake_aclose))
+    prompt_file = tmp_path / "batch.txt"
+    prompt_file.write_text("works\n")
+
+    with pytest.raises(RuntimeError):
+        cli.main([str(prompt_file), "-o", str(tmp_path / "manifest.jsonl")])
+    assert closed == [True]
+
+
+def test_tts_workers_preload_the_narration_voice(tmp_path, monkeypatch):
+    from mediaichemy.ai import voice
+    pools = []
+
+    class FakePool:
+        def __init__(self, workers, voices):
+            pools.append((workers, list(voices)))
+
+        def shutdown(self):
+            pass
+
+    async def fake_create_many(self, prompts, max_jobs=4, limits=None, **kwargs):
+        assert voice.VoiceAI.default_worker_pool is not None
+        for index, prompt in enumerate(prompts):
+            yield JobResult(index=index, prompt=prompt, output=f"{prompt}.mp4")
+
+    monkeypatch.setattr(voice, "TTSWorkerPool", FakePool)
+    monkeypatch.setattr(MediaCreator, "create_many", fake_create_many)
+    prompt_file = tmp_path / "batch.txt"
+    prompt_file.write_text("works\n")
+
+    assert cli.main([str(prompt_file), "-o", str(tmp_path / "manifest.jsonl"), "--tts-workers", "2",
+                     "-p", "narration_voice_name=en_GB-alan-low"]) == 0
+    assert pools == [(2, ["en_GB-alan-low"])]
+    assert voice.VoiceAI.default_worker_pool is None
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from mediaichemy.concurrency import ConcurrencyLimits, limit
+from mediaichemy.creator import MediaCreator
+
+
+@pytest.mark.asyncio
+async def test_create_many_isolates_failures_and_per_job_state(monkeypatch):
+    async def fake_create(self, user_prompt, **kwargs):
+        await asyncio.sleep(0.01 * len(user_prompt))
+        if user_prompt == "broken":
+            raise RuntimeError("no outline")
+        self.outline = user_prompt
+        self.output, self.cost = f"{user_prompt}.mp4", 0.5
+        return user_prompt
+
+    monkeypatch.setattr(MediaCreator, "create", fake_create)
+    creator = MediaCreator(media_type=object)
+
+    results = [r async for r in creator.create_many(["a", "broken", "ccc"], max_jobs=2)]
+
+    by_prompt = {r.prompt: r for r in results}
+    assert len(results) == 3
+    assert [r.index for r in sorted(results, key=lambda r: r.index)] == [0, 1, 2]
+    assert isinstance(by_prompt["broken"].error, RuntimeError)
+    assert by_prompt["ccc"].ok and by_prompt["ccc"].output == "ccc.mp4"
+    assert not hasattr(creator, "outline")
+
+
+@pytest.mark.asyncio
+async def test_limits_cap_concurrent_work_across_jobs(monkeypatch):
+    running, peak = 0, 0
+
+    async def fake_create(self, user_prompt, **kwargs):
+        nonlocal running, peak
+        async with limit("visual"):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+        self.output, self.cost = None, 0
+        return user_prompt
+
+    monkeypatch.setattr(MediaCreator, "create", fake_create)
+
+    async def prompts():
+        for i in range(6):
+            yield str(i)
+
+    limits = ConcurrencyLimits(visual=2)
+    results = [r async for r in MediaCreator(media_type=object).create_many(prompts(), max_jobs=6, limits=limits)]
+
+    assert len(results) == 6 and all(r.ok for r in results)
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_limit_is_a_no_op_without_active_limits():
+    async with limit("llm"):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_the_pooled_runware_sessions():
+    from mediaichemy.ai.visual.runware_pool import RunwarePool
+
+    class FakeSession:
+        disconnected = False
+
+        async def disconnect(self):
+            self.disconnected = True
+
+    session = FakeSession()
+    RunwarePool.for_api_key("key").clients.append(session)
+
+    await MediaCreator.aclose()
+
+    assert session.disconnected
+    assert RunwarePool.for_api_key("key").clients == []
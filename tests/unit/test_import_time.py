@@ -0,0 +1,33 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["piper", "onnxruntime", "runware", "pydantic_ai", "openai", "PIL", "pysubs2",
+                 "youtube_transcript_api", "dotenv"]
+
+
+def loaded_heavy_modules(statement: str) -> list:
+    """Run ``statement`` in a fresh interpreter and list the heavy backends it imported."""
+    script = (f"import json, sys\n{statement}\n"
+              f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("statement", [
+    "import mediaichemy.cli",
+    "import mediaichemy.media",
+    "import mediaichemy.ai",
+    "from mediaichemy.media import StorylineVideo",
+    "from mediaichemy.creator import MediaCreator",
+])
+def test_backends_are_not_imported_until_used(statement):
+    assert loaded_heavy_modules(statement) == []
+
+
+def test_media_can_be_imported_before_the_studio():
+    # mediaichemy.studio and mediaichemy.media used to import each other at module level
+    assert loaded_heavy_modules("from mediaichemy.studio.editors import VideoEditor\n"
+                                "from mediaichemy.media import Image") == []